@@ -0,0 +1,81 @@
+"""Compare serial and thread-pool playlist generation on a synthetic library.
+
+Usage: python benchmarks/bench_populate.py [--titles 2000] [--videos 20] [--workers 8] [--latency-ms 0]
+
+On a local disk with a warm page cache the scan is CPU bound and the pool gains little; --latency-ms adds a
+delay to every directory listing to approximate a network share, which is where the pool pays off.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_catalog import RECOMMENDED_NETWORK_PLAYLIST_WORKERS, generate_playlists
+
+
+def build_library(base_dir, titles, videos):
+    jobs = []
+    for i in range(titles):
+        # Nest the videos one level down, like "Course/Lectures/Lecture 01.mp4"
+        folder = os.path.join(base_dir, "library", f"Course {i:05d}")
+        lecture_dir = os.path.join(folder, "Lectures")
+        os.makedirs(lecture_dir)
+        for j in range(videos):
+            open(os.path.join(lecture_dir, f"Lecture {j:02d}.mp4"), "w").close()
+        jobs.append((("Benchmark", f"Course {i:05d}"), folder))
+    return jobs
+
+
+def add_listing_latency(latency_ms):
+    # Every os.walk step lists a directory through os.scandir, so delaying it models one NAS round-trip
+    real_scandir = os.scandir
+
+    def slow_scandir(path="."):
+        time.sleep(latency_ms / 1000)
+        return real_scandir(path)
+
+    os.scandir = slow_scandir
+
+
+def run(jobs, playlist_dir, workers):
+    start = time.perf_counter()
+    created = 0
+    for kind, payload in generate_playlists(jobs, playlist_dir, workers):
+        if kind == "results":
+            created = len(payload)
+    return time.perf_counter() - start, created
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=2000, help="number of title folders")
+    parser.add_argument("--videos", type=int, default=20, help="videos per title folder")
+    parser.add_argument("--workers", type=int, default=RECOMMENDED_NETWORK_PLAYLIST_WORKERS,
+                        help="thread pool size for the parallel run")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated delay per directory listing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        jobs = build_library(base_dir, args.titles, args.videos)
+        playlist_dir = os.path.join(base_dir, "playlists")
+        os.makedirs(playlist_dir)
+
+        # Warm the page cache so neither timed run pays for the first read of the library
+        run(jobs, playlist_dir, 1)
+        if args.latency_ms:
+            add_listing_latency(args.latency_ms)
+
+        serial_time, serial_count = run(jobs, playlist_dir, 1)
+        parallel_time, parallel_count = run(jobs, playlist_dir, args.workers)
+
+    print(f"{args.titles} title folders x {args.videos} videos, {args.latency_ms}ms per directory listing")
+    print(f"serial:              {serial_time:8.3f}s ({serial_count} playlists)")
+    print(f"parallel ({args.workers:2d} threads): {parallel_time:8.3f}s ({parallel_count} playlists)")
+    print(f"speedup:             {serial_time / parallel_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
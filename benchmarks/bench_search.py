@@ -0,0 +1,53 @@
+"""Time SearchIndex queries on a synthetic catalog where one token is in a large share of the names.
+
+Usage: python benchmarks/bench_search.py [--entries 100000] [--share 3] [--repeat 7]
+
+Every --share-th title is named "Lecture N", so "lecture" and the prefix "lec" match entries/share of them;
+the median and worst time of each query are printed against the 50ms budget.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from video_catalog import build_search_index
+
+QUERIES = ("lecture", "lec", "lecture 5", "talk 12", "sub", "topic 7")
+
+
+def build_nodes(entries, share):
+    nodes = [((f"Topic {t}",), None) for t in range(50)]
+    nodes += [((f"Topic {n % 50}", f"Sub {n}"), None) for n in range(977)]
+    for i in range(entries):
+        title = f"Lecture {i}" if i % share == 0 else f"Talk {i}"
+        nodes.append(((f"Topic {i % 50}", f"Sub {i % 977}", title), None))
+    return nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000, help="number of titles")
+    parser.add_argument("--share", type=int, default=3, help="one title in this many is named 'Lecture N'")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per query")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_search_index(build_nodes(args.entries, args.share), None)
+    print(f"{args.entries} titles, 1 in {args.share} named 'Lecture N'; "
+          f"index built in {time.perf_counter() - start:.1f}s")
+
+    for query in QUERIES:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            hits = index.search(query)
+            times.append((time.perf_counter() - start) * 1000)
+        print(f"{query!r:12} {len(hits):3d} hits  median {statistics.median(times):6.1f}ms  "
+              f"worst {max(times):6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
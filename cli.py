@@ -0,0 +1,134 @@
+"""Command-line entry point to a Video Navigator catalog, for scripts and headless servers (no Tk needed).
+
+Usage:
+    python cli.py [--directory DIR] [--catalog DB] [-v] populate BASE_DIR [--path NAME ...] [--workers N]
+                                                              [--order {name,path,mtime}] [--probe]
+    python cli.py [...] refresh [--path NAME ...] [--folder DIR] [--probe]
+    python cli.py [...] search QUERY [--limit N]
+    python cli.py [...] export OUT_DIR
+
+DIR holds topics_list.json, the topic files and the playlists folder (default: this script's directory);
+with --catalog the topics are read from and written to that SQLite catalog instead. --path selects a topic,
+subtopic or title by its names, e.g. --path Physics "String Theory"; without it every topic is used.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+from video_catalog import (
+    DEFAULT_PLAYLIST_ORDER, DEFAULT_PLAYLIST_WORKERS, PLAYLIST_ORDERS, RECOMMENDED_NETWORK_PLAYLIST_WORKERS,
+    SEARCH_RESULT_LIMIT, Catalog, PlaylistBuilder, ProbeCache, load_media_types, open_storage,
+)
+
+
+def playlist_builder(args, catalog):
+    probe_cache = ProbeCache(os.path.join(args.directory, ".probe_cache.pickle")) if args.probe else None
+    return PlaylistBuilder(catalog.playlist_dir, args.workers, args.order, load_media_types(args.directory),
+                           probe_cache)
+
+
+def run_scan(catalog, builder, scan):
+    start = time.perf_counter()
+    created, refreshed = catalog.run_scan(scan, print)
+    catalog.save()
+    if builder.probe_cache is not None:
+        builder.probe_cache.save()
+    print(f"{created} playlists created, {refreshed} refreshed in {time.perf_counter() - start:.1f}s")
+
+
+def populate(args, catalog):
+    # Like Populate Playlist in the app: every title below the path that has no playlist yet
+    title_paths = [path for path, value in catalog.titles(tuple(args.path)) if value == ""]
+    if not title_paths:
+        print("All titles already have playlists.")
+        return
+    builder = playlist_builder(args, catalog)
+    run_scan(catalog, builder, builder.build(title_paths, os.path.abspath(args.base_directory)))
+
+
+def refresh(args, catalog):
+    playlists = [(path, value) for path, value in catalog.titles(tuple(args.path)) if value]
+    if not playlists:
+        print("No playlists to refresh.")
+        return
+    if args.folder and len(playlists) > 1:
+        # Like Refresh Playlist in the app, a folder is only taken for a single playlist
+        print(f"--folder needs a path to a single playlist; {len(playlists)} playlists found", file=sys.stderr)
+        return 2
+    builder = playlist_builder(args, catalog)
+    run_scan(catalog, builder, builder.refresh(playlists, folder=args.folder and os.path.abspath(args.folder)))
+
+
+def search(args, catalog):
+    hits = catalog.search(args.query, args.limit)
+    for path, score in hits:
+        print(f"{score}\t{' > '.join(path)}")
+    if not hits:
+        print(f"No matches for '{args.query}'", file=sys.stderr)
+        return 1
+
+
+def export(args, catalog):
+    topics = catalog.export(args.out_directory)
+    print(f"Exported {topics} topics to {args.out_directory}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build, refresh, search and export a Video Navigator catalog.")
+    parser.add_argument("--directory", default=os.path.dirname(os.path.abspath(__file__)),
+                        help="folder with topics_list.json, the topic files and playlists/")
+    parser.add_argument("--catalog", help="SQLite catalog to use instead of the JSON topic files")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log debug messages to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    populate_parser = commands.add_parser("populate", help="create playlists for titles that have none")
+    populate_parser.add_argument("base_directory", help="folder searched for folders named after the titles")
+    refresh_parser = commands.add_parser("refresh", help="merge new and removed videos into existing playlists")
+    refresh_parser.add_argument("--folder",
+                                help="source folder, for a --path to a single playlist that has none recorded")
+    for command_parser in (populate_parser, refresh_parser):
+        command_parser.add_argument("--path", nargs="+", default=[], metavar="NAME",
+                                    help="topic, subtopics and title to limit the command to")
+        command_parser.add_argument("--workers", type=int, default=DEFAULT_PLAYLIST_WORKERS,
+                                    help="threads scanning folders; about "
+                                         f"{RECOMMENDED_NETWORK_PLAYLIST_WORKERS} for libraries on a network share")
+        command_parser.add_argument("--order", choices=PLAYLIST_ORDERS, default=DEFAULT_PLAYLIST_ORDER,
+                                    help="order of new playlists")
+        command_parser.add_argument("--probe", action="store_true",
+                                    help="record size, duration and resolution of new entries")
+    populate_parser.set_defaults(run=populate)
+    refresh_parser.set_defaults(run=refresh)
+
+    search_parser = commands.add_parser("search", help="list the items matching a query")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=SEARCH_RESULT_LIMIT)
+    search_parser.set_defaults(run=search)
+
+    export_parser = commands.add_parser("export", help="write the topics as topics_list.json and topic files")
+    export_parser.add_argument("out_directory")
+    export_parser.set_defaults(run=export)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+    catalog = Catalog(open_storage(os.path.abspath(args.directory), args.catalog)).load()
+    try:
+        if args.command in ("populate", "refresh") and args.path:
+            try:
+                catalog.get_structure(tuple(args.path))
+            except (KeyError, TypeError):
+                print(f"Not found: {' > '.join(args.path)}", file=sys.stderr)
+                return 2
+        return args.run(args, catalog)
+    finally:
+        catalog.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,20 @@
+import logging
+import os
 import tkinter as tk
 from video_navigator import VideoNavigatorApp
 
 if __name__ == "__main__":
+    # Logging configuration
+    log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "video_navigator.log")
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[
+            logging.FileHandler(log_file_path, mode='w')
+            # logging.StreamHandler()  # Optional: to keep logging in the console as well
+        ]
+    )
+
     def load_playlist_from_navigator(playlist_path):
         print("The playlist path is: ", playlist_path)
 
@@ -0,0 +1,38 @@
+import json
+import os
+import sys
+
+# The modules live at the repository root, next to main.py and cli.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Helpers shared by the test modules, imported with "from conftest import ..."
+def touch(path, data=b"", mtime=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(data)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+def bump_mtime(directory):
+    # Make sure a refresh sees the change even on filesystems with coarse timestamps
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+
+def read_json(path):
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def read_urls(playlist_path, folder=None):
+    """Return the URLs of a playlist, relative to folder if one is given."""
+    urls = [entry["url"] for entry in read_json(playlist_path)]
+    return [os.path.relpath(url, folder) for url in urls] if folder else urls
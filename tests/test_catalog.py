@@ -0,0 +1,45 @@
+import os
+
+from conftest import read_json
+from video_catalog import Catalog, JsonTopicStorage
+
+
+def make_catalog(directory):
+    catalog = Catalog(JsonTopicStorage(str(directory), str(directory / "playlists"))).load()
+    for topic_name in ("A", "B", "C"):
+        catalog.add_topic(topic_name)
+    return catalog
+
+
+def test_swapping_topics_reorders_the_topics_and_the_export(tmp_path):
+    catalog = make_catalog(tmp_path / "catalog")
+
+    catalog.swap_items((), "A", "B")
+
+    assert catalog.topic_files == ["B.json", "A.json", "C.json"]
+    assert list(catalog.topics) == ["B", "A", "C"]
+    assert read_json(str(tmp_path / "catalog" / "topics_list.json")) == ["B.json", "A.json", "C.json"]
+    catalog.export(str(tmp_path / "export"))
+    assert read_json(str(tmp_path / "export" / "topics_list.json")) == ["B.json", "A.json", "C.json"]
+
+
+def test_edits_are_written_on_save(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.add_item(("A",), "Mechanics", "subtopic")
+    catalog.add_item(("A", "Mechanics"), "Lecture", "title")
+    catalog.rename_item(("A", "Mechanics"), "Classical Mechanics")
+
+    assert read_json(str(tmp_path / "A.json")) == {}
+    catalog.save()
+    assert read_json(str(tmp_path / "A.json")) == {"Classical Mechanics": {"Lecture": ""}}
+    assert [path for path, _ in catalog.titles()] == [("A", "Classical Mechanics", "Lecture")]
+    assert os.path.isdir(catalog.playlist_dir)
+
+
+def test_has_topic_covers_listed_topics(tmp_path):
+    catalog = make_catalog(tmp_path)
+    catalog.topic_files.append("Unloaded.json")
+
+    assert catalog.has_topic("A")
+    assert catalog.has_topic("Unloaded")
+    assert not catalog.has_topic("D")
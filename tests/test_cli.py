@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+import cli
+from conftest import bump_mtime, read_json, touch, write_json
+from video_catalog import import_json_catalog, playlist_source_path
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    directory = tmp_path / "catalog"
+    directory.mkdir()
+    write_json(str(directory / "topics_list.json"), ["Physics.json"])
+    write_json(str(directory / "Physics.json"), {"Mechanics": {"Kinematics": ""}, "Optics": ""})
+    touch(str(tmp_path / "library" / "Kinematics" / "01 Velocity.mp4"))
+    touch(str(tmp_path / "library" / "Optics" / "01 Lenses.mp4"))
+    return directory
+
+
+def main(catalog_dir, *argv, catalog=None):
+    options = ["--directory", str(catalog_dir)] + (["--catalog", catalog] if catalog else [])
+    return cli.main(options + list(argv))
+
+
+def test_populate_refresh_search_export(catalog_dir, tmp_path, capsys):
+    library = tmp_path / "library"
+
+    assert main(catalog_dir, "populate", str(library)) is None
+    physics = read_json(str(catalog_dir / "Physics.json"))
+    kinematics = physics["Mechanics"]["Kinematics"]
+    assert kinematics == str(catalog_dir / "playlists" / "Kinematics.json")
+    assert [entry["url"] for entry in read_json(kinematics)] == [str(library / "Kinematics" / "01 Velocity.mp4")]
+    assert "2 playlists created" in capsys.readouterr().out
+
+    # Every title has a playlist now
+    main(catalog_dir, "populate", str(library))
+    assert "All titles already have playlists." in capsys.readouterr().out
+
+    touch(str(library / "Kinematics" / "02 Acceleration.mp4"))
+    bump_mtime(str(library / "Kinematics"))
+    main(catalog_dir, "refresh", "--path", "Physics", "Mechanics")
+    assert "Refreshed 'Kinematics': 1 added, 0 removed" in capsys.readouterr().out
+    assert len(read_json(kinematics)) == 2
+
+    assert main(catalog_dir, "search", "acceleration") is None
+    assert capsys.readouterr().out.split("\n")[0].endswith("Physics > Mechanics > Kinematics")
+    assert main(catalog_dir, "search", "relativity") == 1
+
+    export_dir = tmp_path / "export"
+    main(catalog_dir, "export", str(export_dir))
+    assert read_json(str(export_dir / "topics_list.json")) == ["Physics.json"]
+    assert read_json(str(export_dir / "Physics.json")) == physics
+
+
+def test_unknown_path_is_reported(catalog_dir, tmp_path, capsys):
+    assert main(catalog_dir, "populate", str(tmp_path / "library"), "--path", "Physics", "Relativity") == 2
+    assert "Not found: Physics > Relativity" in capsys.readouterr().err
+
+
+def test_refresh_folder_needs_a_single_playlist(catalog_dir, tmp_path, capsys):
+    library = tmp_path / "library"
+    main(catalog_dir, "populate", str(library))
+    playlists = [str(catalog_dir / "playlists" / name) for name in ("Kinematics.json", "Optics.json")]
+    for playlist_path in playlists:
+        os.remove(playlist_source_path(playlist_path))
+    touch(str(library / "Extra" / "01 Extra.mp4"))
+    capsys.readouterr()
+
+    assert main(catalog_dir, "refresh", "--folder", str(library / "Extra")) == 2
+    assert "--folder needs a path to a single playlist; 2 playlists found" in capsys.readouterr().err
+    assert not any(os.path.exists(playlist_source_path(playlist_path)) for playlist_path in playlists)
+
+    main(catalog_dir, "refresh", "--path", "Physics", "Optics", "--folder", str(library / "Extra"))
+    assert "Refreshed 'Optics': 1 added" in capsys.readouterr().out
+
+
+def test_sqlite_catalog(catalog_dir, tmp_path, capsys):
+    db_path = str(tmp_path / "catalog.db")
+    import_json_catalog(str(catalog_dir), db_path)
+
+    main(catalog_dir, "populate", str(tmp_path / "library"), "--path", "Physics", "Optics", catalog=db_path)
+    assert "1 playlists created" in capsys.readouterr().out
+    # The topic files are left alone; the catalog has the new playlist
+    assert read_json(str(catalog_dir / "Physics.json"))["Optics"] == ""
+
+    main(catalog_dir, "search", "lenses", catalog=db_path)
+    assert capsys.readouterr().out.strip().endswith("Physics > Optics")
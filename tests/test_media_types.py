@@ -0,0 +1,56 @@
+import json
+import os
+
+from conftest import touch
+from video_catalog import DEFAULT_MEDIA_TYPES, MediaTypes, list_video_directory, load_media_types, sniff_media_type
+
+
+def test_ts_files_are_media_only_when_they_are_transport_streams(tmp_path):
+    stream = str(tmp_path / "lecture.ts")
+    touch(stream, (b"\x47" + bytes(187)) * 8)
+    source = str(tmp_path / "index.ts")
+    touch(source, b"export const answer = 42;\n" * 40)
+
+    assert DEFAULT_MEDIA_TYPES.is_media("lecture.ts", stream)
+    assert not DEFAULT_MEDIA_TYPES.is_media("index.ts", source)
+    assert DEFAULT_MEDIA_TYPES.is_media("Lecture.MP4")
+    assert not DEFAULT_MEDIA_TYPES.is_media("notes.txt")
+
+
+def test_sniffing_recognises_container_signatures(tmp_path):
+    mp4 = str(tmp_path / "a")
+    touch(mp4, b"\x00\x00\x00\x18ftypisom" + bytes(16))
+    matroska = str(tmp_path / "b")
+    touch(matroska, b"\x1a\x45\xdf\xa3" + bytes(16))
+    single_packet = str(tmp_path / "c")
+    touch(single_packet, b"\x47" + bytes(100))
+
+    assert sniff_media_type(mp4) == "video/mp4"
+    assert sniff_media_type(matroska) == "video/x-matroska"
+    assert sniff_media_type(single_packet) is None
+    assert sniff_media_type(str(tmp_path / "missing")) is None
+
+
+def test_extensionless_files_are_sniffed_only_when_enabled(tmp_path):
+    folder = str(tmp_path / "videos")
+    touch(os.path.join(folder, "lecture"), b"\x00\x00\x00\x18ftypisom" + bytes(16))
+    touch(os.path.join(folder, "README"), b"plain text")
+    touch(os.path.join(folder, "talk.mkv"))
+
+    assert sorted(list_video_directory(folder)[2]) == ["talk.mkv"]
+    assert sorted(list_video_directory(folder, MediaTypes(sniff_extensionless=True))[2]) == ["lecture", "talk.mkv"]
+
+
+def test_media_types_json_replaces_the_defaults(tmp_path):
+    assert load_media_types(str(tmp_path)) is DEFAULT_MEDIA_TYPES
+
+    with open(tmp_path / "media_types.json", "w") as file:
+        json.dump({"extensions": ["MP3", ".ts"], "sniffed_extensions": []}, file)
+    media_types = load_media_types(str(tmp_path))
+
+    assert media_types.is_media("song.mp3")
+    assert media_types.is_media("index.ts")
+    assert not media_types.is_media("lecture.mp4")
+
+    (tmp_path / "media_types.json").write_text("[1, 2]")
+    assert load_media_types(str(tmp_path)) is DEFAULT_MEDIA_TYPES
@@ -0,0 +1,26 @@
+from video_catalog import move_block
+
+
+def test_moves_rows_as_one_block():
+    items = list("abcdef")
+    assert move_block(items, [1, 3], 0) == range(0, 2)
+    assert items == list("bdacef")
+
+    assert move_block(items, [0, 1], 99) == range(4, 6)
+    assert items == list("acefbd")
+
+
+def test_position_counts_among_the_remaining_rows():
+    items = list("abcdef")
+    # Rows 0 and 1 out, then after "c" and "d" of the rest
+    assert move_block(items, [0, 1], 2) == range(2, 4)
+    assert items == list("cdabef")
+
+
+def test_keeps_the_order_of_a_scattered_selection():
+    items = list(range(10))
+    assert move_block(items, [2, 5, 8], 7) == range(7, 10)
+    assert items == [0, 1, 3, 4, 6, 7, 9, 2, 5, 8]
+
+    assert move_block(items, [], 3) == range(3, 3)
+    assert items == [0, 1, 3, 4, 6, 7, 9, 2, 5, 8]
@@ -0,0 +1,109 @@
+import os
+import threading
+
+from conftest import read_urls, touch
+from video_catalog import PlaylistBuilder, generate_playlists, playlist_file_path
+
+
+def run(scan):
+    messages = []
+    results = {}
+    for kind, payload in scan:
+        if kind == "message":
+            messages.append(payload)
+        elif kind == "results":
+            results.update(payload)
+    return messages, results
+
+
+def test_same_named_titles_get_separate_playlists(tmp_path):
+    playlist_dir = str(tmp_path / "playlists")
+    os.makedirs(playlist_dir)
+    jobs = []
+    for subtopic in ("Mechanics", "Optics"):
+        folder = str(tmp_path / subtopic / "Intro")
+        touch(os.path.join(folder, f"{subtopic}.mp4"))
+        jobs.append((("Physics", subtopic, "Intro"), folder))
+
+    _, results = run(generate_playlists(jobs, playlist_dir, workers=2))
+
+    assert len(set(results.values())) == 2
+    for title_path, playlist_path in results.items():
+        assert read_urls(playlist_path) == [str(tmp_path / title_path[1] / "Intro" / f"{title_path[1]}.mp4")]
+
+
+def course_jobs(tmp_path, count):
+    playlist_dir = str(tmp_path / "playlists")
+    os.makedirs(playlist_dir)
+    jobs = []
+    for i in range(count):
+        folder = str(tmp_path / "library" / f"Course {i}")
+        touch(os.path.join(folder, "01.mp4"))
+        jobs.append((("Physics", f"Course {i}"), folder))
+    return playlist_dir, jobs
+
+
+def playlist_files(playlist_dir):
+    return {os.path.join(playlist_dir, name) for name in os.listdir(playlist_dir) if name.endswith(".json")}
+
+
+def test_cancelled_scan_keeps_and_reports_every_playlist_written(tmp_path):
+    playlist_dir, jobs = course_jobs(tmp_path, 8)
+    cancel_event = threading.Event()
+    scan = generate_playlists(jobs, playlist_dir, workers=4, cancel_event=cancel_event)
+
+    next(scan)
+    cancel_event.set()
+    _, results = run(scan)
+
+    assert set(results.values()) == playlist_files(playlist_dir)
+
+
+def test_abandoned_scan_removes_the_playlists_it_wrote(tmp_path):
+    playlist_dir, jobs = course_jobs(tmp_path, 8)
+    scan = generate_playlists(jobs, playlist_dir, workers=4)
+
+    next(scan)
+    scan.close()
+
+    assert playlist_files(playlist_dir) == set()
+    assert os.listdir(os.path.join(playlist_dir, ".sources")) == []
+
+
+def test_playlist_file_path_adds_a_hash_when_the_name_is_taken(tmp_path):
+    playlist_dir = str(tmp_path)
+    first = playlist_file_path(playlist_dir, ("Physics", "Mechanics", "Intro"))
+    assert first == os.path.join(playlist_dir, "Intro.json")
+
+    taken = {first}
+    second = playlist_file_path(playlist_dir, ("Physics", "Optics", "Intro"), taken)
+    assert second not in taken
+    assert second == playlist_file_path(playlist_dir, ("Physics", "Optics", "Intro"), taken)
+
+
+def test_build_matches_same_named_titles_by_their_parent_folders(tmp_path):
+    library = tmp_path / "library"
+    touch(str(library / "Mech" / "Intro" / "forces.mkv"))
+    touch(str(library / "Opt" / "Intro" / "x.mkv"))
+    builder = PlaylistBuilder(str(tmp_path / "playlists"), workers=2)
+    os.makedirs(builder.playlist_dir)
+
+    _, results = run(builder.build([("Physics", "Mech", "Intro"), ("Physics", "Opt", "Intro")], str(library)))
+
+    assert read_urls(results[("Physics", "Mech", "Intro")]) == [str(library / "Mech" / "Intro" / "forces.mkv")]
+    assert read_urls(results[("Physics", "Opt", "Intro")]) == [str(library / "Opt" / "Intro" / "x.mkv")]
+
+
+def test_build_skips_same_named_titles_it_cannot_tell_apart(tmp_path):
+    library = tmp_path / "library"
+    touch(str(library / "A" / "Intro" / "a.mkv"))
+    touch(str(library / "B" / "Intro" / "b.mkv"))
+    touch(str(library / "Outro" / "c.mkv"))
+    builder = PlaylistBuilder(str(tmp_path / "playlists"), workers=1)
+    os.makedirs(builder.playlist_dir)
+
+    messages, results = run(builder.build(
+        [("Physics", "Mech", "Intro"), ("Physics", "Opt", "Intro"), ("Physics", "Outro")], str(library)))
+
+    assert list(results) == [("Physics", "Outro")]
+    assert sum("match it equally well" in message for message in messages) == 2
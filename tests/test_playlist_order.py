@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from conftest import read_urls, touch
+from video_catalog import DEFAULT_PLAYLIST_ORDER, create_playlist_file, natural_sort_key
+
+
+@pytest.fixture
+def course(tmp_path):
+    folder = str(tmp_path / "Course")
+    for mtime, name in enumerate(("Part10/01 Intro.mp4", "Part2/10 End.mp4", "Part2/9 Middle.mp4",
+                                  "Part2/01 Intro.mp4", "00 Welcome.mp4"), 1000):
+        touch(os.path.join(folder, name), mtime=mtime)
+    touch(os.path.join(folder, "notes.txt"))
+    return folder
+
+
+def playlist(course, order):
+    playlist_path = os.path.join(os.path.dirname(course), f"{order}.json")
+    assert create_playlist_file(course, playlist_path, order=order)
+    return read_urls(playlist_path, course)
+
+
+def test_natural_sort_key_orders_numbers_by_value():
+    names = ["Lecture 10.mp4", "lecture 2.mp4", "Lecture 1.mp4", "Appendix.mp4", "10.mp4", "9.mp4"]
+    assert sorted(names, key=natural_sort_key) == [
+        "9.mp4", "10.mp4", "Appendix.mp4", "Lecture 1.mp4", "lecture 2.mp4", "Lecture 10.mp4"]
+
+
+def test_default_order_keeps_subfolders_together(course):
+    assert DEFAULT_PLAYLIST_ORDER == "path"
+    assert playlist(course, "path") == [
+        "00 Welcome.mp4", "Part2/01 Intro.mp4", "Part2/9 Middle.mp4", "Part2/10 End.mp4", "Part10/01 Intro.mp4"]
+
+
+def test_name_order_sorts_by_file_name_alone(course):
+    # Equal names fall back to the natural order of their paths
+    assert playlist(course, "name") == [
+        "00 Welcome.mp4", "Part2/01 Intro.mp4", "Part10/01 Intro.mp4", "Part2/9 Middle.mp4", "Part2/10 End.mp4"]
+
+
+def test_mtime_order(course):
+    assert playlist(course, "mtime") == [
+        "Part10/01 Intro.mp4", "Part2/10 End.mp4", "Part2/9 Middle.mp4", "Part2/01 Intro.mp4", "00 Welcome.mp4"]
@@ -0,0 +1,108 @@
+import os
+import struct
+
+import pytest
+
+import video_catalog
+from video_catalog import ProbeCache, probe_entries, probe_media
+
+
+def mp4_box(box_type, payload):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def ebml_element(element_id, payload=None):
+    # Masters are written with the unknown size, which the parser steps into
+    if payload is None:
+        return element_id + b"\xff"
+    return element_id + bytes([0x80 | len(payload)]) + payload
+
+
+def write_mp4(path):
+    mvhd = bytes(12) + struct.pack(">II", 1000, 90500) + bytes(80)
+    tkhd = bytes(76) + struct.pack(">II", 1280 << 16, 720 << 16)
+    moov = mp4_box(b"moov", mp4_box(b"mvhd", mvhd) + mp4_box(b"trak", mp4_box(b"tkhd", tkhd)))
+    path.write_bytes(mp4_box(b"ftyp", b"isom" + bytes(4)) + mp4_box(b"mdat", bytes(64)) + moov)
+
+
+def write_matroska(path):
+    path.write_bytes(
+        ebml_element(b"\x1a\x45\xdf\xa3", b"\x42\x82\x88matroska")
+        + ebml_element(b"\x18\x53\x80\x67")  # Segment
+        + ebml_element(b"\x15\x49\xa9\x66")  # Info
+        + ebml_element(b"\x2a\xd7\xb1", (1000000).to_bytes(3, "big"))
+        + ebml_element(b"\x44\x89", struct.pack(">f", 125000.0))
+        + ebml_element(b"\x16\x54\xae\x6b")  # Tracks
+        + ebml_element(b"\xae")  # TrackEntry
+        + ebml_element(b"\xe0")  # Video
+        + ebml_element(b"\xb0", (1920).to_bytes(2, "big"))
+        + ebml_element(b"\xba", (1080).to_bytes(2, "big"))
+        + ebml_element(b"\x1f\x43\xb6\x75", bytes(8)))  # Cluster
+
+
+def write_avi(path):
+    avih = struct.pack("<10I", 40000, 0, 0, 0, 250, 0, 1, 0, 640, 480) + bytes(16)
+    hdrl = b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih
+    body = b"AVI " + b"LIST" + struct.pack("<I", len(hdrl)) + hdrl
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+@pytest.mark.parametrize("name, write, expected", [
+    ("lecture.mp4", write_mp4, {"duration": 90.5, "width": 1280, "height": 720}),
+    ("lecture.mkv", write_matroska, {"duration": 125.0, "width": 1920, "height": 1080}),
+    ("lecture.avi", write_avi, {"duration": 10.0, "width": 640, "height": 480}),
+])
+def test_container_headers_are_parsed(tmp_path, name, write, expected):
+    path = tmp_path / name
+    write(path)
+
+    assert probe_media(str(path)) == expected
+
+
+def test_unknown_files_give_nothing_without_ffprobe(tmp_path):
+    path = tmp_path / "notes.mp4"
+    path.write_bytes(b"not a video")
+
+    assert probe_media(str(path)) == {}
+
+
+def test_probe_cache_skips_unchanged_files_across_runs(tmp_path, monkeypatch):
+    video = tmp_path / "lecture.mp4"
+    write_mp4(video)
+    cache_path = str(tmp_path / "probe_cache.pickle")
+    probed = []
+    monkeypatch.setattr(video_catalog, "probe_media",
+                        lambda path, ffprobe=None: probed.append(path) or probe_media(path))
+
+    entries = [{"url": str(video)}, {"url": "https://example.com/talk"}, {"url": str(tmp_path / "gone.mp4")}]
+    cache = ProbeCache(cache_path)
+    assert probe_entries(entries, cache) == 1
+    assert entries[0] == {"url": str(video), "duration": 90.5, "width": 1280, "height": 720,
+                          "size": os.path.getsize(video)}
+    # probe_entries leaves saving to the end of the scan
+    assert not os.path.exists(cache_path)
+    cache.save()
+
+    assert probe_entries([{"url": str(video)}], ProbeCache(cache_path)) == 1
+    assert probed == [str(video)]
+
+    # A changed file is probed again
+    with open(video, "ab") as file:
+        file.write(bytes(8))
+    assert probe_entries([{"url": str(video)}], ProbeCache(cache_path)) == 1
+    assert probed == [str(video), str(video)]
+
+
+def test_probe_cache_writes_only_when_changed(tmp_path):
+    cache_path = tmp_path / "probe_cache.pickle"
+    cache = ProbeCache(str(cache_path))
+    cache.save()
+    assert not cache_path.exists()
+
+    cache.put("/videos/a.mp4", 10, 20, {"duration": 1.0})
+    cache.save()
+    mtime = cache_path.stat().st_mtime_ns
+    cache.save()
+    assert cache_path.stat().st_mtime_ns == mtime
+    assert ProbeCache(str(cache_path)).get("/videos/a.mp4", 10, 20) == {"duration": 1.0}
+    assert ProbeCache(str(cache_path)).get("/videos/a.mp4", 11, 20) is None
@@ -0,0 +1,86 @@
+import json
+import os
+
+import video_catalog
+from conftest import bump_mtime, read_urls, touch
+from video_catalog import create_playlist_file, playlist_source_path, refresh_playlist_file
+
+
+def test_refresh_merges_added_and_removed_videos(tmp_path):
+    folder = str(tmp_path / "Course")
+    for name in ("01.mp4", "02.mp4", "03.mp4", "Extra/01.mp4"):
+        touch(os.path.join(folder, name))
+    playlist_path = str(tmp_path / "Course.json")
+    create_playlist_file(folder, playlist_path)
+
+    # Reorder and describe entries by hand, and add a link from outside the folder
+    with open(playlist_path, "r") as file:
+        playlist = json.load(file)
+    playlist[0], playlist[2] = playlist[2], playlist[0]
+    playlist[0]["description"] = "Third"
+    playlist.append({"url": "https://example.com/talk", "description": "Talk"})
+    with open(playlist_path, "w") as file:
+        json.dump(playlist, file)
+
+    os.remove(os.path.join(folder, "02.mp4"))
+    touch(os.path.join(folder, "04.mp4"))
+    bump_mtime(folder)
+
+    assert refresh_playlist_file(playlist_path) == (1, 1)
+    with open(playlist_path, "r") as file:
+        refreshed = json.load(file)
+    assert [os.path.relpath(entry["url"], folder) if entry["url"].startswith(folder) else entry["url"]
+            for entry in refreshed] == ["03.mp4", "01.mp4", "Extra/01.mp4", "https://example.com/talk", "04.mp4"]
+    assert refreshed[0]["description"] == "Third"
+
+    # Nothing changed since, so nothing is added or removed
+    assert refresh_playlist_file(playlist_path) == (0, 0)
+
+
+def test_refresh_drops_videos_of_removed_folders(tmp_path):
+    folder = str(tmp_path / "Course")
+    touch(os.path.join(folder, "01.mp4"))
+    touch(os.path.join(folder, "Extra", "01.mp4"))
+    playlist_path = str(tmp_path / "Course.json")
+    create_playlist_file(folder, playlist_path)
+
+    os.remove(os.path.join(folder, "Extra", "01.mp4"))
+    os.rmdir(os.path.join(folder, "Extra"))
+    bump_mtime(folder)
+
+    assert refresh_playlist_file(playlist_path) == (0, 1)
+    assert read_urls(playlist_path, folder) == ["01.mp4"]
+
+
+def test_only_changed_directories_are_listed_again(tmp_path, monkeypatch):
+    folder = str(tmp_path / "Course")
+    for part in ("Part1", "Part2", "Part3"):
+        touch(os.path.join(folder, part, "01.mp4"))
+    playlist_path = str(tmp_path / "Course.json")
+    create_playlist_file(folder, playlist_path)
+
+    touch(os.path.join(folder, "Part2", "02.mp4"))
+    bump_mtime(os.path.join(folder, "Part2"))
+    listed = []
+    list_video_directory = video_catalog.list_video_directory
+    monkeypatch.setattr(video_catalog, "list_video_directory",
+                        lambda directory, *args: listed.append(directory) or list_video_directory(directory, *args))
+
+    assert refresh_playlist_file(playlist_path) == (1, 0)
+    assert listed == [os.path.join(folder, "Part2")]
+    assert read_urls(playlist_path, folder)[-1] == os.path.join("Part2", "02.mp4")
+
+
+def test_playlist_without_source_record_needs_its_folder(tmp_path):
+    folder = str(tmp_path / "Course")
+    touch(os.path.join(folder, "01.mp4"))
+    touch(os.path.join(folder, "02.mp4"))
+    playlist_path = str(tmp_path / "Course.json")
+    with open(playlist_path, "w") as file:
+        json.dump([{"url": os.path.join(folder, "01.mp4"), "description": "First"}], file)
+
+    assert refresh_playlist_file(playlist_path, folder=folder) == (1, 0)
+    assert read_urls(playlist_path, folder) == ["01.mp4", "02.mp4"]
+    # The folder is recorded, so the next refresh finds it by itself
+    assert os.path.exists(playlist_source_path(playlist_path))
+    assert refresh_playlist_file(playlist_path) == (0, 0)
@@ -0,0 +1,92 @@
+import json
+
+from video_catalog import (
+    SEARCH_NAME_WEIGHT, SEARCH_SORT_TIER_SIZE, JsonTopicStorage, SearchIndex, build_search_index,
+)
+
+
+def build_index():
+    index = SearchIndex()
+    index.add(("name", ("Physics",)), "Physics")
+    index.add(("name", ("Physics", "Quantum")), "Quantum")
+    index.add(("name", ("Physics", "Quantumness")), "Quantumness")
+    index.add(("name", ("Physics", "Optics")), "Optics")
+    index.add(("playlist", ("Physics", "Optics")), "Lecture 1 Quantum optics\n/videos/optics/01.mp4")
+    index.add(("name", ("Physics", "Optics", "Quantum Optics")), "Quantum Optics")
+    return index
+
+
+def test_name_matches_rank_above_playlist_matches():
+    hits = build_index().search("quantum")
+
+    assert [path for path, _ in hits] == [
+        ("Physics", "Quantum"),                    # Whole word in the name
+        ("Physics", "Optics", "Quantum Optics"),   # The same, one level deeper
+        ("Physics", "Quantumness"),                # Name prefix
+        ("Physics", "Optics"),                     # Whole word in the playlist
+    ]
+    assert hits[0][1] == 2 * SEARCH_NAME_WEIGHT
+    assert hits[2][1] == SEARCH_NAME_WEIGHT
+
+
+def test_every_query_token_must_match():
+    index = build_index()
+
+    assert [path for path, _ in index.search("quantum optics")] == [
+        ("Physics", "Optics", "Quantum Optics"), ("Physics", "Optics")]
+    assert index.search("quantum relativity") == []
+
+
+def test_short_tokens_match_whole_words_only():
+    index = build_index()
+
+    assert index.search("qu") == []
+    assert [path for path, _ in index.search("1")] == [("Physics", "Optics")]
+
+
+def test_common_tokens_are_ranked_by_depth_and_name():
+    # More hits than are sorted directly, so the tiers are walked in the index's path order
+    index = SearchIndex()
+    count = 2 * SEARCH_SORT_TIER_SIZE
+    for i in range(count):
+        index.add(("name", ("Course", f"Part {i % 7}", f"Lecture {count - i}")), f"Lecture {count - i}")
+    index.ordered_paths()  # Keep the path order up to date through the edits below
+    index.add(("name", ("Lecture Notes",)), "Lecture Notes")
+    index.add(("name", ("Course", "Lectures")), "Lectures")
+    index.add(("playlist", ("Course", "Lectures")), "lecture 0")
+    index.remove(("name", ("Course", "Part 0", f"Lecture {count}")))
+    index.move(("name", ("Course", "Part 1", f"Lecture {count - 1}")), ("name", ("Course", "Lecture 0")))
+
+    hits = index.search("lecture", limit=5)
+
+    deepest = sorted(path for kind, path in index.documents if len(path) == 3)
+    assert [path for path, _ in hits] == [("Lecture Notes",), ("Course", "Lecture 0")] + deepest[:3]
+    assert {score for _, score in hits} == {2 * SEARCH_NAME_WEIGHT}
+    assert index.search("lectures", limit=1) == [(("Course", "Lectures"), 2 * SEARCH_NAME_WEIGHT)]
+    assert len(index.search("lec", limit=2 * count)) == count + 1
+
+
+def test_removed_and_moved_documents():
+    index = build_index()
+    index.remove(("name", ("Physics", "Quantumness")))
+    index.move(("name", ("Physics", "Quantum")), ("name", ("Physics", "Modern", "Quantum")))
+
+    assert [path for path, _ in index.search("quantumness")] == []
+    assert ("Physics", "Modern", "Quantum") in index.match("quantum", names_only=True)
+    assert ("Physics", "Quantum") not in index.match("quantum")
+
+
+def test_build_search_index_reads_the_playlists(tmp_path):
+    playlist_dir = tmp_path / "playlists"
+    playlist_dir.mkdir()
+    with open(playlist_dir / "Lenses.json", "w") as file:
+        json.dump([{"url": "/videos/Optics/01.mp4", "description": "Thin lens equation"}], file)
+    nodes = [(("Physics",), None), (("Physics", "Optics"), None), (("Physics", "Optics", "Lenses"), "Lenses.json"),
+             (("Physics", "Optics", "Mirrors"), "Missing.json")]
+
+    index = build_search_index(nodes, JsonTopicStorage(str(tmp_path), str(playlist_dir)))
+
+    assert [path for path, _ in index.search("equation")] == [("Physics", "Optics", "Lenses")]
+    assert [path for path, _ in index.search("optics")] == [
+        ("Physics", "Optics"), ("Physics", "Optics", "Lenses")]
+    assert [path for path, _ in index.search("mirrors")] == [("Physics", "Optics", "Mirrors")]
@@ -0,0 +1,135 @@
+
+import pytest
+
+from conftest import read_json, write_json
+from video_catalog import (
+    Catalog, JsonTopicStorage, SqliteTopicStorage, export_json_catalog, import_json_catalog,
+)
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path):
+    storage = SqliteTopicStorage(str(tmp_path / "catalog.db"), str(tmp_path / "playlists"))
+    yield storage
+    storage.close()
+
+
+def node_ids(storage):
+    with storage.lock:
+        return {name: node_id for node_id, name in storage.connection.execute("SELECT id, name FROM nodes")}
+
+
+def test_json_to_sqlite_to_json_round_trip(tmp_path):
+    source = tmp_path / "source"
+    playlist_path = str(source / "playlists" / "Mechanics.json")
+    entries = [{"url": "/videos/Mechanics/01 Intro.mp4", "description": "Intro"},
+               {"url": "/videos/Mechanics/02 Motion.mp4", "description": ""}]
+    write_json(playlist_path, entries)
+    physics = {"Classical": {"Mechanics": playlist_path, "Optics": ""}, "Quantum": ""}
+    write_json(str(source / "Physics.json"), physics)
+    write_json(str(source / "Empty.json"), {})
+    write_json(str(source / "topics_list.json"), ["Physics.json", "Empty.json"])
+
+    db_path = str(tmp_path / "catalog.db")
+    assert import_json_catalog(str(source), db_path) == (2, 1)
+    target = tmp_path / "target"
+    assert export_json_catalog(db_path, str(target)) == (2, 1)
+
+    assert read_json(str(target / "topics_list.json")) == ["Physics.json", "Empty.json"]
+    # Playlist paths follow the catalog to its new playlists folder
+    exported_playlist = str(target / "playlists" / "Mechanics.json")
+    assert read_json(str(target / "Physics.json")) == {
+        "Classical": {"Mechanics": exported_playlist, "Optics": ""}, "Quantum": ""}
+    assert read_json(str(target / "Empty.json")) == {}
+    assert read_json(exported_playlist) == entries
+
+
+def test_json_storage_keeps_playlist_paths_relative_in_memory(tmp_path):
+    storage = JsonTopicStorage(str(tmp_path), str(tmp_path / "playlists"))
+    storage.write_topic("Physics", {"Mechanics": "Mechanics.json", "Linked": "/elsewhere/list.json"})
+
+    assert read_json(str(tmp_path / "Physics.json"))["Mechanics"] == str(tmp_path / "playlists" / "Mechanics.json")
+    assert storage.read_topic("Physics.json") == ("Physics", {"Mechanics": "Mechanics.json",
+                                                              "Linked": "/elsewhere/list.json"})
+
+
+def test_rename_reuses_the_row_and_keeps_the_subtree(sqlite_storage):
+    sqlite_storage.write_topic("Physics", {"Mechanics": {"Lecture": "lecture.json"}, "Optics": ""})
+    before = node_ids(sqlite_storage)
+
+    sqlite_storage.write_topic("Physics", {"Classical Mechanics": {"Lecture": "lecture.json"}, "Optics": ""})
+
+    after = node_ids(sqlite_storage)
+    assert after["Classical Mechanics"] == before["Mechanics"]
+    assert after["Lecture"] == before["Lecture"]
+    assert after["Optics"] == before["Optics"]
+    assert sqlite_storage.read_topic("Physics.json") == (
+        "Physics", {"Classical Mechanics": {"Lecture": "lecture.json"}, "Optics": ""})
+
+
+def test_write_topic_deletes_and_reorders(sqlite_storage):
+    sqlite_storage.write_topic("Physics", {"A": "", "B": {"B1": ""}, "C": ""})
+
+    sqlite_storage.write_topic("Physics", {"C": "", "A": ""})
+
+    assert sqlite_storage.read_topic("Physics.json") == ("Physics", {"C": "", "A": ""})
+    assert set(node_ids(sqlite_storage)) == {"Physics", "A", "C"}
+
+
+def test_subtopic_and_title_conversions(sqlite_storage):
+    sqlite_storage.write_topic("Physics", {"Optics": {"Lenses": "lenses.json", "Mirrors": ""}})
+
+    # A subtopic that becomes a title drops its children
+    sqlite_storage.write_topic("Physics", {"Optics": "optics.json"})
+    assert sqlite_storage.read_topic("Physics.json") == ("Physics", {"Optics": "optics.json"})
+    assert set(node_ids(sqlite_storage)) == {"Physics", "Optics"}
+
+    # And a title that becomes a subtopic gets new ones
+    sqlite_storage.write_topic("Physics", {"Optics": {"Prisms": ""}})
+    assert sqlite_storage.read_topic("Physics.json") == ("Physics", {"Optics": {"Prisms": ""}})
+
+
+def test_delete_topic_leaves_topics_sharing_its_prefix(sqlite_storage):
+    catalog = Catalog(sqlite_storage).load()
+    catalog.add_topic("Test")
+    catalog.add_topic("Test_More")
+    catalog.add_item(("Test_More",), "Lecture", "title")
+    catalog.save()
+
+    catalog.delete_topic("Test")
+
+    assert catalog.topic_files == ["Test_More.json"]
+    assert sqlite_storage.load_topic_list() == ["Test_More.json"]
+    assert sqlite_storage.read_topic("Test_More.json") == ("Test_More", {"Lecture": ""})
+
+
+def test_save_topic_list_orders_without_deleting(sqlite_storage):
+    for topic_name in ("A", "B", "C"):
+        sqlite_storage.create_topic(topic_name)
+
+    sqlite_storage.save_topic_list(["C.json", "A.json", "D.json"])
+
+    assert sqlite_storage.load_topic_list() == ["C.json", "A.json", "D.json", "B.json"]
+
+
+def test_record_playlist_is_read_back(sqlite_storage, tmp_path):
+    playlist_path = str(tmp_path / "playlists" / "Mechanics.json")
+    entries = [{"url": "/videos/a.mp4", "description": "Kinematics"}]
+    sqlite_storage.record_playlist(playlist_path, entries)
+
+    assert sqlite_storage.read_playlist(playlist_path) == entries
+    assert "Kinematics" in sqlite_storage.read_playlist_text(playlist_path)
+
+
+def test_switching_topics_list_keeps_unlisted_topics(sqlite_storage):
+    catalog = Catalog(sqlite_storage).load()
+    catalog.add_topic("Physics")
+    catalog.add_item(("Physics",), "Mechanics", "title")
+    catalog.add_topic("Finance")
+    catalog.save()
+
+    catalog.topic_files = ["Finance.json"]
+    catalog.save_topic_list()
+
+    assert sqlite_storage.load_topic_list() == ["Finance.json", "Physics.json"]
+    assert sqlite_storage.read_topic("Physics.json") == ("Physics", {"Mechanics": ""})
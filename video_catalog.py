@@ -0,0 +1,2140 @@
+"""Headless core of Video Navigator: topic storage, the Catalog model, playlist building and search.
+
+Nothing here imports tkinter or configures logging, so scripts, cron jobs and benchmarks can use it
+without a display; video_navigator builds the Tk UI on top of it.
+"""
+import os
+import ntpath
+import posixpath
+import json
+import sys
+import logging
+import ctypes
+import ctypes.util
+import select
+import struct
+import time
+import hashlib
+import pickle
+import re
+import bisect
+import itertools
+import shutil
+import sqlite3
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Number of folders indexed between progress messages when scanning a base directory
+DIRECTORY_INDEX_PROGRESS_STEP = 500
+
+# Number of threads parsing topic files concurrently at startup or when loading a topics list
+TOPIC_LOAD_WORKERS = 8
+
+# Search: maximum number of ranked hits listed, and the weight of a name match relative to a playlist entry match
+SEARCH_RESULT_LIMIT = 50
+SEARCH_NAME_WEIGHT = 3
+
+# Query tokens shorter than this only match whole words; prefix-matching one or two characters would
+# pull in a large share of a big catalog for little benefit
+SEARCH_MIN_PREFIX_LENGTH = 3
+
+# Score tiers of at most this many hits are sorted directly; larger ones are walked in the index's path order
+SEARCH_SORT_TIER_SIZE = 2000
+
+# Default size of the thread pool that builds playlists in parallel during Populate Playlist (1 = serial).
+# On a local disk the scan is CPU bound and a pool is slower than one thread; for libraries on a network
+# share, where each directory listing waits on a round-trip, RECOMMENDED_NETWORK_PLAYLIST_WORKERS pays off
+# (see benchmarks/bench_populate.py --latency-ms)
+DEFAULT_PLAYLIST_WORKERS = 1
+RECOMMENDED_NETWORK_PLAYLIST_WORKERS = 8
+
+# Orders a generated playlist can be sorted in: natural order of file names, natural order of paths
+# relative to the scanned folder (keeping subfolders together), or modification time. The default is by
+# path, since sorting a course split into Part1/01, Part2/01, ... by file name alone interleaves its parts.
+PLAYLIST_ORDERS = ("name", "path", "mtime")
+DEFAULT_PLAYLIST_ORDER = "path"
+
+# File extensions picked up as videos when building a playlist from a folder, matched case-insensitively;
+# media_types.json in the script directory can replace them (see MediaTypes.from_file)
+DEFAULT_MEDIA_EXTENSIONS = (".mp4", ".m4v", ".mov", ".avi", ".mkv", ".webm", ".wmv", ".flv", ".mpg", ".mpeg")
+# Extensions shared with other kinds of files (.ts is also TypeScript), taken only when the content is media
+DEFAULT_SNIFFED_EXTENSIONS = (".ts",)
+
+# Leading bytes read to recognise a media file by content (enough for four MPEG-TS packets), and the
+# signatures looked for: (offset, bytes, MIME type)
+MEDIA_SNIFF_BYTES = 752
+MEDIA_SIGNATURES = (
+    (4, b"ftyp", "video/mp4"),
+    (0, b"\x1a\x45\xdf\xa3", "video/x-matroska"),
+    (8, b"AVI ", "video/x-msvideo"),
+    (0, b"\x30\x26\xb2\x75\x8e\x66\xcf\x11", "video/x-ms-wmv"),
+    (0, b"FLV", "video/x-flv"),
+    (0, b"\x00\x00\x01\xba", "video/mpeg"),
+    (0, b"\x00\x00\x01\xb3", "video/mpeg"),
+)
+MPEG_TS_PACKET_SIZE = 188
+
+# Media probing: threads probing videos for duration and resolution, the most of a container header read
+# when looking for them, and how long a local ffprobe may take per file
+PROBE_WORKERS = 4
+PROBE_HEADER_LIMIT = 64 * 1024 * 1024
+FFPROBE_TIMEOUT_SECONDS = 30
+
+# Thumbnails: pixel size, and bytes hashed from each end of a video to name its file
+THUMBNAIL_SIZE = (96, 54)
+THUMBNAIL_DIGEST_BYTES = 64 * 1024
+
+# Health check: how long a playlist's check result is trusted, and threads stat'ing files in parallel
+HEALTH_CHECK_TTL_SECONDS = 300
+HEALTH_CHECK_WORKERS = 16
+
+# Playlist watcher: a playlist is refreshed this long after the last change seen in its folders, and without
+# inotify the folders' mtimes are polled at this interval
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_POLL_INTERVAL_SECONDS = 5.0
+
+
+def write_json_atomic(path, data, backup=False):
+    """Write data as JSON to path so that a crash leaves either the old or the new file, never a partial one.
+
+    The JSON goes to a temporary file in the same directory, is fsynced and then renamed over the target.
+    With backup=True the previous version is kept next to it as `<path>.bak`.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    # Unique per thread so concurrent writers (e.g. the playlist pool) never share a temporary file
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "w") as file:
+            json.dump(data, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+            if backup:
+                shutil.copy2(path, f"{path}.bak")
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Persist the rename itself; directories can't be opened for fsync on Windows
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def write_pickle_atomic(path, data):
+    """Pickle data to path through a temporary file renamed over it, so readers never see a partial file.
+
+    For disposable caches: unlike write_json_atomic there is no fsync or backup.
+    """
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def topic_cache_key(topic_file_path, playlist_dir):
+    """Identify a version of a topic file by its absolute path, size and modification time.
+
+    Cached structures hold playlist paths relative to playlist_dir, so that is part of the key too.
+    """
+    stat = os.stat(topic_file_path)
+    return os.path.abspath(topic_file_path), stat.st_size, stat.st_mtime_ns, playlist_dir
+
+
+def read_topic_cache(cache_path, key):
+    """Return the structure cached under key, or None if the cache is missing, stale or unreadable."""
+    try:
+        with open(cache_path, "rb") as file:
+            cached_key, structure = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable topic cache {cache_path}: {e}")
+        return None
+    return structure if cached_key == key else None
+
+
+def write_topic_cache(cache_path, key, structure):
+    try:
+        write_pickle_atomic(cache_path, (key, structure))
+    except OSError as e:
+        logging.warning(f"Could not write topic cache {cache_path}: {e}")
+
+
+def compact_playlist_path(playlist_path, playlist_dir):
+    """Return playlist_path relative to playlist_dir when it lies inside it, otherwise unchanged."""
+    prefix = os.path.join(playlist_dir, "")
+    if playlist_path and os.path.normcase(playlist_path).startswith(os.path.normcase(prefix)):
+        return playlist_path[len(prefix):]
+    return playlist_path
+
+
+def expand_playlist_path(playlist_path, playlist_dir):
+    """Inverse of compact_playlist_path; empty and absolute paths are returned unchanged."""
+    # Topic files may hold absolute paths written on another OS, so accept either flavour as absolute
+    if playlist_path and not (ntpath.isabs(playlist_path) or posixpath.isabs(playlist_path)):
+        return os.path.join(playlist_dir, playlist_path)
+    return playlist_path
+
+
+def compact_playlist_paths(structure, playlist_dir):
+    """Rewrite, in place, every title's playlist path in a topic structure with compact_playlist_path."""
+    for key, value in structure.items():
+        if isinstance(value, dict):
+            compact_playlist_paths(value, playlist_dir)
+        else:
+            structure[key] = compact_playlist_path(value, playlist_dir)
+    return structure
+
+
+def expand_playlist_paths(structure, playlist_dir):
+    """Return a copy of a topic structure with absolute playlist paths, as stored in the topic files."""
+    return {key: expand_playlist_paths(value, playlist_dir) if isinstance(value, dict)
+            else expand_playlist_path(value, playlist_dir)
+            for key, value in structure.items()}
+
+
+def playlist_sort_key(folder, video_path, order):
+    """Return the sort key of a video file for one of PLAYLIST_ORDERS."""
+    if order == "mtime":
+        return os.stat(video_path).st_mtime_ns, natural_sort_key(video_path)
+    if order == "path":
+        return [natural_sort_key(part) for part in os.path.relpath(video_path, folder).split(os.sep)]
+    return natural_sort_key(os.path.basename(video_path)), natural_sort_key(video_path)
+
+
+def sniff_media_type(path):
+    """Return the MIME type of a media file recognised from its first bytes, or None."""
+    try:
+        with open(path, "rb") as file:
+            head = file.read(MEDIA_SNIFF_BYTES)
+    except OSError:
+        return None
+    for offset, signature, mime_type in MEDIA_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    # MPEG transport streams have a sync byte at the start of every 188-byte packet
+    packets = range(0, len(head), MPEG_TS_PACKET_SIZE)
+    if len(packets) > 1 and all(head[offset] == 0x47 for offset in packets):
+        return "video/mp2t"
+    return None
+
+
+class MediaTypes:
+    """The set of files treated as media by every folder scan.
+
+    Names are matched by their lowercased extension against a set. Files with one of sniffed_extensions
+    are opened and taken only if they start with a known signature, as are files without an extension
+    when sniff_extensionless is set.
+    """
+
+    def __init__(self, extensions=DEFAULT_MEDIA_EXTENSIONS, sniff_extensionless=False,
+                 sniffed_extensions=DEFAULT_SNIFFED_EXTENSIONS):
+        self.extensions = self.normalize(extensions)
+        self.sniffed_extensions = self.normalize(sniffed_extensions) - self.extensions
+        self.sniff_extensionless = sniff_extensionless
+
+    @staticmethod
+    def normalize(extensions):
+        return frozenset(extension.lower() if extension.startswith(".") else f".{extension.lower()}"
+                         for extension in extensions)
+
+    @classmethod
+    def from_file(cls, config_path):
+        """Read {"extensions": [...], "sniff_extensionless": bool, "sniffed_extensions": [...]} from a JSON
+        file, every key optional."""
+        with open(config_path, "r") as file:
+            config = json.load(file)
+        return cls(config.get("extensions", DEFAULT_MEDIA_EXTENSIONS), config.get("sniff_extensionless", False),
+                   config.get("sniffed_extensions", DEFAULT_SNIFFED_EXTENSIONS))
+
+    def is_media(self, name, path=None):
+        extension = os.path.splitext(name)[1].lower()
+        if extension in self.extensions:
+            return True
+        sniff = extension in self.sniffed_extensions if extension else self.sniff_extensionless
+        return sniff and path is not None and sniff_media_type(path) is not None
+
+
+DEFAULT_MEDIA_TYPES = MediaTypes()
+
+
+def load_media_types(directory):
+    """Return the media types configured in directory/media_types.json, or the defaults."""
+    config_path = os.path.join(directory, "media_types.json")
+    if os.path.exists(config_path):
+        try:
+            return MediaTypes.from_file(config_path)
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning(f"Ignoring invalid {config_path}: {e}")
+    return DEFAULT_MEDIA_TYPES
+
+
+def iter_mp4_boxes(file, start, end):
+    """Yield (type, payload offset, payload end) for the ISO media boxes between start and end."""
+    offset = start
+    while offset + 8 <= end:
+        file.seek(offset)
+        header = file.read(16)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header[:8])
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                return
+            size = struct.unpack(">Q", header[8:16])[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset
+        if size < header_size:
+            return
+        yield box_type, offset + header_size, min(offset + size, end)
+        offset += size
+
+
+def probe_mp4(file):
+    """Read duration and video size from the moov box of an MP4/MOV file; the media data is skipped."""
+    file.seek(0, os.SEEK_END)
+    file_size = file.tell()
+    metadata = {}
+    for box_type, start, end in iter_mp4_boxes(file, 0, file_size):
+        if box_type != b"moov":
+            continue
+        if end - start > PROBE_HEADER_LIMIT:
+            return metadata
+        for child_type, child_start, child_end in iter_mp4_boxes(file, start, end):
+            if child_type == b"mvhd":
+                file.seek(child_start)
+                data = file.read(child_end - child_start)
+                if data[0] == 1:
+                    timescale, duration = struct.unpack(">IQ", data[20:32])
+                else:
+                    timescale, duration = struct.unpack(">II", data[12:20])
+                if timescale:
+                    metadata["duration"] = duration / timescale
+            elif child_type == b"trak" and "width" not in metadata:
+                for track_type, track_start, track_end in iter_mp4_boxes(file, child_start, child_end):
+                    if track_type == b"tkhd":
+                        file.seek(track_start)
+                        data = file.read(track_end - track_start)
+                        # Width and height are 16.16 fixed point at the end of the track header
+                        width, height = struct.unpack(">II", data[-8:])
+                        if width and height:
+                            metadata["width"], metadata["height"] = width >> 16, height >> 16
+        break
+    return metadata
+
+
+def probe_avi(file):
+    """Read duration and video size from the main AVI header."""
+    head = file.read(4096)
+    offset = head.find(b"avih")
+    if offset < 0 or len(head) < offset + 48:
+        return {}
+    (microseconds_per_frame, _, _, _, total_frames, _, _, _,
+     width, height) = struct.unpack("<10I", head[offset + 8:offset + 48])
+    metadata = {"width": width, "height": height}
+    if microseconds_per_frame and total_frames:
+        metadata["duration"] = microseconds_per_frame * total_frames / 1e6
+    return metadata
+
+
+# Matroska element IDs: the master elements descended into and the values read
+MATROSKA_MASTERS = {0x18538067, 0x1549A966, 0x1654AE6B, 0xAE, 0xE0}  # Segment, Info, Tracks, TrackEntry, Video
+MATROSKA_CLUSTER = 0x1F43B675
+MATROSKA_TIMECODE_SCALE = 0x2AD7B1
+MATROSKA_DURATION = 0x4489
+MATROSKA_PIXEL_WIDTH = 0xB0
+MATROSKA_PIXEL_HEIGHT = 0xBA
+
+
+def read_ebml_vint(data, offset, keep_marker=False):
+    """Return (value, next offset) of the EBML variable-length integer at offset (value None if unknown)."""
+    first = data[offset]
+    length = 1
+    while length <= 8 and not first & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8 or offset + length > len(data):
+        raise ValueError("Invalid EBML integer")
+    value = first if keep_marker else first & (0xFF >> length)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = None  # Unknown size, used by live-written segments
+    return value, offset + length
+
+
+def probe_matroska(file):
+    """Read duration and video size from the Info and Tracks elements of a Matroska/WebM file."""
+    data = file.read(1024 * 1024)
+    timecode_scale = 1000000
+    duration = None
+    metadata = {}
+    offset = 0
+    while offset < len(data):
+        element_id, offset = read_ebml_vint(data, offset, keep_marker=True)
+        size, offset = read_ebml_vint(data, offset)
+        if element_id == MATROSKA_CLUSTER:
+            break  # Media data follows; everything needed comes before it
+        if element_id in MATROSKA_MASTERS or size is None:
+            continue  # Step into the element
+        value = data[offset:offset + size]
+        if element_id == MATROSKA_TIMECODE_SCALE:
+            timecode_scale = int.from_bytes(value, "big")
+        elif element_id == MATROSKA_DURATION:
+            duration = struct.unpack(">f" if size == 4 else ">d", value)[0]
+        elif element_id == MATROSKA_PIXEL_WIDTH and "width" not in metadata:
+            metadata["width"] = int.from_bytes(value, "big")
+        elif element_id == MATROSKA_PIXEL_HEIGHT and "height" not in metadata:
+            metadata["height"] = int.from_bytes(value, "big")
+        offset += size
+    if duration is not None:
+        metadata["duration"] = duration * timecode_scale / 1e9
+    return metadata
+
+
+def probe_with_ffprobe(ffprobe, path):
+    result = subprocess.run([ffprobe, "-v", "error", "-print_format", "json", "-show_format", "-show_streams", path],
+                            capture_output=True, timeout=FFPROBE_TIMEOUT_SECONDS, check=True)
+    info = json.loads(result.stdout)
+    metadata = {}
+    if "duration" in info.get("format", {}):
+        metadata["duration"] = float(info["format"]["duration"])
+    for stream in info.get("streams", []):
+        if stream.get("codec_type") == "video" and stream.get("width"):
+            metadata["width"], metadata["height"] = stream["width"], stream["height"]
+            break
+    return metadata
+
+
+def probe_media(path, ffprobe=None):
+    """Return the duration (seconds), width and height of a video, as far as they can be found.
+
+    The container header is parsed in pure Python for MP4/MOV, Matroska/WebM and AVI; other files,
+    or files the parsers get nothing from, go to ffprobe when its path is given.
+    """
+    metadata = {}
+    try:
+        with open(path, "rb") as file:
+            head = file.read(12)
+            file.seek(0)
+            if head[4:8] == b"ftyp":
+                metadata = probe_mp4(file)
+            elif head[:4] == b"\x1a\x45\xdf\xa3":
+                metadata = probe_matroska(file)
+            elif head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+                metadata = probe_avi(file)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        logging.debug(f"Could not parse the header of {path}: {e}")
+
+    if "duration" not in metadata and ffprobe:
+        try:
+            metadata = probe_with_ffprobe(ffprobe, path)
+        except (OSError, ValueError, KeyError, subprocess.SubprocessError) as e:
+            logging.debug(f"ffprobe failed on {path}: {e}")
+    return metadata
+
+
+class ProbeCache:
+    """Probed metadata keyed by (path, size, mtime), pickled to one file so unchanged videos are probed once.
+
+    Safe to use from several threads; save() writes only when something was added.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.lock = threading.Lock()
+        self.entries = None  # Path -> (size, mtime_ns, metadata), loaded on first use
+        self.dirty = False
+
+    def load(self):
+        if self.entries is not None:
+            return
+        try:
+            with open(self.cache_path, "rb") as file:
+                self.entries = pickle.load(file)
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable probe cache {self.cache_path}: {e}")
+            self.entries = {}
+
+    def get(self, path, size, mtime):
+        with self.lock:
+            self.load()
+            cached = self.entries.get(path)
+        if cached and cached[0] == size and cached[1] == mtime:
+            return cached[2]
+        return None
+
+    def put(self, path, size, mtime, metadata):
+        with self.lock:
+            self.load()
+            self.entries[path] = (size, mtime, metadata)
+            self.dirty = True
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            try:
+                write_pickle_atomic(self.cache_path, self.entries)
+            except OSError as e:
+                logging.warning(f"Could not write probe cache {self.cache_path}: {e}")
+
+
+# One pool probes for every playlist, so parallel playlist builds share PROBE_WORKERS threads
+probe_executor = None
+probe_executor_lock = threading.Lock()
+
+
+def shared_probe_executor():
+    global probe_executor
+    with probe_executor_lock:
+        if probe_executor is None:
+            probe_executor = ThreadPoolExecutor(max_workers=PROBE_WORKERS, thread_name_prefix="probe")
+        return probe_executor
+
+
+def probe_entries(entries, probe_cache, cancel_event=None):
+    """Add size, duration, width and height to the playlist entries of local files, in place.
+
+    Each file is stat'ed and looked up in probe_cache by (path, size, mtime); only files not cached are
+    probed, on the shared pool of PROBE_WORKERS threads. The cache is not saved here: whoever runs the
+    scan saves it once at the end. Returns the number of entries annotated.
+    """
+    ffprobe = shutil.which("ffprobe")
+    to_probe = []
+    annotated = 0
+    for entry in entries:
+        path = entry.get("url", "")
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            continue  # Links and missing files
+        metadata = probe_cache.get(path, stat.st_size, stat.st_mtime_ns)
+        if metadata is None:
+            to_probe.append((entry, path, stat))
+        else:
+            entry.update(metadata, size=stat.st_size)
+            annotated += 1
+
+    if to_probe:
+        def probe(job):
+            entry, path, stat = job
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            metadata = probe_media(path, ffprobe)
+            probe_cache.put(path, stat.st_size, stat.st_mtime_ns, metadata)
+            return metadata
+
+        for (entry, path, stat), metadata in zip(to_probe, shared_probe_executor().map(probe, to_probe)):
+            if metadata is not None:
+                entry.update(metadata, size=stat.st_size)
+                annotated += 1
+    return annotated
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+# The scan workers, the playlist watcher and the editor all rewrite playlist files; one lock per file
+# keeps their read-modify-write cycles from interleaving
+playlist_locks = {}
+playlist_locks_guard = threading.Lock()
+
+
+def playlist_lock(playlist_path):
+    """Return the lock held while a playlist file and its source record are read and rewritten."""
+    key = os.path.normcase(os.path.abspath(playlist_path))
+    with playlist_locks_guard:
+        return playlist_locks.setdefault(key, threading.Lock())
+
+
+def playlist_source_path(playlist_path):
+    """Return where the source folder and directory mtimes of a generated playlist are recorded."""
+    return os.path.join(os.path.dirname(playlist_path), ".sources", os.path.basename(playlist_path))
+
+
+def list_video_directory(directory, media_types=DEFAULT_MEDIA_TYPES):
+    """Return (mtime_ns, sorted subdirectory names, video file names) for one directory.
+
+    The mtime is read before listing, so an entry added during the listing shows up as a changed mtime
+    on the next refresh instead of being missed.
+    """
+    mtime = os.stat(directory).st_mtime_ns
+    subdirs = []
+    filenames = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif media_types.is_media(entry.name, entry.path):
+                filenames.append(entry.name)
+    subdirs.sort()
+    return mtime, subdirs, filenames
+
+
+def directory_from_relative(folder, relative_path):
+    return folder if relative_path == "." else os.path.join(folder, relative_path)
+
+
+def create_playlist_file(folder, playlist_path, cancel_event=None, order=DEFAULT_PLAYLIST_ORDER,
+                         media_types=DEFAULT_MEDIA_TYPES, probe_cache=None):
+    """Write a playlist of the videos found below folder to playlist_path; returns False if cancelled.
+
+    Entries are sorted by order (one of PLAYLIST_ORDERS), and given size, duration and resolution when a
+    probe_cache is passed. The folder and the mtime and subdirectories of every directory scanned are
+    recorded next to the playlist so refresh_playlist_file can rescan only what changed. Runs on scan
+    worker threads, so it must not touch any Tk widget.
+    """
+    keyed_videos = []
+    directories = {}
+    pending = [folder]
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            logging.debug(f"Cancelled playlist creation for {playlist_path}")
+            return False
+        directory = pending.pop()
+        try:
+            mtime, subdirs, filenames = list_video_directory(directory, media_types)
+        except OSError as e:
+            logging.debug(f"Skipping unreadable folder {directory}: {e}")
+            continue
+        directories[os.path.relpath(directory, folder)] = {"mtime": mtime, "subdirs": subdirs}
+        for filename in filenames:
+            video_path = os.path.join(directory, filename)
+            # Each key is computed once while scanning; the path breaks ties so entries are never compared
+            keyed_videos.append((playlist_sort_key(folder, video_path, order), video_path))
+        pending.extend(os.path.join(directory, name) for name in subdirs)
+
+    keyed_videos.sort()
+    videos = [{"url": video_path, "description": os.path.basename(video_path)} for _, video_path in keyed_videos]
+    if probe_cache is not None:
+        probe_entries(videos, probe_cache, cancel_event)
+
+    with playlist_lock(playlist_path):
+        write_json_atomic(playlist_path, videos)
+        write_playlist_source(playlist_path, {"folder": folder, "order": order, "directories": directories})
+
+    logging.debug(f"Created playlist: {playlist_path}")
+    return True
+
+
+def remove_playlist_file(playlist_path):
+    """Delete a playlist file and its source record, if present."""
+    for path in (playlist_path, playlist_source_path(playlist_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def write_playlist_source(playlist_path, source):
+    source_path = playlist_source_path(playlist_path)
+    os.makedirs(os.path.dirname(source_path), exist_ok=True)
+    write_json_atomic(source_path, source)
+
+
+def refresh_playlist_file(playlist_path, cancel_event=None, folder=None, media_types=DEFAULT_MEDIA_TYPES,
+                          probe_cache=None):
+    """Merge the videos added to or removed from a playlist's source folder into the playlist.
+
+    Only directories whose mtime changed since the last scan are listed again; the others are only
+    stat'ed. Kept entries stay in their order with their descriptions, new videos are appended in the
+    playlist's order, and entries outside the source folder (such as links) are left alone. folder is
+    used when the playlist has no source record yet, in which case every directory is listed. With a
+    probe_cache, entries without a size yet (new ones included) are probed.
+
+    Returns (added, removed) counts, or None if cancelled. Raises OSError or ValueError when the playlist
+    or its source record cannot be read.
+    """
+    with playlist_lock(playlist_path):
+        source_path = playlist_source_path(playlist_path)
+        if folder is None or os.path.exists(source_path):
+            with open(source_path, "r") as file:
+                source = json.load(file)
+        else:
+            source = {"folder": folder, "order": DEFAULT_PLAYLIST_ORDER, "directories": {}}
+        folder = source["folder"]
+        order = source.get("order", DEFAULT_PLAYLIST_ORDER)
+        known_directories = source["directories"]
+
+        with open(playlist_path, "r") as file:
+            playlist = json.load(file)
+
+        directories = {}
+        listed = {}  # Directory path -> video paths now in it, for the directories listed again
+        pending = ["."]
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                logging.debug(f"Cancelled playlist refresh for {playlist_path}")
+                return None
+            relative_path = pending.pop()
+            directory = directory_from_relative(folder, relative_path)
+            record = known_directories.get(relative_path)
+            try:
+                if record and os.stat(directory).st_mtime_ns == record["mtime"]:
+                    subdirs = record["subdirs"]
+                    directories[relative_path] = record
+                else:
+                    mtime, subdirs, filenames = list_video_directory(directory, media_types)
+                    directories[relative_path] = {"mtime": mtime, "subdirs": subdirs}
+                    listed[directory] = {os.path.join(directory, filename) for filename in filenames}
+            except OSError:
+                # Removed since the last scan; its videos are dropped below
+                continue
+            pending.extend(name if relative_path == "." else os.path.join(relative_path, name) for name in subdirs)
+
+        scanned = {directory_from_relative(folder, relative_path) for relative_path in directories}
+        gone = {directory_from_relative(folder, relative_path) for relative_path in known_directories} - scanned
+        merged = []
+        present = set()
+        for entry in playlist:
+            url = entry.get("url", "")
+            directory = os.path.dirname(url)
+            if directory in gone or (directory in listed and url not in listed[directory]):
+                continue
+            merged.append(entry)
+            present.add(url)
+
+        new_videos = sorted((playlist_sort_key(folder, video_path, order), video_path)
+                            for videos in listed.values() for video_path in videos if video_path not in present)
+        merged.extend({"url": video_path, "description": os.path.basename(video_path)} for _, video_path in new_videos)
+
+        removed = len(playlist) + len(new_videos) - len(merged)
+        probed = 0
+        if probe_cache is not None:
+            probed = probe_entries([entry for entry in merged if "size" not in entry], probe_cache, cancel_event)
+        if new_videos or removed or probed:
+            write_json_atomic(playlist_path, merged)
+        write_playlist_source(playlist_path, {"folder": folder, "order": order, "directories": directories})
+        logging.debug(f"Refreshed playlist {playlist_path}: {len(new_videos)} added, {removed} removed")
+        return len(new_videos), removed
+
+
+def playlist_file_path(playlist_dir, title_path, taken=()):
+    """Return the file a title's new playlist is written to, playlist_dir/<title>.json by default.
+
+    When that name is in taken or already on disk, a hash of the title's key path is added to it, so
+    titles of the same name in different subtopics never share a playlist file.
+    """
+    title = title_path[-1].strip()
+    playlist_path = os.path.join(playlist_dir, f"{title}.json")
+    if playlist_path in taken or os.path.exists(playlist_path):
+        digest = hashlib.sha1("\0".join(title_path).encode("utf-8")).hexdigest()[:8]
+        playlist_path = os.path.join(playlist_dir, f"{title} {digest}.json")
+    return playlist_path
+
+
+def generate_playlists(jobs, playlist_dir, workers=DEFAULT_PLAYLIST_WORKERS, cancel_event=None,
+                       order=DEFAULT_PLAYLIST_ORDER, media_types=DEFAULT_MEDIA_TYPES, probe_cache=None):
+    """Create the playlist of each (title_path, folder) job, fanning the jobs out over a thread pool.
+
+    A scan generator: yields a message per playlist as it is created, then one
+    ("results", [(title_path, playlist_path), ...]) batch so the topic files are written once at the end.
+    """
+    if cancel_event is None:
+        cancel_event = threading.Event()
+
+    # Pick every target up front so two workers never write the same file
+    taken = set()
+    targets = []
+    for title_path, folder in jobs:
+        playlist_path = playlist_file_path(playlist_dir, title_path, taken)
+        taken.add(playlist_path)
+        targets.append((title_path, folder, playlist_path))
+    jobs = targets
+
+    def build(title_path, folder, playlist_path):
+        if create_playlist_file(folder, playlist_path, cancel_event, order, media_types, probe_cache):
+            return title_path, playlist_path
+        return None
+
+    def run(job):
+        try:
+            return job, build(*job), None
+        except OSError as e:
+            return job, None, e
+
+    executor = None
+    futures = []
+    if workers > 1 and len(jobs) > 1:
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [executor.submit(run, job) for job in jobs]
+        outcomes = (future.result() for future in as_completed(futures))
+    else:
+        outcomes = map(run, jobs)
+
+    results = []
+
+    def finish():
+        """Stop the pool and return the results of jobs that finished after the loop stopped collecting them."""
+        if executor is None:
+            return []
+        # Drop queued jobs on cancel; running ones return quickly once they see the event
+        executor.shutdown(wait=True, cancel_futures=True)
+        collected = set(results)
+        stranded = []
+        for future in futures:
+            if not future.cancelled() and future.exception() is None:
+                result = future.result()[1]
+                if result and result not in collected:
+                    stranded.append(result)
+        return stranded
+
+    try:
+        for (title_path, *_), result, error in outcomes:
+            if error:
+                logging.error(f"Failed to create playlist for '{title_path[-1]}': {error}")
+                yield "message", f"Error: Could not create playlist for '{title_path[-1]}': {error}"
+            elif result:
+                results.append(result)
+                yield "message", f"Created playlist for '{title_path[-1]}' in {result[1]}"
+            if cancel_event.is_set():
+                break
+    except BaseException:
+        # The scan failed or was abandoned before its results batch, so nothing will assign the playlists
+        # written so far; remove them, or the next Populate Playlist would find their names taken
+        for _, playlist_path in results + finish():
+            remove_playlist_file(playlist_path)
+        raise
+
+    # Playlists finished while a cancel was handled are kept and assigned like the rest
+    for title_path, playlist_path in finish():
+        results.append((title_path, playlist_path))
+        yield "message", f"Created playlist for '{title_path[-1]}' in {playlist_path}"
+
+    if results:
+        yield "results", results
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens for the search index."""
+    return re.findall(r"\w+", text.casefold())
+
+
+class SearchIndex:
+    """Inverted token index over topic/subtopic/title names and the entries of their playlists.
+
+    Documents are keyed by (kind, key path) with kind "name" or "playlist"; hits are ranked per key path.
+    Only the Tk thread mutates a live index; a fresh one can be built on a worker thread and swapped in.
+    """
+
+    def __init__(self):
+        # kind -> token -> set of key paths
+        self.postings = {"name": {}, "playlist": {}}
+        self.documents = {}
+        # Sorted list of every indexed token for prefix lookups; None until first needed, so bulk builds sort once
+        self.tokens = None
+        # Depth -> sorted list of the indexed key paths, the order hits of equal score are listed in;
+        # None until first needed, like tokens
+        self.paths = None
+
+    def add(self, key, text):
+        self.remove(key)
+        kind, path = key
+        tokens = set(tokenize(text))
+        self._add_path(path)
+        self.documents[key] = tokens
+        postings = self.postings[kind]
+        for token in tokens:
+            posting = postings.get(token)
+            if posting is None:
+                if self.tokens is not None and not self._indexed(token):
+                    bisect.insort(self.tokens, token)
+                posting = postings[token] = set()
+            posting.add(path)
+
+    def remove(self, key):
+        kind, path = key
+        tokens = self.documents.pop(key, None)
+        if tokens is None:
+            return
+        self._remove_path(path)
+        postings = self.postings[kind]
+        for token in tokens:
+            posting = postings[token]
+            posting.discard(path)
+            if not posting:
+                del postings[token]
+                if self.tokens is not None and not self._indexed(token):
+                    del self.tokens[bisect.bisect_left(self.tokens, token)]
+
+    def move(self, old_key, new_key):
+        # Re-key a document without re-tokenizing it, e.g. when an ancestor is renamed
+        tokens = self.documents.pop(old_key, None)
+        if tokens is None:
+            return
+        self._remove_path(old_key[1])
+        self.remove(new_key)
+        self._add_path(new_key[1])
+        self.documents[new_key] = tokens
+        postings = self.postings[old_key[0]]
+        for token in tokens:
+            postings[token].discard(old_key[1])
+            postings[token].add(new_key[1])
+
+    def _indexed(self, token):
+        return any(token in postings for postings in self.postings.values())
+
+    def _has_path(self, path):
+        return any((kind, path) in self.documents for kind in self.postings)
+
+    def _add_path(self, path):
+        # Called before the path's document is stored
+        if self.paths is not None and not self._has_path(path):
+            bisect.insort(self.paths.setdefault(len(path), []), path)
+
+    def _remove_path(self, path):
+        # Called after the path's document is dropped
+        if self.paths is not None and not self._has_path(path):
+            paths = self.paths[len(path)]
+            del paths[bisect.bisect_left(paths, path)]
+
+    def ordered_paths(self):
+        """Return {depth: sorted key paths} over every indexed key path."""
+        if self.paths is None:
+            paths = {}
+            for path in {path for _, path in self.documents}:
+                paths.setdefault(len(path), []).append(path)
+            for depth_paths in paths.values():
+                depth_paths.sort()
+            self.paths = paths
+        return self.paths
+
+    def expand(self, token):
+        """Return the indexed tokens that start with token."""
+        if self.tokens is None:
+            self.tokens = sorted(set(self.postings["name"]) | set(self.postings["playlist"]))
+        start = bisect.bisect_left(self.tokens, token)
+        # Every token with this prefix sorts before the prefix followed by the highest code point
+        end = bisect.bisect_left(self.tokens, token + "\U0010ffff", start)
+        return self.tokens[start:end]
+
+    def _token_matches(self, query_token):
+        """Return (whole-word name, name prefix, whole-word playlist, playlist prefix) path sets for a query token."""
+        name_postings = self.postings["name"]
+        playlist_postings = self.postings["playlist"]
+        expanded = self.expand(query_token) if len(query_token) >= SEARCH_MIN_PREFIX_LENGTH else [query_token]
+        # Set unions and intersections run in C, so only the final candidates are scored in Python
+        name_prefix = set().union(*(name_postings.get(token, ()) for token in expanded))
+        playlist_prefix = set().union(*(playlist_postings.get(token, ()) for token in expanded))
+        return (name_postings.get(query_token, set()), name_prefix,
+                playlist_postings.get(query_token, set()), playlist_prefix)
+
+    def match(self, query, names_only=False):
+        """Return the set of key paths matching every query token, without ranking them."""
+        candidates = None
+        for query_token in set(tokenize(query)):
+            _, name_prefix, _, playlist_prefix = self._token_matches(query_token)
+            matched = name_prefix if names_only else name_prefix | playlist_prefix
+            candidates = matched if candidates is None else candidates & matched
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Return up to limit (key path, score) hits matching every query token, best first.
+
+        Each query token of at least SEARCH_MIN_PREFIX_LENGTH characters matches indexed tokens it is a
+        prefix of; shorter ones must match a whole word. Per token, a whole-word name match scores highest,
+        then a name prefix, a whole-word playlist entry match and a playlist prefix.
+        """
+        # Split each token's matches into disjoint levels by the score they give it
+        name_exact_weight = 2 * SEARCH_NAME_WEIGHT
+        token_levels = []
+        for query_token in set(tokenize(query)):
+            name_exact, name_prefix, playlist_exact, playlist_prefix = self._token_matches(query_token)
+            playlist_exact = playlist_exact - name_prefix
+            levels = [(weight, paths) for weight, paths in (
+                (name_exact_weight, name_exact), (SEARCH_NAME_WEIGHT, name_prefix - name_exact),
+                (2, playlist_exact), (1, playlist_prefix - name_prefix - playlist_exact)) if paths]
+            if not levels:
+                return []
+            token_levels.append(levels)
+        if not token_levels:
+            return []
+
+        # Intersect one level per token to get the hits of each total score; set operations run in C
+        tiers = {}
+        stack = [(0, 0, None)]
+        while stack:
+            token_index, score, paths = stack.pop()
+            if token_index == len(token_levels):
+                tiers.setdefault(score, []).append(paths)
+                continue
+            for weight, level in token_levels[token_index]:
+                matched = level if paths is None else paths & level
+                if matched:
+                    stack.append((token_index + 1, score + weight, matched))
+
+        # Best score first, then shallower paths, then alphabetical; only the tiers needed are ordered
+        hits = []
+        for score in sorted(tiers, reverse=True):
+            parts = tiers[score]
+            paths = parts[0] if len(parts) == 1 else set().union(*parts)
+            needed = limit - len(hits)
+            if len(paths) <= SEARCH_SORT_TIER_SIZE:
+                best = sorted(paths, key=lambda path: (len(path), path))[:needed]
+            else:
+                # Walk the index's paths in order, testing membership in C, until enough hits are found
+                best = []
+                ordered = self.ordered_paths()
+                for depth in sorted(ordered):
+                    best += itertools.islice(filter(paths.__contains__, ordered[depth]), needed - len(best))
+                    if len(best) == needed:
+                        break
+            hits += [(path, score) for path in best]
+            if len(hits) >= limit:
+                break
+        return hits
+
+
+def read_playlist_text(playlist_path):
+    """Return the descriptions and URLs of a playlist file as one string for indexing ("" if unreadable)."""
+    try:
+        with open(playlist_path, "r") as file:
+            playlist = json.load(file)
+        return " ".join(f"{entry.get('description', '')} {entry.get('url', '')}" for entry in playlist)
+    except (OSError, ValueError, AttributeError, TypeError) as e:
+        logging.debug(f"Not indexing playlist {playlist_path}: {e}")
+        return ""
+
+
+# inotify event bits for changes to a directory's entries, plus the kernel's bookkeeping events
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Directory watches through Linux inotify, called via ctypes so no extra package is needed."""
+
+    MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.directories = {}  # Watch descriptor -> directory
+        self.watches = {}  # Directory -> watch descriptor
+
+    def add(self, directory):
+        if directory in self.watches:
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+        self.directories[wd] = directory
+        self.watches[directory] = wd
+
+    def remove(self, directory):
+        wd = self.watches.pop(directory, None)
+        if wd is not None:
+            self.directories.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout):
+        """Return the watched directories changed within timeout seconds (all of them on queue overflow)."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size + name_length
+            if mask & IN_Q_OVERFLOW:
+                return set(self.watches)
+            directory = self.directories.get(wd)
+            if directory is None:
+                continue
+            changed.add(directory)
+            if mask & IN_IGNORED:
+                # The kernel dropped the watch because the directory went away
+                del self.directories[wd]
+                self.watches.pop(directory, None)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PlaylistWatcher:
+    """Keeps generated playlists in step with their source folders while the app runs.
+
+    A daemon thread watches the directories recorded for each playlist by create_playlist_file, through
+    inotify where available and otherwise by polling their mtimes, and calls refresh_playlist_file
+    WATCH_DEBOUNCE_SECONDS after the last change to a playlist's folders, so bursts of copies cause one
+    refresh. on_refreshed(playlist_path, added, removed) is called from the watcher thread. get_probe_cache,
+    if given, is called before each refresh and returns the ProbeCache to annotate new entries with, or None.
+    """
+
+    def __init__(self, on_refreshed, use_inotify=True, media_types=DEFAULT_MEDIA_TYPES, get_probe_cache=None):
+        self.on_refreshed = on_refreshed
+        self.use_inotify = use_inotify
+        self.media_types = media_types
+        self.get_probe_cache = get_probe_cache
+        self.lock = threading.Lock()
+        self.playlist_paths = set()
+        self.playlists_changed = True
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def set_playlists(self, playlist_paths):
+        """Replace the set of playlist files to keep current; safe to call from any thread."""
+        with self.lock:
+            self.playlist_paths = set(playlist_paths)
+            self.playlists_changed = True
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        inotify = None
+        if self.use_inotify:
+            try:
+                inotify = Inotify()
+            except OSError as e:
+                logging.debug(f"inotify unavailable, polling playlist folders instead: {e}")
+
+        directory_playlists = {}  # Watched directory -> playlist files built from it
+        seen_mtimes = {}  # Directory -> mtime at the last poll
+        due = {}  # Playlist file -> time its refresh is due
+        try:
+            while not self.stop_event.is_set():
+                with self.lock:
+                    resync = self.playlists_changed
+                    self.playlists_changed = False
+                    playlist_paths = set(self.playlist_paths)
+                changed = set()
+                if resync:
+                    directory_playlists, recorded_mtimes = self.read_sources(playlist_paths)
+                    inotify = self.update_watches(inotify, directory_playlists)
+                    # New directories start from their recorded mtime, so changes made while nothing was
+                    # watching them are picked up as well
+                    new_directories = {directory: None for directory in directory_playlists
+                                       if directory not in seen_mtimes}
+                    seen_mtimes = {directory: seen_mtimes.get(directory, recorded_mtimes[directory])
+                                   for directory in directory_playlists}
+                    changed = self.poll(new_directories, seen_mtimes)
+
+                now = time.monotonic()
+                timeout = min([deadline - now for deadline in due.values()] + [WATCH_POLL_INTERVAL_SECONDS])
+                if not changed:
+                    if inotify is not None:
+                        # Short waits keep stop() responsive
+                        changed = inotify.wait(max(0.0, min(timeout, 1.0)))
+                    else:
+                        self.stop_event.wait(max(0.0, timeout))
+                        changed = self.poll(directory_playlists, seen_mtimes)
+
+                now = time.monotonic()
+                for directory in changed:
+                    for playlist_path in directory_playlists.get(directory, ()):
+                        due[playlist_path] = now + WATCH_DEBOUNCE_SECONDS
+
+                for playlist_path in [path for path, deadline in due.items() if deadline <= now]:
+                    del due[playlist_path]
+                    if playlist_path in playlist_paths and not self.stop_event.is_set():
+                        self.refresh(playlist_path)
+                        # The source record now lists the new directories and mtimes
+                        with self.lock:
+                            self.playlists_changed = True
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def read_sources(self, playlist_paths):
+        """Return the directories recorded for the playlists, mapped to their playlists and to their mtimes."""
+        directory_playlists = {}
+        recorded_mtimes = {}
+        for playlist_path in playlist_paths:
+            try:
+                with open(playlist_source_path(playlist_path), "r") as file:
+                    source = json.load(file)
+            except (OSError, ValueError):
+                continue  # Not generated from a folder, or generated before sources were recorded
+            for relative_path, record in source.get("directories", {}).items():
+                directory = directory_from_relative(source["folder"], relative_path)
+                directory_playlists.setdefault(directory, set()).add(playlist_path)
+                recorded_mtimes[directory] = record["mtime"]
+        return directory_playlists, recorded_mtimes
+
+    def update_watches(self, inotify, directory_playlists):
+        if inotify is None:
+            return None
+        for directory in set(inotify.watches) - set(directory_playlists):
+            inotify.remove(directory)
+        try:
+            for directory in directory_playlists:
+                inotify.add(directory)
+        except OSError as e:
+            # Typically the per-user watch limit; polling covers every directory instead
+            logging.warning(f"Falling back to polling playlist folders: {e}")
+            inotify.close()
+            return None
+        return inotify
+
+    def poll(self, directories, seen_mtimes):
+        """Return the directories whose mtime differs from seen_mtimes, recording the new ones."""
+        changed = set()
+        for directory in directories:
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            if directory in seen_mtimes and seen_mtimes[directory] != mtime:
+                changed.add(directory)
+            seen_mtimes[directory] = mtime
+        return changed
+
+    def refresh(self, playlist_path):
+        probe_cache = self.get_probe_cache() if self.get_probe_cache is not None else None
+        try:
+            counts = refresh_playlist_file(playlist_path, self.stop_event, media_types=self.media_types,
+                                           probe_cache=probe_cache)
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Failed to refresh watched playlist {playlist_path}: {e}")
+            return
+        finally:
+            if probe_cache is not None:
+                probe_cache.save()
+        if counts and any(counts):
+            self.on_refreshed(playlist_path, *counts)
+
+
+def check_playlists(playlist_paths, workers=HEALTH_CHECK_WORKERS):
+    """Return {playlist path: (exists, [urls of missing videos])}, reading and stat'ing files in parallel.
+
+    The playlist files are read first; then every local video they list is checked once, however many
+    playlists share it. A playlist that cannot be read counts as missing.
+    """
+    def read(playlist_path):
+        try:
+            with open(playlist_path, "r") as file:
+                entries = json.load(file)
+            return playlist_path, True, [entry.get("url", "") for entry in entries if isinstance(entry, dict)]
+        except (OSError, ValueError, TypeError):
+            return playlist_path, False, []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        playlists = list(executor.map(read, playlist_paths))
+        # Links such as YouTube URLs are not files
+        urls = list({url for _, _, entry_urls in playlists for url in entry_urls if url and "://" not in url})
+        present = dict(zip(urls, executor.map(os.path.exists, urls)))
+
+    return {playlist_path: (exists, [url for url in entry_urls if present.get(url) is False])
+            for playlist_path, exists, entry_urls in playlists}
+
+
+def natural_sort_key(text):
+    """Sort key ordering embedded numbers by value, so "Lecture 9" comes before "Lecture 10"."""
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"(\d+)", text.casefold()) if part]
+
+
+def move_block(items, indices, position):
+    """Move the rows at the sorted indices, as one block, to position among the remaining rows.
+
+    The list is rebuilt with a single slice assignment; returns the range of indices the block now occupies.
+    """
+    chosen = set(indices)
+    block = [items[index] for index in indices]
+    rest = [item for index, item in enumerate(items) if index not in chosen]
+    position = max(0, min(position, len(rest)))
+    items[:] = rest[:position] + block + rest[position:]
+    return range(position, position + len(block))
+
+
+def video_digest(path):
+    """Name a video by its content: a hash of its size and of the bytes at its start and end.
+
+    Cheap next to hashing the whole file, and unchanged when the video is renamed or moved.
+    """
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+        digest.update(str(size).encode())
+        file.seek(0)
+        digest.update(file.read(THUMBNAIL_DIGEST_BYTES))
+        if size > 2 * THUMBNAIL_DIGEST_BYTES:
+            file.seek(size - THUMBNAIL_DIGEST_BYTES)
+            digest.update(file.read(THUMBNAIL_DIGEST_BYTES))
+    return digest.hexdigest()
+
+
+def generate_thumbnail(ffmpeg, video_path, cache_dir):
+    """Return the path of a PNG thumbnail of a video, extracting a frame with ffmpeg if not cached yet.
+
+    Thumbnails are stored under the video's content digest, so copies and renamed files share one.
+    Returns None if no frame could be extracted.
+    """
+    thumbnail_path = os.path.join(cache_dir, f"{video_digest(video_path)}.png")
+    if os.path.exists(thumbnail_path):
+        return thumbnail_path
+
+    width, height = THUMBNAIL_SIZE
+    temp_path = f"{thumbnail_path}.{os.getpid()}-{threading.get_ident()}.png"
+    # A frame a few seconds in is more telling than the first one; short clips fall back to the start
+    for seek in ("5", "0"):
+        try:
+            subprocess.run([ffmpeg, "-v", "error", "-ss", seek, "-i", video_path, "-frames:v", "1",
+                            "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease", "-y", temp_path],
+                           capture_output=True, timeout=FFPROBE_TIMEOUT_SECONDS, check=True)
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.debug(f"ffmpeg could not extract a frame at {seek}s from {video_path}: {e}")
+            continue
+        if os.path.exists(temp_path) and os.path.getsize(temp_path):
+            os.replace(temp_path, thumbnail_path)
+            return thumbnail_path
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+    return None
+
+
+class JsonTopicStorage:
+    """Topics stored as topics_list.json plus one JSON file per topic, the layout the app has always used.
+
+    Every save rewrites the whole topic file. Topic structures are handed over with playlist paths relative
+    to playlist_dir, as the app keeps them in memory. Playlists are plain JSON files in either backend.
+    """
+
+    def __init__(self, directory, playlist_dir, topics_list_path=None, topic_cache_dir=None):
+        self.directory = directory
+        self.playlist_dir = playlist_dir
+        self.topics_list_path = topics_list_path or os.path.join(directory, "topics_list.json")
+        # Parsed topic trees are pickled here, keyed by each topic file's path, size and mtime
+        self.topic_cache_dir = topic_cache_dir
+        if topic_cache_dir:
+            os.makedirs(topic_cache_dir, exist_ok=True)
+
+    def load_topic_list(self):
+        logging.debug(f"Loading topic files from: {self.topics_list_path}")
+        if os.path.exists(self.topics_list_path):
+            with open(self.topics_list_path, "r") as file:
+                return json.load(file)
+        logging.warning(f"topics_list.json not found in {self.directory}")
+        return []
+
+    def save_topic_list(self, topic_files):
+        topics_list_path = os.path.join(self.directory, "topics_list.json")
+        logging.debug(f"Saving topic files to: {topics_list_path}")
+        write_json_atomic(topics_list_path, topic_files, backup=True)
+
+    def read_topic(self, topic_file):
+        """Return (topic name, parsed structure) for a topics list entry, or a None structure if it is missing.
+
+        Only reads the file, so it is safe to call from loader threads.
+        """
+        topic_file_path = os.path.join(self.directory, topic_file)
+        topic_name = os.path.splitext(os.path.basename(topic_file_path))[0]
+        if not os.path.exists(topic_file_path):
+            logging.warning(f"Topic file not found: {topic_file_path}")
+            return topic_name, None
+
+        if self.topic_cache_dir:
+            cache_path = self.topic_cache_path(topic_file_path)
+            key = topic_cache_key(topic_file_path, self.playlist_dir)
+            structure = read_topic_cache(cache_path, key)
+            if structure is not None:
+                logging.debug(f"Loaded topic: {topic_name} from cache")
+                return topic_name, structure
+
+        with open(topic_file_path, "r") as file:
+            # Keep playlist paths relative to playlist_dir in memory (and in the cache); they are
+            # expanded again when the topic is saved and when a playlist is opened
+            structure = compact_playlist_paths(json.load(file), self.playlist_dir)
+        logging.debug(f"Loaded topic: {topic_name} from {topic_file_path}")
+
+        if self.topic_cache_dir:
+            write_topic_cache(cache_path, key, structure)
+        return topic_name, structure
+
+    def topic_cache_path(self, topic_file_path):
+        digest = hashlib.sha1(os.path.abspath(topic_file_path).encode("utf-8")).hexdigest()
+        return os.path.join(self.topic_cache_dir, f"{digest}.pickle")
+
+    def write_topic(self, topic_name, structure):
+        topic_file_path = os.path.join(self.directory, f"{topic_name}.json")
+        write_json_atomic(topic_file_path, expand_playlist_paths(structure, self.playlist_dir), backup=True)
+        if self.topic_cache_dir:
+            # Refresh the cache so the next start doesn't re-parse a file we just wrote ourselves
+            key = topic_cache_key(topic_file_path, self.playlist_dir)
+            write_topic_cache(self.topic_cache_path(topic_file_path), key, structure)
+        logging.debug(f"Saved updated topic '{topic_name}' to {topic_file_path}")
+
+    def create_topic(self, topic_name):
+        topic_file_path = os.path.join(self.directory, f"{topic_name}.json")
+        write_json_atomic(topic_file_path, {})
+        logging.debug(f"Created new topic file: {topic_file_path}")
+
+    def delete_topic(self, topic_name):
+        topic_file_path = os.path.join(self.directory, f"{topic_name}.json")
+        if os.path.exists(topic_file_path):
+            os.remove(topic_file_path)
+            logging.debug(f"Deleted topic file: {topic_file_path}")
+
+    def read_playlist(self, playlist_path):
+        """Return the entries of the playlist at playlist_path, or None if it can't be read."""
+        try:
+            with open(playlist_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def read_playlist_text(self, playlist_path):
+        return read_playlist_text(playlist_path)
+
+    def record_playlist(self, playlist_path, entries=None):
+        # The playlist file itself is the record
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteTopicStorage:
+    """Topics and playlist entries in a single SQLite catalog, as an alternative to per-topic JSON files.
+
+    Every topic, subtopic and title is a row in `nodes`, ordered among its siblings by `ordinal`; a title's
+    playlist path (relative to playlist_dir) is in `playlist`, NULL for topics and subtopics. Saving a topic
+    compares it with the stored rows and only inserts, updates or deletes the rows that changed, in one
+    transaction.
+
+    Playlist files stay on disk because the player and the folder scans work with them; `playlist_entries`
+    records their entries whenever the app writes or assigns one, so search indexing and exports read the
+    catalog instead of thousands of files. The connection is shared by the Tk thread and the loader and
+    indexing threads, serialized by a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS nodes (
+            id INTEGER PRIMARY KEY,
+            parent_id INTEGER REFERENCES nodes(id) ON DELETE CASCADE,
+            ordinal INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            playlist TEXT
+        );
+        CREATE INDEX IF NOT EXISTS nodes_parent ON nodes(parent_id, ordinal);
+        CREATE INDEX IF NOT EXISTS nodes_name ON nodes(name);
+        CREATE TABLE IF NOT EXISTS playlist_entries (
+            playlist TEXT NOT NULL,
+            ordinal INTEGER NOT NULL,
+            url TEXT NOT NULL,
+            description TEXT NOT NULL,
+            entry TEXT NOT NULL,
+            PRIMARY KEY (playlist, ordinal)
+        );
+        CREATE INDEX IF NOT EXISTS playlist_entries_url ON playlist_entries(url);
+    """
+
+    # A node and all of its descendants
+    SUBTREE_QUERY = """
+        WITH RECURSIVE subtree(id) AS (
+            SELECT ? UNION ALL SELECT nodes.id FROM nodes JOIN subtree ON nodes.parent_id = subtree.id
+        )
+        SELECT nodes.id, nodes.parent_id, nodes.ordinal, nodes.name, nodes.playlist
+        FROM nodes JOIN subtree ON nodes.id = subtree.id
+    """
+
+    def __init__(self, db_path, playlist_dir):
+        self.db_path = db_path
+        self.playlist_dir = playlist_dir
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(self.SCHEMA)
+        logging.debug(f"Opened topic catalog {db_path}")
+
+    def load_topic_list(self):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name FROM nodes WHERE parent_id IS NULL ORDER BY ordinal").fetchall()
+        return [f"{name}.json" for name, in rows]
+
+    def save_topic_list(self, topic_files):
+        """Order the topics as in topic_files and add missing ones empty; topics are only removed by delete_topic."""
+        topic_names = [os.path.splitext(os.path.basename(topic_file))[0] for topic_file in topic_files]
+        with self.lock, self.connection:
+            roots = dict(self.connection.execute("SELECT name, id FROM nodes WHERE parent_id IS NULL").fetchall())
+            for ordinal, topic_name in enumerate(topic_names):
+                if topic_name in roots:
+                    self.connection.execute("UPDATE nodes SET ordinal = ? WHERE id = ? AND ordinal != ?",
+                                            (ordinal, roots.pop(topic_name), ordinal))
+                else:
+                    self.connection.execute("INSERT INTO nodes (parent_id, ordinal, name) VALUES (NULL, ?, ?)",
+                                            (ordinal, topic_name))
+            # Topics left out of the list keep their rows, ordered after the listed ones
+            for ordinal, root_id in enumerate(roots.values(), len(topic_names)):
+                self.connection.execute("UPDATE nodes SET ordinal = ? WHERE id = ?", (ordinal, root_id))
+        logging.debug(f"Saved the order of {len(topic_names)} topics to {self.db_path}")
+
+    def read_topic(self, topic_file):
+        topic_name = os.path.splitext(os.path.basename(topic_file))[0]
+        with self.lock:
+            root_id = self.root_id(topic_name)
+            if root_id is None:
+                logging.warning(f"Topic not found in catalog: {topic_name}")
+                return topic_name, None
+            children = self.read_children(root_id)
+
+        def build(node_id):
+            return {name: build(child_id) if playlist is None else playlist
+                    for child_id, name, playlist in children.get(node_id, ())}
+
+        return topic_name, build(root_id)
+
+    def root_id(self, topic_name):
+        row = self.connection.execute("SELECT id FROM nodes WHERE parent_id IS NULL AND name = ?",
+                                      (topic_name,)).fetchone()
+        return row[0] if row else None
+
+    def read_children(self, node_id):
+        """Return {parent id: [(id, name, playlist) in sibling order]} for the subtree under node_id."""
+        children = {}
+        for child_id, parent_id, ordinal, name, playlist in sorted(
+                self.connection.execute(self.SUBTREE_QUERY, (node_id,)), key=lambda row: row[2]):
+            if child_id != node_id:
+                children.setdefault(parent_id, []).append((child_id, name, playlist))
+        return children
+
+    def write_topic(self, topic_name, structure):
+        with self.lock, self.connection:
+            root_id = self.root_id(topic_name)
+            if root_id is None:
+                root_id = self.insert_root(topic_name)
+            changes = self.update_children(root_id, structure, self.read_children(root_id))
+        logging.debug(f"Saved updated topic '{topic_name}' to {self.db_path} ({changes} rows changed)")
+
+    def update_children(self, parent_id, structure, children):
+        """Bring the stored children of parent_id in line with structure; returns the number of rows written."""
+        changes = 0
+        stored = {name: (child_id, playlist) for child_id, name, playlist in children.get(parent_id, ())}
+        # Stored children whose name is gone; new names reuse them in order, so a rename updates a single row
+        # and keeps the subtree below it
+        unmatched = [(name, child_id, playlist) for child_id, name, playlist in children.get(parent_id, ())
+                     if name not in structure]
+        positions = {child_id: ordinal for ordinal, (child_id, _, _) in enumerate(children.get(parent_id, ()))}
+
+        for ordinal, (name, value) in enumerate(structure.items()):
+            playlist = value if isinstance(value, str) else None
+            if name in stored:
+                child_id, stored_playlist = stored[name]
+                stored_name = name
+            elif unmatched:
+                stored_name, child_id, stored_playlist = unmatched.pop(0)
+            else:
+                self.insert_subtree(parent_id, ordinal, name, value)
+                changes += 1
+                continue
+
+            if (positions[child_id], stored_name, stored_playlist) != (ordinal, name, playlist):
+                self.connection.execute("UPDATE nodes SET ordinal = ?, name = ?, playlist = ? WHERE id = ?",
+                                        (ordinal, name, playlist, child_id))
+                changes += 1
+            if playlist is None:
+                changes += self.update_children(child_id, value, children)
+            elif child_id in children:
+                # A subtopic became a title; its former children go with it
+                self.connection.execute("DELETE FROM nodes WHERE parent_id = ?", (child_id,))
+                changes += 1
+
+        self.connection.executemany("DELETE FROM nodes WHERE id = ?", [(child_id,) for _, child_id, _ in unmatched])
+        return changes + len(unmatched)
+
+    def insert_root(self, topic_name):
+        ordinal, = self.connection.execute(
+            "SELECT COALESCE(MAX(ordinal) + 1, 0) FROM nodes WHERE parent_id IS NULL").fetchone()
+        return self.connection.execute("INSERT INTO nodes (parent_id, ordinal, name) VALUES (NULL, ?, ?)",
+                                       (ordinal, topic_name)).lastrowid
+
+    def insert_subtree(self, parent_id, ordinal, name, value):
+        playlist = value if isinstance(value, str) else None
+        node_id = self.connection.execute(
+            "INSERT INTO nodes (parent_id, ordinal, name, playlist) VALUES (?, ?, ?, ?)",
+            (parent_id, ordinal, name, playlist)).lastrowid
+        if playlist is None:
+            for child_ordinal, (child_name, child_value) in enumerate(value.items()):
+                self.insert_subtree(node_id, child_ordinal, child_name, child_value)
+
+    def create_topic(self, topic_name):
+        with self.lock, self.connection:
+            if self.root_id(topic_name) is None:
+                self.insert_root(topic_name)
+        logging.debug(f"Created new topic '{topic_name}' in {self.db_path}")
+
+    def delete_topic(self, topic_name):
+        with self.lock, self.connection:
+            # The foreign key cascades the delete to the topic's subtree
+            self.connection.execute("DELETE FROM nodes WHERE parent_id IS NULL AND name = ?", (topic_name,))
+        logging.debug(f"Deleted topic '{topic_name}' from {self.db_path}")
+
+    def read_playlist(self, playlist_path):
+        """Return the recorded entries of the playlist at playlist_path, or None if none are recorded."""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT entry FROM playlist_entries WHERE playlist = ? ORDER BY ordinal",
+                (compact_playlist_path(playlist_path, self.playlist_dir),)).fetchall()
+        return [json.loads(entry) for entry, in rows] if rows else None
+
+    def read_playlist_text(self, playlist_path):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT description, url FROM playlist_entries WHERE playlist = ? ORDER BY ordinal",
+                (compact_playlist_path(playlist_path, self.playlist_dir),)).fetchall()
+        if not rows:
+            # Not recorded yet (e.g. a playlist added before the catalog existed); read the file itself
+            return read_playlist_text(playlist_path)
+        return " ".join(f"{description} {url}" for description, url in rows)
+
+    def record_playlist(self, playlist_path, entries=None):
+        """Replace the recorded entries of a playlist with entries, read from its file when not given.
+
+        A playlist file that is gone or unreadable has its entries removed.
+        """
+        if entries is None:
+            try:
+                with open(playlist_path, "r") as file:
+                    entries = json.load(file)
+            except (OSError, ValueError):
+                entries = []
+        rows = [(ordinal, entry.get("url", ""), entry.get("description", ""), json.dumps(entry))
+                for ordinal, entry in enumerate(entries) if isinstance(entry, dict)]
+
+        stored_path = compact_playlist_path(playlist_path, self.playlist_dir)
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM playlist_entries WHERE playlist = ?", (stored_path,))
+            self.connection.executemany(
+                "INSERT INTO playlist_entries (playlist, ordinal, url, description, entry) VALUES (?, ?, ?, ?, ?)",
+                [(stored_path,) + row for row in rows])
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def iter_structure_values(structure):
+    """Yield the playlist path of every title in a topic structure."""
+    for value in structure.values():
+        if isinstance(value, dict):
+            yield from iter_structure_values(value)
+        else:
+            yield value
+
+
+def copy_catalog(source, target):
+    """Copy every topic and playlist of one topic storage into another; returns (topics, playlists) copied.
+
+    Both storages must use the same playlist_dir. Topics whose file or rows are missing are left out.
+    Playlist files missing on disk are written from the source's entries, existing ones are left as they are.
+    """
+    topic_files = []
+    playlist_paths = set()
+    for topic_file in source.load_topic_list():
+        topic_name, structure = source.read_topic(topic_file)
+        if structure is None:
+            continue
+        target.write_topic(topic_name, structure)
+        topic_files.append(topic_file)
+        for value in iter_structure_values(structure):
+            if value:
+                playlist_paths.add(expand_playlist_path(value, source.playlist_dir))
+    target.save_topic_list(topic_files)
+
+    playlists = 0
+    for playlist_path in sorted(playlist_paths):
+        entries = source.read_playlist(playlist_path)
+        if entries is None:
+            continue
+        if not os.path.exists(playlist_path):
+            os.makedirs(os.path.dirname(playlist_path), exist_ok=True)
+            write_json_atomic(playlist_path, entries)
+        target.record_playlist(playlist_path, entries)
+        playlists += 1
+    return len(topic_files), playlists
+
+
+def import_json_catalog(directory, db_path, topics_list_path=None):
+    """Import topics_list.json, its topic files and their playlists from directory into a SQLite catalog."""
+    playlist_dir = os.path.join(directory, "playlists")
+    source = JsonTopicStorage(directory, playlist_dir, topics_list_path)
+    target = SqliteTopicStorage(db_path, playlist_dir)
+    try:
+        topics, playlists = copy_catalog(source, target)
+    finally:
+        target.close()
+    logging.info(f"Imported {topics} topics and {playlists} playlists from {directory} into {db_path}")
+    return topics, playlists
+
+
+def export_json_catalog(db_path, directory):
+    """Write a SQLite catalog back out as topics_list.json plus one JSON file per topic in directory."""
+    playlist_dir = os.path.join(directory, "playlists")
+    os.makedirs(directory, exist_ok=True)
+    source = SqliteTopicStorage(db_path, playlist_dir)
+    target = JsonTopicStorage(directory, playlist_dir)
+    try:
+        topics, playlists = copy_catalog(source, target)
+    finally:
+        source.close()
+    logging.info(f"Exported {topics} topics and {playlists} playlists from {db_path} to {directory}")
+    return topics, playlists
+
+
+def iter_structure_items(path, value):
+    """Yield (key path, value) for an entry and for everything nested below it."""
+    yield path, value
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from iter_structure_items(path + (key,), child)
+
+
+def find_title_directory(title, base_directory, cancel_event=None):
+    """Return the first directory below base_directory whose name matches the title, or None."""
+    for root, dirs, _ in os.walk(base_directory):
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        for dir_name in dirs:
+            if dir_name.strip() == title:
+                return os.path.join(root, dir_name)
+    return None
+
+
+def best_title_directories(title_path, candidates, base_directory):
+    """Return the candidate folders, in order, whose parent folders share the most names with the title's ancestors.
+
+    Titles of the same name in different subtopics, e.g. Mechanics > Intro and Optics > Intro, are told apart
+    by their folders' parents: Lectures/Mechanics/Intro for the first, Lectures/Optics/Intro for the second.
+    """
+    ancestors = {name.strip().casefold() for name in title_path[:-1]}
+    scores = []
+    for candidate in candidates:
+        parents = os.path.relpath(os.path.dirname(candidate), base_directory).split(os.sep)
+        scores.append(sum(1 for name in parents if name.strip().casefold() in ancestors))
+    best = max(scores, default=0)
+    return [candidate for candidate, score in zip(candidates, scores) if score == best]
+
+
+def index_directories(base_directory, cancel_event=None):
+    """Map every directory name below base_directory to its paths with a single os.scandir pass.
+
+    Paths are listed in the order os.walk would visit them, so the first path for a name is the match
+    find_title_directory would return. This is a generator for use with `yield from` inside a scan:
+    it yields progress messages and returns the index, or None if the scan was cancelled.
+    """
+    directory_index = {}
+    pending = [base_directory]
+    visited = 0
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                subdirs = [entry for entry in entries if entry.is_dir()]
+        except OSError as e:
+            logging.warning(f"Skipping unreadable directory {directory}: {e}")
+            continue
+
+        for entry in subdirs:
+            directory_index.setdefault(entry.name.strip(), []).append(entry.path)
+        # Push in reverse so subdirectories are visited in listing order; like os.walk, don't follow symlinks
+        pending.extend(entry.path for entry in reversed(subdirs) if not entry.is_symlink())
+
+        visited += 1
+        if visited % DIRECTORY_INDEX_PROGRESS_STEP == 0:
+            yield "message", f"Indexed {visited} folders under {base_directory}..."
+
+    logging.debug(f"Indexed {visited} folders under {base_directory}")
+    return directory_index
+
+
+class PlaylistBuilder:
+    """Creates and refreshes the playlist files of titles, with the settings of one scan.
+
+    build() and refresh() are scan generators: they yield ("message", text) for progress,
+    ("results", [(title path, playlist path), ...]) for created playlists and
+    ("refreshed", [(title path, stored playlist path), ...]) for playlists that changed in place.
+    The app runs them on its scan thread; scripts can simply iterate over them.
+    """
+
+    def __init__(self, playlist_dir, workers=DEFAULT_PLAYLIST_WORKERS, order=DEFAULT_PLAYLIST_ORDER,
+                 media_types=DEFAULT_MEDIA_TYPES, probe_cache=None):
+        self.playlist_dir = playlist_dir
+        self.workers = workers
+        self.order = order
+        self.media_types = media_types
+        self.probe_cache = probe_cache
+
+    def create(self, folder, title_path, cancel_event=None):
+        # Save the playlist under playlist_dir, named after the title
+        playlist_path = playlist_file_path(self.playlist_dir, title_path)
+        if create_playlist_file(folder, playlist_path, cancel_event, self.order, self.media_types, self.probe_cache):
+            return playlist_path
+        return None
+
+    def build(self, title_paths, base_directory, cancel_event=None):
+        """Scan for and create the playlists of the given titles."""
+        cancel_event = cancel_event or threading.Event()
+
+        # A single title can stop at the first match, while several titles share one pass over the base directory
+        directory_index = None
+        if len(title_paths) > 1:
+            yield "message", f"Indexing folders under {base_directory}..."
+            directory_index = yield from index_directories(base_directory, cancel_event)
+            if directory_index is None:
+                return
+
+        jobs = []
+        total = len(title_paths)
+        title_counts = {}
+        for path in title_paths:
+            title_counts[path[-1].strip()] = title_counts.get(path[-1].strip(), 0) + 1
+        for count, path in enumerate(title_paths, 1):
+            if cancel_event.is_set():
+                return
+
+            title = path[-1].strip()
+            if directory_index is None:
+                # Search for a matching directory in the base directory and its subdirectories
+                yield "message", f"[{count}/{total}] Searching for '{title}'..."
+                title_directory = find_title_directory(title, base_directory, cancel_event)
+            else:
+                matches = best_title_directories(path, directory_index.get(title, []), base_directory)
+                if len(matches) > 1 and title_counts[title] > 1:
+                    # Several titles of this name and nothing to tell their folders apart; don't guess
+                    yield "message", (f"Skipping '{' > '.join(path)}': {len(matches)} folders named '{title}' "
+                                      f"match it equally well.")
+                    continue
+                title_directory = matches[0] if matches else None
+
+            if title_directory is None:
+                if not cancel_event.is_set():
+                    yield "message", f"No matching directory found for '{title}'."
+                continue
+            jobs.append((path, title_directory))
+
+        yield from generate_playlists(jobs, self.playlist_dir, self.workers, cancel_event, self.order,
+                                      self.media_types, self.probe_cache)
+
+    def refresh(self, playlists, cancel_event=None, folder=None):
+        """Refresh each (title path, stored playlist path) in turn."""
+        refreshed = []
+        for path, stored_path in playlists:
+            playlist_path = expand_playlist_path(stored_path, self.playlist_dir)
+            if folder is None and not os.path.exists(playlist_source_path(playlist_path)):
+                yield "message", f"Skipping '{path[-1]}': its source folder is not recorded."
+                continue
+            try:
+                counts = refresh_playlist_file(playlist_path, cancel_event, folder, self.media_types, self.probe_cache)
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Failed to refresh playlist for '{path[-1]}': {e}")
+                yield "message", f"Error: Could not refresh playlist for '{path[-1]}': {e}"
+                continue
+            if counts is None:
+                break
+            added, removed = counts
+            yield "message", f"Refreshed '{path[-1]}': {added} added, {removed} removed"
+            if added or removed:
+                refreshed.append((path, stored_path))
+
+        if refreshed:
+            yield "refreshed", refreshed
+
+
+def build_search_index(nodes, storage):
+    """Build a SearchIndex over [(key path, stored playlist path or None)], reading playlists from storage."""
+    index = SearchIndex()
+    for path, playlist_path in nodes:
+        index.add(("name", path), path[-1])
+        if playlist_path:
+            index.add(("playlist", path), storage.read_playlist_text(expand_playlist_path(playlist_path,
+                                                                                         storage.playlist_dir)))
+    # Sort the token list and the key paths once, up front
+    index.expand("")
+    index.ordered_paths()
+    return index
+
+
+def open_storage(directory, catalog_path=None, use_topic_cache=True):
+    """Return the topic storage of a Video Navigator directory: the SQLite catalog at catalog_path if given,
+    else topics_list.json and the topic files in directory. Playlists live in directory/playlists either way.
+    """
+    playlist_dir = os.path.join(directory, "playlists")
+    if catalog_path:
+        return SqliteTopicStorage(catalog_path, playlist_dir)
+    topic_cache_dir = os.path.join(directory, ".topic_cache") if use_topic_cache else None
+    return JsonTopicStorage(directory, playlist_dir, topic_cache_dir=topic_cache_dir)
+
+
+class Catalog:
+    """The topic tree without any UI: topics read from a storage, edited in memory and written back.
+
+    Each topic is a dict of subtopics (nested dicts) and titles, which map to their playlist path relative
+    to the storage's playlist_dir ("" while they have none). Items are addressed by key paths
+    (topic, subtopic..., title). Edits mark their topic modified, and save() writes the modified topics.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.playlist_dir = storage.playlist_dir
+        os.makedirs(self.playlist_dir, exist_ok=True)
+        self.topic_files = storage.load_topic_list()
+        self.topics = {}
+        # Topics edited since they were last written
+        self.modified_topics = set()
+
+    def read_topic_files(self, topic_files, storage=None):
+        # Parse the files concurrently; map() hands the results back in topic_files order
+        storage = storage or self.storage
+        with ThreadPoolExecutor(max_workers=TOPIC_LOAD_WORKERS) as executor:
+            return list(executor.map(storage.read_topic, topic_files))
+
+    def load(self):
+        """Read every topic in topic_files, replacing the topics in memory."""
+        self.topics.clear()
+        for topic_name, structure in self.read_topic_files(self.topic_files):
+            if structure is not None:
+                self.topics[topic_name] = structure
+        return self
+
+    def save(self):
+        """Write every modified topic back to the storage."""
+        for topic_name in self.modified_topics:
+            if topic_name in self.topics:
+                self.storage.write_topic(topic_name, self.topics[topic_name])
+        self.modified_topics.clear()
+
+    def save_topic_list(self):
+        self.storage.save_topic_list(self.topic_files)
+
+    def close(self):
+        self.storage.close()
+
+    def get_structure(self, path):
+        """Return the value stored at a key path: a topic/subtopic dict or a title's playlist path."""
+        structure = self.topics
+        for key in path:
+            structure = structure[key]
+        return structure
+
+    def iter_items(self, path=()):
+        """Yield (key path, value) for the item at path and everything below it; all topics for the empty path."""
+        if path:
+            yield from iter_structure_items(path, self.get_structure(path))
+            return
+        for topic_name, structure in self.topics.items():
+            yield from iter_structure_items((topic_name,), structure)
+
+    def titles(self, path=()):
+        """Yield (key path, stored playlist path) for every title at or below path."""
+        for item_path, value in self.iter_items(path):
+            if isinstance(value, str):
+                yield item_path, value
+
+    def playlist_path(self, stored_path):
+        """Return the absolute path of a title's stored playlist path ("" stays "")."""
+        return expand_playlist_path(stored_path, self.playlist_dir)
+
+    def add_item(self, parent_path, name, item_type, index=None):
+        """Add a subtopic ({}) or title ("") under parent_path at index (default last); returns its value."""
+        value = {} if item_type == "subtopic" else ""
+        structure = self.get_structure(parent_path)
+        if index is None:
+            structure[name] = value
+        else:
+            # Rebuild the dict so the order matches the tree view
+            items = list(structure.items())
+            items.insert(index, (name, value))
+            structure.clear()
+            structure.update(items)
+        self.modified_topics.add(parent_path[0])
+        logging.debug(f"Added '{name}' as '{item_type}' under '{parent_path[-1]}' in topic '{parent_path[0]}'")
+        return value
+
+    def rename_item(self, path, new_name):
+        """Rename the item at path in place, keeping its position; returns its value."""
+        structure = self.get_structure(path[:-1])
+        old_name = path[-1]
+        value = structure[old_name]
+
+        # Preserve the order by re-inserting the renamed item in the same position
+        items = [(new_name if key == old_name else key, item) for key, item in structure.items()]
+        structure.clear()
+        structure.update(items)
+        self.modified_topics.add(path[0])
+        logging.debug(f"Renamed '{old_name}' to '{new_name}' in structure")
+        return value
+
+    def delete_item(self, path):
+        """Remove the item at path (not a whole topic) and return its value."""
+        value = self.get_structure(path[:-1]).pop(path[-1])
+        self.modified_topics.add(path[0])
+        logging.debug(f"Deleted '{path[-1]}' from structure")
+        return value
+
+    def swap_items(self, parent_path, item1, item2):
+        """Swap two items under parent_path, or two topics when parent_path is empty."""
+        if not parent_path:
+            index1 = self.topic_files.index(f"{item1}.json")
+            index2 = self.topic_files.index(f"{item2}.json")
+            self.topic_files[index1], self.topic_files[index2] = self.topic_files[index2], self.topic_files[index1]
+            if item1 in self.topics and item2 in self.topics:
+                # Export and the tree's reattach order follow the topics dict, so swap them there as well
+                topics = list(self.topics.items())
+                keys = list(self.topics)
+                index1, index2 = keys.index(item1), keys.index(item2)
+                topics[index1], topics[index2] = topics[index2], topics[index1]
+                self.topics.clear()
+                self.topics.update(topics)
+            self.save_topic_list()
+            logging.debug(f"Swapped root topics '{item1}' and '{item2}' in topic_files list")
+            return
+
+        structure = self.get_structure(parent_path)
+        items = list(structure.items())
+        keys = list(structure)
+        index1, index2 = keys.index(item1), keys.index(item2)
+        items[index1], items[index2] = items[index2], items[index1]
+        structure.clear()
+        structure.update(items)
+        self.modified_topics.add(parent_path[0])
+        logging.debug(f"Swapped items '{item1}' and '{item2}' in structure")
+
+    def set_playlist(self, path, playlist_path):
+        """Store a title's playlist path; returns the path as stored, or None if path is not a title (any more)."""
+        if not path or len(path) < 2:
+            return None
+        try:
+            parent_structure = self.get_structure(path[:-1])
+        except (KeyError, TypeError):
+            # The title was renamed or deleted while a scan was running
+            return None
+        if not isinstance(parent_structure.get(path[-1]), str):
+            return None
+
+        # Assign the playlist path directly through the title's parent dict
+        stored_path = compact_playlist_path(playlist_path, self.playlist_dir)
+        parent_structure[path[-1]] = stored_path
+        self.modified_topics.add(path[0])
+        return stored_path
+
+    def has_topic(self, topic_name):
+        """Return whether a topic of this name is loaded or listed in the topics list."""
+        return topic_name in self.topics or any(os.path.splitext(os.path.basename(topic_file))[0] == topic_name
+                                                for topic_file in self.topic_files)
+
+    def add_topic(self, topic_name):
+        """Add an empty topic at the end of the topics list and create it in the storage."""
+        self.topics[topic_name] = {}
+        self.topic_files.append(f"{topic_name}.json")
+        self.save_topic_list()
+        logging.debug(f"Updated topic_files list with new topic: {topic_name}.json")
+        self.storage.create_topic(topic_name)
+
+    def delete_topic(self, topic_name):
+        """Remove a topic from memory, the topics list and the storage; returns its structure."""
+        structure = self.topics.pop(topic_name)
+        self.topic_files = [f for f in self.topic_files
+                            if os.path.splitext(os.path.basename(f))[0] != topic_name]
+        self.modified_topics.discard(topic_name)
+        self.storage.delete_topic(topic_name)
+        self.save_topic_list()
+        logging.debug(f"Deleted topic '{topic_name}'")
+        return structure
+
+    def search_nodes(self):
+        """Return [(key path, stored playlist path or None)] for every item, as taken by build_search_index."""
+        return [(path, value if isinstance(value, str) else None) for path, value in self.iter_items()]
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Return the ranked [(key path, score)] hits for query over names and playlist entries."""
+        return build_search_index(self.search_nodes(), self.storage).search(query, limit)
+
+    def assign_playlists(self, results):
+        """Store scan results [(title path, playlist path)]; returns the titles that were gone."""
+        missing = []
+        for path, playlist_path in results:
+            if self.set_playlist(path, playlist_path) is None:
+                missing.append(path)
+            else:
+                self.storage.record_playlist(playlist_path)
+        return missing
+
+    def run_scan(self, scan, on_message=None):
+        """Run a PlaylistBuilder scan to completion on this thread, storing what it creates.
+
+        Progress messages go to on_message; returns (playlists created, playlists refreshed).
+        """
+        created = refreshed = 0
+        for kind, payload in scan:
+            if kind == "message":
+                if on_message:
+                    on_message(payload)
+            elif kind == "results":
+                for path in self.assign_playlists(payload):
+                    if on_message:
+                        on_message(f"Error: Could not update playlist for '{path[-1]}'.")
+                created += len(payload)
+            elif kind == "refreshed":
+                for _, stored_path in payload:
+                    self.storage.record_playlist(self.playlist_path(stored_path))
+                refreshed += len(payload)
+        return created, refreshed
+
+    def export(self, directory):
+        """Write the catalog as topics_list.json plus one JSON file per topic in directory.
+
+        Playlist paths are written as absolute paths into this catalog's playlist_dir; returns the number of topics.
+        """
+        self.save()
+        os.makedirs(directory, exist_ok=True)
+        target = JsonTopicStorage(directory, self.playlist_dir)
+        # In topics list order, which is the order the topics are shown in
+        topic_names = [os.path.splitext(os.path.basename(topic_file))[0] for topic_file in self.topic_files]
+        topic_names = [topic_name for topic_name in topic_names if topic_name in self.topics]
+        topic_names += [topic_name for topic_name in self.topics if topic_name not in topic_names]
+        for topic_name in topic_names:
+            target.write_topic(topic_name, self.topics[topic_name])
+        target.save_topic_list([f"{topic_name}.json" for topic_name in topic_names])
+        return len(topic_names)
@@ -1,29 +1,435 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog, Toplevel, Label, Entry, Radiobutton, StringVar, Button
+import tkinter.font as tkfont
 import os
 import json
-import sys
 import logging
-
-# Logging configuration
-log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "video_navigator.log")
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(log_file_path, mode='w')
-        # logging.StreamHandler()  # Optional: to keep logging in the console as well
-    ]
+import queue
+import time
+import bisect
+from collections import OrderedDict
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from video_catalog import (
+    DEFAULT_PLAYLIST_ORDER, DEFAULT_PLAYLIST_WORKERS, HEALTH_CHECK_TTL_SECONDS, PLAYLIST_ORDERS,
+    THUMBNAIL_SIZE, TOPIC_LOAD_WORKERS, Catalog, JsonTopicStorage, PlaylistBuilder, PlaylistWatcher,
+    ProbeCache, SearchIndex, build_search_index, check_playlists, compact_playlist_path, expand_playlist_path,
+    format_duration, generate_thumbnail, iter_structure_items, load_media_types, move_block, natural_sort_key,
+    playlist_file_path, playlist_lock, playlist_source_path, write_json_atomic,
 )
 
+# How often the Tk thread checks for messages from a running directory scan
+SCAN_POLL_INTERVAL_MS = 100
+
+# Topic files are written this long after the last edit, so bursts of edits coalesce into one write
+SAVE_DEBOUNCE_MS = 1000
+
+# Delay after the last keystroke before the search box runs its query
+SEARCH_DEBOUNCE_MS = 150
+
+# Tree filter: the ancestors of matches are opened automatically only up to this many matches
+FILTER_EXPAND_LIMIT = 200
+
+# Thumbnails in the playlist editor: PNGs decoded into PhotoImages kept in memory, ffmpeg threads, and how
+# often the Tk thread collects finished thumbnails
+THUMBNAIL_LRU_SIZE = 200
+THUMBNAIL_WORKERS = 2
+THUMBNAIL_POLL_MS = 100
+
+# How often the Tk thread picks up playlists refreshed by the watcher
+WATCH_QUEUE_POLL_MS = 500
+
+
+class ThumbnailCache:
+    """Video thumbnails for the playlist editor.
+
+    PNGs are generated with ffmpeg on a small thread pool into a content-addressed directory, and only
+    the rows asked for (those in view) are decoded into PhotoImages, kept in an LRU of THUMBNAIL_LRU_SIZE
+    so memory stays flat however far a playlist is scrolled. get() is called on the Tk thread.
+    """
+
+    def __init__(self, root, cache_dir):
+        self.root = root
+        self.cache_dir = cache_dir
+        self.ffmpeg = shutil.which("ffmpeg")
+        self.executor = None
+        self.images = OrderedDict()  # Video path -> PhotoImage, least recently shown first
+        self.files = {}  # Video path -> thumbnail PNG path, or None if none could be made
+        self.pending = {}  # Video path -> callbacks waiting for its thumbnail
+        self.requests = 0
+        self.results = queue.Queue()
+
+    @property
+    def available(self):
+        return self.ffmpeg is not None
+
+    def get(self, video_path, on_ready):
+        """Return the PhotoImage for a video, or None and call on_ready() once it has been generated."""
+        image = self.images.get(video_path)
+        if image is not None:
+            self.images.move_to_end(video_path)
+            return image
+
+        thumbnail_path = self.files.get(video_path, "")
+        if thumbnail_path:
+            try:
+                image = tk.PhotoImage(file=thumbnail_path)
+            except tk.TclError as e:
+                logging.debug(f"Could not load thumbnail {thumbnail_path}: {e}")
+                self.files[video_path] = None
+                return None
+            self.images[video_path] = image
+            if len(self.images) > THUMBNAIL_LRU_SIZE:
+                self.images.popitem(last=False)
+            return image
+        if thumbnail_path is None or not self.available:
+            return None
+
+        if video_path in self.pending:
+            self.pending[video_path].append(on_ready)
+            return None
+        if self.executor is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+        if not self.pending:
+            self.root.after(THUMBNAIL_POLL_MS, self.poll)
+        self.pending[video_path] = [on_ready]
+        self.requests += 1
+        self.executor.submit(self.generate, video_path, self.requests)
+        return None
+
+    def generate(self, video_path, request):
+        # Rows scrolled past long ago would be evicted from the LRU anyway; leave them for when they return
+        if self.requests - request > THUMBNAIL_LRU_SIZE:
+            self.results.put((video_path, ""))
+            return
+        try:
+            thumbnail_path = generate_thumbnail(self.ffmpeg, video_path, self.cache_dir)
+        except OSError as e:
+            logging.debug(f"No thumbnail for {video_path}: {e}")
+            thumbnail_path = None
+        self.results.put((video_path, thumbnail_path))
+
+    def close(self):
+        """Cancel queued thumbnails and let the pool's threads exit; a later get() starts a new pool."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        # Cancelled jobs never report back, so forget them and let their rows ask again
+        self.pending.clear()
+
+    def poll(self):
+        callbacks = []
+        while True:
+            try:
+                video_path, thumbnail_path = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if thumbnail_path != "":
+                self.files[video_path] = thumbnail_path
+                callbacks.extend(self.pending.pop(video_path, ()))
+            else:
+                self.pending.pop(video_path, None)
+
+        # Each editor redraws its rows in view once per batch
+        for on_ready in set(callbacks):
+            on_ready()
+        if self.pending:
+            self.root.after(THUMBNAIL_POLL_MS, self.poll)
+
+
+class VirtualListbox(tk.Frame):
+    """A list view over a Python list that draws only the rows currently in view.
+
+    Rows are drawn on a canvas from a pool of items sized to the window, so scrolling and redraws cost
+    O(visible rows) whatever the length of the list. The owner edits the list in place and then calls
+    refresh_rows() for changed rows or refresh() when rows were added or removed. Selection follows
+    tk.Listbox: curselection(), selection_set(), selection_clear(), see() and <<ListboxSelect>>.
+    Dragging the selection calls on_drop(selected indices, insertion index) when the button is released.
+    With row_image, each row in view also shows the image it returns (or nothing for None), image_size wide.
+    row_color can return a text color for a row, or None for the default.
+    """
+
+    def __init__(self, master, items, row_text, width=50, height=20, on_drop=None, row_image=None,
+                 image_size=(0, 0), row_color=None):
+        super().__init__(master)
+        self.items = items
+        self.row_text = row_text
+        self.row_color = row_color
+        self.on_drop = on_drop
+        self.row_image = row_image
+        self.image_width = image_size[0] + 6 if row_image else 0
+        self.drag_start = None  # Row pressed on, while the button is held
+        self.drag_target = None  # Insertion index under the pointer once a drag has started
+        font = tkfont.nametofont("TkDefaultFont")
+        self.row_height = max(font.metrics("linespace"), image_size[1] if row_image else 0) + 4
+        self.top = 0  # Index of the first row in view
+        self.visible_rows = height
+        self.selected = set()
+        self.anchor = None
+        self.row_items = []  # (rectangle, image or None, text) canvas items for each row slot in view
+        self.text_width = 0
+
+        self.canvas = tk.Canvas(self, width=width * font.measure("0"), height=height * self.row_height,
+                                background="white", highlightthickness=0, takefocus=1)
+        self.scrollbar_y = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        scrollbar_x = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.config(xscrollcommand=scrollbar_x.set)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        self.drop_marker = self.canvas.create_line(0, 0, 10000, 0, width=2, fill="black", state="hidden")
+
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.canvas.bind("<Button-1>", lambda event: self.on_click(event))
+        self.canvas.bind("<Shift-Button-1>", lambda event: self.on_click(event, extend=True))
+        self.canvas.bind("<Control-Button-1>", lambda event: self.on_click(event, toggle=True))
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+        self.canvas.bind("<MouseWheel>", lambda event: self.yview("scroll", -3 if event.delta > 0 else 3, "units"))
+        self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+        self.canvas.bind("<Up>", lambda event: self.move_selection(-1))
+        self.canvas.bind("<Down>", lambda event: self.move_selection(1))
+        self.canvas.bind("<Prior>", lambda event: self.yview("scroll", -1, "pages"))
+        self.canvas.bind("<Next>", lambda event: self.yview("scroll", 1, "pages"))
+        self.resize_pool()
+        self.refresh()
+
+    def size(self):
+        return len(self.items)
+
+    def index_at(self, y):
+        """Return the list index of the row at canvas height y, or None below the last row."""
+        index = self.top + max(0, int(y)) // self.row_height
+        return index if index < len(self.items) else None
+
+    def on_configure(self, event):
+        self.visible_rows = max(1, event.height // self.row_height)
+        self.resize_pool()
+        self.refresh()
+
+    def resize_pool(self):
+        # One spare slot covers the partly visible row at the bottom edge
+        while len(self.row_items) < self.visible_rows + 1:
+            y = len(self.row_items) * self.row_height
+            rectangle = self.canvas.create_rectangle(0, y, 10000, y + self.row_height, width=0, fill="")
+            image = None
+            if self.row_image:
+                image = self.canvas.create_image(4, y + self.row_height // 2, anchor=tk.W)
+            text = self.canvas.create_text(4 + self.image_width, y + self.row_height // 2, anchor=tk.W, text="")
+            self.row_items.append((rectangle, image, text))
+
+    def draw_row(self, slot):
+        rectangle, image, text = self.row_items[slot]
+        index = self.top + slot
+        if index >= len(self.items):
+            self.canvas.itemconfigure(rectangle, fill="")
+            self.canvas.itemconfigure(text, text="")
+            if image:
+                self.canvas.itemconfigure(image, image="")
+            return
+
+        selected = index in self.selected
+        self.canvas.itemconfigure(rectangle, fill="#3399ff" if selected else "")
+        color = "white" if selected else (self.row_color and self.row_color(self.items[index])) or "black"
+        self.canvas.itemconfigure(text, text=self.row_text(self.items[index]), fill=color)
+        if image:
+            self.canvas.itemconfigure(image, image=self.row_image(self.items[index]) or "")
+
+    def refresh(self):
+        """Redraw every row in view and update the scrollbars after rows were added or removed."""
+        self.top = max(0, min(self.top, len(self.items) - self.visible_rows))
+        for slot in range(len(self.row_items)):
+            self.draw_row(slot)
+
+        count = len(self.items)
+        if count:
+            self.scrollbar_y.set(self.top / count, min(1.0, (self.top + self.visible_rows) / count))
+        else:
+            self.scrollbar_y.set(0.0, 1.0)
+
+        # Rows are laid out horizontally by the canvas itself; widen the scroll region to the widest row seen
+        bbox = self.canvas.bbox(*(text for _, _, text in self.row_items))
+        if bbox:
+            self.text_width = max(self.text_width, bbox[2] + 4)
+            self.canvas.config(scrollregion=(0, 0, self.text_width, self.visible_rows * self.row_height))
+
+    def refresh_rows(self, indices):
+        """Redraw the given rows if they are in view."""
+        for index in indices:
+            slot = index - self.top
+            if 0 <= slot < len(self.row_items):
+                self.draw_row(slot)
+
+    def yview(self, *args):
+        if args and args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items))
+        elif args and args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.refresh()
+
+    def see(self, index):
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible_rows:
+            self.top = index - self.visible_rows + 1
+        else:
+            return
+        self.refresh()
+
+    def curselection(self):
+        return tuple(sorted(self.selected))
+
+    def selection_set(self, first, last=None):
+        rows = range(first, (first if last is None else last) + 1)
+        self.selected.update(rows)
+        self.refresh_rows(rows)
+
+    def selection_clear(self):
+        previous = self.selected
+        self.selected = set()
+        self.refresh_rows(previous)
+
+    def select_rows(self, indices):
+        """Replace the selection, redrawing only the rows whose state changed."""
+        previous = self.selected
+        self.selected = set(indices)
+        self.refresh_rows(previous ^ self.selected)
+        self.anchor = min(self.selected) if self.selected else None
+
+    def on_click(self, event, extend=False, toggle=False):
+        self.canvas.focus_set()
+        index = self.index_at(event.y)
+        if index is None:
+            return
+
+        if not (extend or toggle) and index in self.selected and self.on_drop:
+            # Pressing on the selection may start a drag; a plain click is resolved on release
+            self.drag_start = index
+            return
+
+        if extend and self.anchor is not None:
+            anchor = self.anchor
+            self.select_rows(range(min(anchor, index), max(anchor, index) + 1))
+            self.anchor = anchor
+        elif toggle:
+            self.select_rows(self.selected ^ {index})
+            self.anchor = index
+        else:
+            self.select_rows([index])
+            self.anchor = index
+            self.drag_start = index if self.on_drop else None
+        self.event_generate("<<ListboxSelect>>")
+
+    def on_drag(self, event):
+        if self.drag_start is None:
+            return
+        # Scroll when the pointer leaves the top or bottom edge
+        if event.y < 0:
+            self.yview("scroll", -1, "units")
+        elif event.y > self.visible_rows * self.row_height:
+            self.yview("scroll", 1, "units")
+
+        # Drop before the row under the upper half of the pointer's row, after it for the lower half
+        y = min(max(0, event.y), self.visible_rows * self.row_height)
+        target = min(self.top + (y + self.row_height // 2) // self.row_height, len(self.items))
+        if self.drag_target is None and target in (self.drag_start, self.drag_start + 1):
+            return
+        self.drag_target = target
+        marker_y = (target - self.top) * self.row_height
+        self.canvas.coords(self.drop_marker, 0, marker_y, 10000, marker_y)
+        self.canvas.itemconfigure(self.drop_marker, state="normal")
+
+    def on_release(self, event):
+        start, target = self.drag_start, self.drag_target
+        self.drag_start = self.drag_target = None
+        self.canvas.itemconfigure(self.drop_marker, state="hidden")
+        if start is None:
+            return
+        if target is None:
+            # No drag happened: a plain click on the selection selects just that row
+            if self.selected != {start}:
+                self.select_rows([start])
+                self.anchor = start
+                self.event_generate("<<ListboxSelect>>")
+            return
+        self.on_drop(self.curselection(), target)
+
+    def move_selection(self, step):
+        if not self.items:
+            return
+        index = self.anchor + step if self.anchor is not None else 0
+        index = max(0, min(index, len(self.items) - 1))
+        self.select_rows([index])
+        self.see(index)
+        self.event_generate("<<ListboxSelect>>")
+
+
 class VideoNavigatorApp:
-    def __init__(self, root, load_playlist_callback=None, topics_list_path=None):
+    def __init__(self, root, load_playlist_callback=None, topics_list_path=None, lazy_tree=True,
+                 playlist_workers=DEFAULT_PLAYLIST_WORKERS, load_in_background=True,
+                 use_topic_cache=True, playlist_order=DEFAULT_PLAYLIST_ORDER, watch_playlists=False,
+                 media_types=None, probe_media=False, show_thumbnails=False, storage=None):
         self.root = root
         self.load_playlist_callback = load_playlist_callback
         self.root.title("Video Navigator")
-        self.topics = {}
-        self.modified_topics = set()
-        self.tree_state = {}
+        # Writes of the catalog's modified topics are debounced through save_after_id
+        self.save_after_id = None
+        self.tree_state = set()
+
+        # Index between Treeview item IDs and their key paths (topic, subtopic..., title) in self.catalog.topics
+        self.node_paths = {}
+        self.path_nodes = {}
+
+        # Node type ("topic", "subtopic" or "title") recorded once per Treeview item when it is inserted
+        self.node_types = {}
+
+        # Materialized title nodes by their absolute playlist path, so health results re-tag only their titles
+        self.playlist_nodes = {}
+
+        # In lazy mode only the root topics are inserted up front; the children of a topic or subtopic
+        # are materialized the first time it is opened. lazy_nodes maps each unexpanded node to its structure.
+        self.lazy_tree = lazy_tree
+        self.lazy_nodes = {}
+
+        # Directory scans run on a worker thread and report back through scan_queue
+        self.scan_queue = queue.Queue()
+        self.scan_thread = None
+        self.scan_cancel = threading.Event()
+        self.playlist_workers = playlist_workers
+        self.playlist_order = playlist_order
+
+        # Optional watcher refreshing generated playlists when their source folders change; it reports
+        # back through watch_queue, polled while the watcher runs
+        self.playlist_watcher = None
+        self.watch_queue = queue.Queue()
+        self.watch_poll_id = None
+        # Stored playlist path -> key paths of the titles using it, so watcher events find their titles
+        # without walking the catalog; None until first needed and after the topics are reloaded
+        self.playlist_titles = None
+
+        # Topic files loaded in the background arrive through topic_load_queue; topic_load_order keeps
+        # each topic's position in topic_files so the tree stays in topics_list order
+        self.topic_load_queue = None
+        self.topic_load_order = {}
+
+        # Search index over every node name and playlist entry; rebuilt in the background after loading and
+        # patched on edits. search_edits counts edits so a rebuild that raced with an edit is redone.
+        self.search_index = SearchIndex()
+        self.search_edits = 0
+        self.search_hits = []
+        self.search_after_id = None
+
+        # Tree filter: filter_matches holds the key paths matching the filter (None when the filter is off),
+        # filter_visible those paths plus their ancestors, and detached_nodes the hidden nodes whose
+        # parent is shown. Hidden nodes are detached rather than deleted, so clearing the filter reattaches them.
+        self.filter_matches = None
+        self.filter_visible = set()
+        self.detached_nodes = set()
 
         # Get the directory where the script is located
         try:
@@ -35,21 +441,60 @@ class VideoNavigatorApp:
 
         logging.debug(f"Script directory set to: {self.script_dir}")
 
-        # Load topic files from topics_list_path using topics_list.json in the script directory as default
-        if topics_list_path:
-            self.topic_files = self.load_topic_files(topics_list_path)
-        else:
-            self.topic_files = self.load_topic_files()
+        # Topics are persisted through a storage backend: as given (e.g. a SqliteTopicStorage catalog), else
+        # topics_list.json and one JSON file per topic in the script directory. Parsed topic files are pickled
+        # in .topic_cache, keyed by each file's path, size and mtime, so warm starts skip JSON parsing.
+        if storage is None:
+            topic_cache_dir = os.path.join(self.script_dir, ".topic_cache") if use_topic_cache else None
+            storage = JsonTopicStorage(self.script_dir, os.path.join(self.script_dir, "playlists"),
+                                       topics_list_path, topic_cache_dir)
+        self.storage = storage
 
-        self.topic_names = [os.path.splitext(os.path.basename(topic_file))[0] for topic_file in self.topic_files]
+        # The topics themselves, kept and edited by a Catalog; the tree view mirrors them
+        self.catalog = Catalog(self.storage)
 
-        # Directory where playlists will be stored (inside script directory)
-        self.playlist_dir = os.path.join(self.script_dir, "playlists")
-        os.makedirs(self.playlist_dir, exist_ok=True)
+        # Directory where playlists will be stored (inside script directory unless the storage says otherwise)
+        self.playlist_dir = self.catalog.playlist_dir
         logging.debug(f"Playlists directory: {self.playlist_dir}")
 
-        # Load all topics
-        self.load_all_topics()
+        # Media types recognised by folder scans: as given, else from media_types.json, else the defaults
+        self.media_types = media_types or load_media_types(self.script_dir)
+
+        # Optional probing of new playlist entries for size, duration and resolution, cached across runs
+        self.probe_cache = ProbeCache(os.path.join(self.script_dir, ".probe_cache.pickle"))
+        self.probe_media = probe_media
+
+        # Health check results by absolute playlist path: (monotonic time checked, playlist exists, missing videos),
+        # with exists None while a playlist's first check runs. Checks run in the background; selection and tree
+        # tags only ever read these cached results, and loading a playlist with none stats just its file.
+        self.playlist_health = {}
+
+        # Optional thumbnails in the playlist editor, generated with ffmpeg and shared by every editor window
+        self.thumbnails = ThumbnailCache(root, os.path.join(self.script_dir, ".thumbnail_cache"))
+        self.show_thumbnails = show_thumbnails
+        self.editor_windows = set()  # Open editors; the thumbnail pool is shut down when the last one closes
+
+        # Load all topics up front unless the window should appear first and fill in as the files load
+        if not load_in_background:
+            self.load_all_topics()
+
+        # Search box with a list of ranked hits; picking a hit reveals its node in the tree
+        search_frame = tk.Frame(root)
+        search_frame.pack(fill=tk.X)
+        search_bar = tk.Frame(search_frame)
+        search_bar.pack(fill=tk.X)
+        tk.Label(search_bar, text="Search:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_bar, textvariable=self.search_var)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.search_entry.bind("<KeyRelease>", self.on_search_key)
+        self.search_entry.bind("<Return>", lambda event: self.run_search())
+        self.search_entry.bind("<Escape>", lambda event: self.clear_search())
+        self.filter_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_bar, text="Filter tree", variable=self.filter_var,
+                       command=self.run_search).pack(side=tk.LEFT)
+        self.search_results = tk.Listbox(search_frame, height=6)
+        self.search_results.bind("<<ListboxSelect>>", self.on_search_result_select)
 
         # Create a Treeview widget with scrollbars
         tree_frame = tk.Frame(root)
@@ -75,6 +520,12 @@ class VideoNavigatorApp:
 
         # Bind the selection event
         self.tree.bind("<<TreeviewSelect>>", self.on_title_select)
+        # Titles whose playlist file is missing, or lists videos that are missing, as found by the health check
+        self.tree.tag_configure("broken", foreground="red")
+        self.tree.tag_configure("missing_videos", foreground="dark orange")
+
+        # Materialize the children of lazily built nodes when they are expanded
+        self.tree.bind("<<TreeviewOpen>>", self.on_tree_open)
 
         # Add right-click context menu
         self.tree.bind("<Button-3>", self.show_context_menu)
@@ -90,10 +541,29 @@ class VideoNavigatorApp:
         self.context_menu.add_command(label="Add YouTube Link", command=self.add_youtube_link)
         self.context_menu.add_command(label="Add Playlist", command=self.add_playlist)
         self.context_menu.add_command(label="Populate Playlist", command=self.populate_playlist)
+        self.context_menu.add_command(label="Refresh Playlist", command=self.refresh_playlist)
+        self.context_menu.add_command(label="Check Playlists", command=lambda: self.check_playlist_health(force=True))
+        self.context_menu.add_command(label="Cancel Scan", command=self.cancel_scan)
+        self.playlist_order_var = tk.StringVar(value=playlist_order)
+        order_menu = tk.Menu(self.context_menu, tearoff=0)
+        for order, label in zip(PLAYLIST_ORDERS, ("By Name", "By Path", "By Date Modified")):
+            order_menu.add_radiobutton(label=label, value=order, variable=self.playlist_order_var,
+                                       command=self.on_playlist_order_change)
+        self.context_menu.add_cascade(label="New Playlist Order", menu=order_menu)
+        self.probe_media_var = tk.BooleanVar(value=probe_media)
+        self.context_menu.add_checkbutton(label="Probe Video Metadata", variable=self.probe_media_var,
+                                          command=self.on_probe_media_change)
+        self.show_thumbnails_var = tk.BooleanVar(value=show_thumbnails)
+        self.context_menu.add_checkbutton(label="Show Thumbnails in Editor", variable=self.show_thumbnails_var,
+                                          command=self.on_show_thumbnails_change)
+        self.watch_playlists_var = tk.BooleanVar(value=watch_playlists)
+        self.context_menu.add_checkbutton(label="Watch Playlist Folders", variable=self.watch_playlists_var,
+                                          command=self.toggle_playlist_watcher)
         self.context_menu.add_command(label="Delete Playlist", command=self.delete_playlist)
         self.context_menu.add_command(label="Add New Topic", command=self.add_new_topic)
         self.context_menu.add_command(label="Delete Topic", command=self.delete_topic)
         self.context_menu.add_command(label="Load Topic File", command=self.load_new_topic_tree)
+        self.context_menu.add_command(label="Reload from Disk", command=self.reload_from_disk)
         if load_playlist_callback:
             self.context_menu.add_command(label="Load Playlist in Player", command=self.emit_playlist_to_player)
 
@@ -104,6 +574,14 @@ class VideoNavigatorApp:
         # Handle closing the app to save changes
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        if load_in_background:
+            self.start_loading_topics()
+        else:
+            self.rebuild_search_index()
+            self.check_playlist_health()
+        if watch_playlists:
+            self.toggle_playlist_watcher()
+
     def emit_playlist_to_player(self):
         selected_item = self.tree.selection()
         if not selected_item:
@@ -111,10 +589,15 @@ class VideoNavigatorApp:
             return
 
         selected_item = selected_item[0]
-        values = self.tree.item(selected_item, "values")
-        playlist_path = values[0] if values else None
+        playlist_path = self.get_playlist_path(selected_item)
 
-        if playlist_path and os.path.exists(playlist_path):
+        health = self.playlist_health.get(playlist_path) if playlist_path else None
+        if health is None or health[1] is None:
+            # Not checked yet, or the first check is still running; one stat rather than waiting for it
+            playable = bool(playlist_path) and os.path.exists(playlist_path)
+        else:
+            playable = health[1]
+        if playable:
             # Call the callback function to send the playlist path to the video player
             if self.load_playlist_callback:
                 logging.debug(f"Emitting playlist path to player: {playlist_path}")
@@ -124,11 +607,60 @@ class VideoNavigatorApp:
         else:
             messagebox.showwarning("No Playlist", "The selected title has no valid playlist.")
 
-    def get_playlist_path(self):
-        selected_item = self.tree.selection()
-        values = self.tree.item(selected_item, "values")
+    def check_playlist_health(self, playlist_paths=None, force=False):
+        """Check playlist files (all of them by default) and the videos they list in the background.
+
+        Results younger than HEALTH_CHECK_TTL_SECONDS are reused unless force is set; when the check
+        finishes, the affected titles are re-tagged and the selection's details are refreshed.
+        """
+        if playlist_paths is None:
+            playlist_paths = {self.catalog.playlist_path(value) for _, value in self.catalog.titles() if value}
+        now = time.monotonic()
+        stale = [playlist_path for playlist_path in set(playlist_paths)
+                 if force or now - self.playlist_health.get(playlist_path, (-HEALTH_CHECK_TTL_SECONDS,))[0]
+                 >= HEALTH_CHECK_TTL_SECONDS]
+        if not stale:
+            return
+
+        for playlist_path in stale:
+            # Mark as checked now so repeated selections don't queue the same check again; a playlist never
+            # checked before is recorded with existence None (unknown) until the result arrives
+            previous = self.playlist_health.get(playlist_path, (None, None, []))
+            self.playlist_health[playlist_path] = (now,) + previous[1:]
+
+        def install(results):
+            checked_at = time.monotonic()
+            for playlist_path, (exists, missing) in results.items():
+                self.playlist_health[playlist_path] = (checked_at, exists, missing)
+            self.apply_health_tags(results)
+            selection = self.tree.selection()
+            if selection and self.get_playlist_path(selection[0]) in results:
+                self.on_title_select(None)
+
+        self.run_in_background(lambda: check_playlists(stale), install)
+
+    def health_tags(self, playlist_path):
+        health = self.playlist_health.get(playlist_path)
+        if health is None:
+            return ()
+        if health[1] is False:
+            return ("broken",)
+        return ("missing_videos",) if health[2] else ()
+
+    def apply_health_tags(self, playlist_paths):
+        # Only materialized title nodes carry tags; lazily inserted ones get theirs in insert_tree_node
+        for playlist_path in playlist_paths:
+            for node in self.playlist_nodes.get(playlist_path, ()):
+                self.tree.item(node, tags=self.health_tags(playlist_path))
+
+    def get_playlist_path(self, item=None):
+        """Return the absolute playlist path of an item (the selection by default), or None."""
+        if item is None:
+            item = self.tree.selection()
+        values = self.tree.item(item, "values")
         if values:
-            return values[0]
+            # Playlists inside playlist_dir are kept relative to it in the tree and topic dicts
+            return expand_playlist_path(values[0], self.playlist_dir)
         return None
 
     def view_edit_playlist(self):
@@ -139,38 +671,64 @@ class VideoNavigatorApp:
 
         selected_item = selected_item[0]
         selected_title = self.tree.item(selected_item, "text")
-        values = self.tree.item(selected_item, "values")
+        playlist_path = self.get_playlist_path(selected_item)
 
-        if not values or not values[0]:
+        if not playlist_path:
             messagebox.showwarning("No Playlist", f"No playlist found for '{selected_title}'.")
             return
 
-        playlist_path = values[0]
         if not os.path.exists(playlist_path):
             messagebox.showwarning("Invalid Playlist", f"The playlist path for '{selected_title}' does not exist.")
             return
 
         with open(playlist_path, "r") as file:
-            self.playlist = json.load(file)
+            playlist = json.load(file)
+        # A refresh or the watcher may rewrite the file while it is being edited; save_changes checks this
+        opened_mtime = os.stat(playlist_path).st_mtime_ns
 
         edit_window = tk.Toplevel(self.root)
-        edit_window.title(f"Edit Playlist: {selected_title}")
-
-        edit_listbox = tk.Listbox(edit_window, width=50, height=20, selectmode=tk.EXTENDED)
+        self.editor_windows.add(edit_window)
+
+        def on_editor_destroy(event):
+            # <Destroy> is also delivered for each widget inside the window
+            if event.widget is edit_window:
+                self.editor_windows.discard(edit_window)
+                if not self.editor_windows:
+                    self.thumbnails.close()
+
+        edit_window.bind("<Destroy>", on_editor_destroy, add="+")
+        durations = [item["duration"] for item in playlist if "duration" in item]
+        if durations:
+            edit_window.title(f"Edit Playlist: {selected_title} "
+                              f"({len(playlist)} videos, {format_duration(sum(durations))})")
+        else:
+            edit_window.title(f"Edit Playlist: {selected_title}")
+
+        # Rows are drawn virtually and edits redraw only the rows they change, so large playlists stay responsive
+        def row_text(item):
+            return item["description"] if item["description"] else item["url"]
+
+        # Entries the last health check found missing are shown in red
+        health = self.playlist_health.get(playlist_path)
+        missing_videos = set(health[2]) if health else set()
+
+        def on_thumbnails_ready():
+            if edit_listbox.winfo_exists():
+                edit_listbox.refresh()
+
+        # Called only for rows in view, so only their thumbnails are generated and decoded
+        def row_image(item):
+            return self.thumbnails.get(item["url"], on_thumbnails_ready)
+
+        edit_listbox = VirtualListbox(edit_window, playlist, row_text,
+                                      on_drop=lambda selected, target: move_selection_to(
+                                          target - bisect.bisect_left(selected, target)),
+                                      row_image=row_image if self.show_thumbnails and self.thumbnails.available
+                                      else None,
+                                      image_size=THUMBNAIL_SIZE,
+                                      row_color=lambda item: "red" if item["url"] in missing_videos else None)
         edit_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
 
-        for item in self.playlist:
-            display_text = item["description"] if item["description"] else item["url"]
-            edit_listbox.insert(tk.END, display_text)
-
-        scrollbar_y = tk.Scrollbar(edit_window, orient=tk.VERTICAL, command=edit_listbox.yview)
-        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
-        edit_listbox.config(yscrollcommand=scrollbar_y.set)
-
-        scrollbar_x = tk.Scrollbar(edit_window, orient=tk.HORIZONTAL, command=edit_listbox.xview)
-        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
-        edit_listbox.config(xscrollcommand=scrollbar_x.set)
-
         controls_frame = tk.Frame(edit_window)
         controls_frame.pack(side=tk.RIGHT, fill=tk.Y)
 
@@ -180,52 +738,99 @@ class VideoNavigatorApp:
                 if selected[0] > 0:  # Ensure the first selected item is not at the top
                     for index in selected:
                         # Swap each selected item with the one above it
-                        self.playlist[index], self.playlist[index - 1] = self.playlist[index - 1], self.playlist[index]
-                    refresh_edit_listbox()
+                        playlist[index], playlist[index - 1] = playlist[index - 1], playlist[index]
+                    # Only the swapped rows change
+                    edit_listbox.refresh_rows({i - 1 for i in selected} | set(selected))
                     # Maintain selection after the move
                     new_selection = [i - 1 for i in selected]
-                    for i in new_selection:
-                        edit_listbox.selection_set(i)
-                        edit_listbox.see(i)  # Ensure each moved item is visible
+                    edit_listbox.select_rows(new_selection)
+                    edit_listbox.see(new_selection[0])  # Ensure the moved items are visible
 
         def move_down():
             selected = list(edit_listbox.curselection())
             if selected:
-                if selected[-1] < len(self.playlist) - 1:  # Ensure the last selected item is not at the bottom
+                if selected[-1] < len(playlist) - 1:  # Ensure the last selected item is not at the bottom
                     for index in reversed(selected):
                         # Swap each selected item with the one below it
-                        self.playlist[index], self.playlist[index + 1] = self.playlist[index + 1], self.playlist[index]
-                    refresh_edit_listbox()
+                        playlist[index], playlist[index + 1] = playlist[index + 1], playlist[index]
+                    edit_listbox.refresh_rows({i + 1 for i in selected} | set(selected))
                     # Maintain selection after the move
                     new_selection = [i + 1 for i in selected]
-                    for i in new_selection:
-                        edit_listbox.selection_set(i)
-                        edit_listbox.see(i)  # Ensure each moved item is visible
+                    edit_listbox.select_rows(new_selection)
+                    edit_listbox.see(new_selection[-1])  # Ensure the moved items are visible
+
+        def move_selection_to(position):
+            # One slice assignment and one redraw, however many rows are selected
+            selected = edit_listbox.curselection()
+            if selected:
+                moved = move_block(playlist, selected, position)
+                edit_listbox.refresh()
+                edit_listbox.select_rows(moved)
+                edit_listbox.see(moved[0])
+
+        def move_to_position():
+            selected = edit_listbox.curselection()
+            if selected:
+                position = simpledialog.askinteger("Move To", "Move the selected entries to position:",
+                                                   parent=edit_window, minvalue=1, maxvalue=len(playlist))
+                if position:
+                    move_selection_to(position - 1)
+
+        def sort_entries(key):
+            playlist.sort(key=key)
+            edit_listbox.selection_clear()
+            edit_listbox.refresh()
 
         def delete_item():
             selected = list(edit_listbox.curselection())
             if selected:
-                for index in reversed(selected):  # Reverse to avoid reindexing issues
-                    del self.playlist[index]
-                refresh_edit_listbox()
+                # Delete contiguous runs of the selection as slices, last run first to keep indices valid
+                runs = []
+                for index in selected:
+                    if runs and runs[-1][1] == index:
+                        runs[-1][1] = index + 1
+                    else:
+                        runs.append([index, index + 1])
+                for start, stop in reversed(runs):
+                    del playlist[start:stop]
+                edit_listbox.selection_clear()
+                edit_listbox.refresh()
 
         def update_description():
             selected = edit_listbox.curselection()
             if selected:
                 index = selected[0]
                 new_description = description_entry.get()
-                self.playlist[index]["description"] = new_description
-                refresh_edit_listbox()
-
-        def refresh_edit_listbox():
-            edit_listbox.delete(0, tk.END)
-            for item in self.playlist:
-                display_text = item["description"] if item["description"] else item["url"]
-                edit_listbox.insert(tk.END, display_text)
+                playlist[index]["description"] = new_description
+                edit_listbox.refresh_rows([index])
 
         def save_changes():
-            with open(playlist_path, "w") as file:
-                json.dump(self.playlist, file, indent=4)
+            # Don't wait on the Tk thread for a refresh that is probing this playlist
+            lock = playlist_lock(playlist_path)
+            if not lock.acquire(blocking=False):
+                messagebox.showwarning("Playlist Busy", "The playlist is being refreshed. Try saving again shortly.",
+                                       parent=edit_window)
+                return
+            try:
+                try:
+                    changed = os.stat(playlist_path).st_mtime_ns != opened_mtime
+                except OSError:
+                    changed = True
+                if not changed:
+                    write_json_atomic(playlist_path, playlist, backup=True)
+            finally:
+                lock.release()
+            if changed:
+                messagebox.showwarning("Playlist Changed",
+                                       "The playlist was changed on disk since it was opened, for example by a "
+                                       "refresh. Close the editor and open it again to edit the current playlist.",
+                                       parent=edit_window)
+                return
+            self.storage.record_playlist(playlist_path, playlist)
+            # The descriptions and entries changed; update the search entries and health of its titles
+            stored_path = compact_playlist_path(playlist_path, self.playlist_dir)
+            self.index_playlists([(path, stored_path) for path in self.playlist_title_paths(stored_path)])
+            self.check_playlist_health([playlist_path], force=True)
             edit_window.destroy()
 
         move_up_button = tk.Button(controls_frame, text="Move Up", command=move_up)
@@ -234,6 +839,29 @@ class VideoNavigatorApp:
         move_down_button = tk.Button(controls_frame, text="Move Down", command=move_down)
         move_down_button.pack(padx=5, pady=5)
 
+        move_top_button = tk.Button(controls_frame, text="Move to Top", command=lambda: move_selection_to(0))
+        move_top_button.pack(padx=5, pady=5)
+
+        move_bottom_button = tk.Button(controls_frame, text="Move to Bottom",
+                                       command=lambda: move_selection_to(len(playlist)))
+        move_bottom_button.pack(padx=5, pady=5)
+
+        move_to_button = tk.Button(controls_frame, text="Move To...", command=move_to_position)
+        move_to_button.pack(padx=5, pady=5)
+
+        sort_description_button = tk.Button(controls_frame, text="Sort by Description",
+                                            command=lambda: sort_entries(lambda item: row_text(item).casefold()))
+        sort_description_button.pack(padx=5, pady=5)
+
+        sort_filename_button = tk.Button(controls_frame, text="Sort by Filename",
+                                         command=lambda: sort_entries(
+                                             lambda item: os.path.basename(item["url"]).casefold()))
+        sort_filename_button.pack(padx=5, pady=5)
+
+        sort_natural_button = tk.Button(controls_frame, text="Sort by Number",
+                                        command=lambda: sort_entries(lambda item: natural_sort_key(row_text(item))))
+        sort_natural_button.pack(padx=5, pady=5)
+
         delete_button = tk.Button(controls_frame, text="Delete", command=delete_item)
         delete_button.pack(padx=5, pady=5)
 
@@ -249,76 +877,206 @@ class VideoNavigatorApp:
         save_button = tk.Button(controls_frame, text="Save and Close", command=save_changes)
         save_button.pack(padx=5, pady=5)
 
-    def load_topic_files(self, topics_list_path=None):
-        if topics_list_path is None:
-            topics_list_path = os.path.join(self.script_dir, "topics_list.json")
-        logging.debug(f"Loading topic files from: {topics_list_path}")
-        if os.path.exists(topics_list_path):
-            with open(topics_list_path, "r") as file:
-                return json.load(file)
-        logging.warning(f"topics_list.json not found in {self.script_dir}")
-        return []
+    def active_probe_cache(self):
+        return self.probe_cache if self.probe_media else None
+
+    def on_probe_media_change(self):
+        self.probe_media = self.probe_media_var.get()
+
+    def on_show_thumbnails_change(self):
+        self.show_thumbnails = self.show_thumbnails_var.get()
+        if self.show_thumbnails and not self.thumbnails.available:
+            self.message_area.insert(tk.END, "Thumbnails need ffmpeg, which was not found on the PATH.\n")
 
     def save_topic_files(self):
-        topics_list_path = os.path.join(self.script_dir, "topics_list.json")
-        logging.debug(f"Saving topic files to: {topics_list_path}")
-        with open(topics_list_path, "w") as file:
-            json.dump(self.topic_files, file, indent=4)
+        self.catalog.save_topic_list()
 
     def load_all_topics(self):
-        for topic_file in self.topic_files:
-            topic_file_path = os.path.join(self.script_dir, topic_file)
-            topic_name = os.path.splitext(os.path.basename(topic_file_path))[0]
-            if os.path.exists(topic_file_path):
-                with open(topic_file_path, "r") as file:
-                    self.topics[topic_name] = json.load(file)
-                logging.debug(f"Loaded topic: {topic_name} from {topic_file_path}")
-            else:
-                logging.warning(f"Topic file not found: {topic_file_path}")
+        self.catalog.load()
+
+    def start_loading_topics(self):
+        """Load the topic files on background threads and add each topic to the tree as soon as it is parsed."""
+        topic_files = list(self.catalog.topic_files)
+        self.topic_load_order = {os.path.splitext(os.path.basename(topic_file))[0]: order
+                                 for order, topic_file in enumerate(topic_files)}
+        load_queue = self.topic_load_queue = queue.Queue()
+
+        def load():
+            with ThreadPoolExecutor(max_workers=TOPIC_LOAD_WORKERS) as executor:
+                futures = {executor.submit(self.storage.read_topic, topic_file): topic_file
+                           for topic_file in topic_files}
+                for future in as_completed(futures):
+                    try:
+                        load_queue.put(future.result())
+                    except (OSError, ValueError) as e:
+                        logging.error(f"Failed to load topic file {futures[future]}: {e}")
+                        load_queue.put((futures[future], e))
+            load_queue.put(None)
+
+        threading.Thread(target=load, daemon=True).start()
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_topic_load_queue, load_queue)
+
+    def poll_topic_load_queue(self, load_queue):
+        # A reload replaces the queue; results from the abandoned load are dropped
+        if load_queue is not self.topic_load_queue:
+            return
 
-    def build_tree_structure(self):
-        self.save_tree_state()
-        self.tree.delete(*self.tree.get_children())  # Clear the tree before rebuilding
+        while True:
+            try:
+                loaded = load_queue.get_nowait()
+            except queue.Empty:
+                break
 
-        def add_items(parent, items):
-            for key, value in items.items():
-                if isinstance(value, dict):
-                    node = self.tree.insert(parent, "end", text=key, open=False)
-                    add_items(node, value)
-                else:
-                    self.tree.insert(parent, "end", text=key, values=[value])
+            if loaded is None:
+                self.topic_load_queue = None
+                logging.debug(f"Finished loading {len(self.catalog.topics)} topics in the background")
+                self.rebuild_search_index()
+                self.sync_playlist_watcher()
+                self.check_playlist_health()
+                return
 
-        for topic, structure in self.topics.items():
-            topic_node = self.tree.insert("", "end", text=topic, open=False)
-            add_items(topic_node, structure)
+            topic_name, structure = loaded
+            if isinstance(structure, Exception):
+                self.message_area.insert(tk.END, f"Error: Could not load topic file '{topic_name}': {structure}\n")
+            elif structure is not None and topic_name not in self.catalog.topics:
+                self.add_loaded_topic(topic_name, structure)
+
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_topic_load_queue, load_queue)
+
+    def add_loaded_topic(self, topic_name, structure):
+        # Files finish in any order; place the topic after the already loaded topics that precede it in topic_files
+        order = self.topic_load_order[topic_name]
+        last = len(self.topic_load_order)
+
+        items = list(self.catalog.topics.items())
+        index = sum(1 for name, _ in items if self.topic_load_order.get(name, last) < order)
+        items.insert(index, (topic_name, structure))
+        self.catalog.topics.clear()
+        self.catalog.topics.update(items)
+
+        tree_index = sum(1 for node in self.tree.get_children("")
+                         if self.topic_load_order.get(self.node_paths[node][0], last) < order)
+        topic_node = self.insert_tree_node("", tree_index, topic_name, structure)
+        self.add_structure_children(topic_node, structure)
+
+    def build_tree_structure(self):
+        self.save_tree_state()
+        # Clear the tree before rebuilding; detached nodes are no longer linked to it and go separately
+        self.tree.delete(*self.detached_nodes, *self.tree.get_children())
+        self.lazy_nodes = {}
+        self.node_paths = {}
+        self.path_nodes = {}
+        self.node_types = {}
+        self.playlist_nodes = {}
+        self.detached_nodes = set()
+
+        for topic, structure in self.catalog.topics.items():
+            topic_node = self.insert_tree_node("", "end", topic, structure)
+            self.add_structure_children(topic_node, structure)
 
         # Restore the tree state to keep it expanded as it was before
         self.restore_tree_state()
+        if self.filter_matches is not None:
+            self.apply_tree_filter(self.filter_matches)
+
+    def insert_tree_node(self, parent, index, key, value):
+        """Insert a node for a topic-dict entry and record its key path in the node index."""
+        path = self.node_paths.get(parent, ()) + (key,)
+        if isinstance(value, dict):
+            node = self.tree.insert(parent, index, text=key, open=False)
+            self.node_types[node] = "topic" if len(path) == 1 else "subtopic"
+        else:
+            playlist_path = expand_playlist_path(value, self.playlist_dir)
+            node = self.tree.insert(parent, index, text=key, values=[value], tags=self.health_tags(playlist_path))
+            self.node_types[node] = "title"
+            self.add_playlist_node(node, value)
+        self.node_paths[node] = path
+        self.path_nodes[path] = node
+        return node
+
+    def add_structure_children(self, parent, structure):
+        if self.lazy_tree and structure:
+            # Defer the children until the node is opened; a placeholder child keeps the expand indicator
+            self.lazy_nodes[parent] = structure
+            self.tree.insert(parent, "end", text="")
+            return
+
+        self.insert_structure_items(parent, structure)
+
+    def insert_structure_items(self, parent, structure):
+        for key, value in structure.items():
+            node = self.insert_tree_node(parent, "end", key, value)
+            if isinstance(value, dict):
+                self.add_structure_children(node, value)
+
+    def expand_node(self, item):
+        """Insert the real children of a lazily built node, replacing its placeholder."""
+        structure = self.lazy_nodes.pop(item, None)
+        if structure is None:
+            return
+
+        self.tree.delete(*self.tree.get_children(item))
+        self.insert_structure_items(item, structure)
+        if self.filter_matches is not None:
+            hidden = [node for node in self.tree.get_children(item)
+                      if not self.is_filter_visible(self.node_paths[node])]
+            if hidden:
+                self.tree.detach(*hidden)
+                self.detached_nodes.update(hidden)
+        logging.debug(f"Expanded '{self.tree.item(item, 'text')}' with {len(structure)} children")
+
+    def on_tree_open(self, event):
+        # <<TreeviewOpen>> carries no item; the opened node is the one holding the focus
+        item = self.tree.focus()
+        if item:
+            self.expand_node(item)
+
+    def reindex_subtree(self, old_path, new_path, value):
+        # Only materialized nodes are in the index; lazy descendants get their paths when expanded
+        for path, _ in iter_structure_items(old_path, value):
+            node = self.path_nodes.pop(path, None)
+            if node:
+                moved_path = new_path + path[len(old_path):]
+                self.node_paths[node] = moved_path
+                self.path_nodes[moved_path] = node
+
+    def unindex_subtree(self, path, value):
+        for sub_path, sub_value in iter_structure_items(path, value):
+            node = self.path_nodes.pop(sub_path, None)
+            if node:
+                del self.node_paths[node]
+                if self.node_types.pop(node) == "title":
+                    self.discard_playlist_node(node, sub_value)
+                self.lazy_nodes.pop(node, None)
+                if node in self.detached_nodes:
+                    # A detached node is not deleted along with its former parent
+                    self.detached_nodes.discard(node)
+                    self.tree.delete(node)
+
+    def add_playlist_node(self, node, value):
+        if value:
+            self.playlist_nodes.setdefault(expand_playlist_path(value, self.playlist_dir), set()).add(node)
+
+    def discard_playlist_node(self, node, value):
+        playlist_path = expand_playlist_path(value, self.playlist_dir)
+        nodes = self.playlist_nodes.get(playlist_path)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del self.playlist_nodes[playlist_path]
 
     def save_tree_state(self):
-        self.tree_state = {}
-        self._save_children_state("", self.tree_state)
-
-    def _save_children_state(self, parent, state):
-        for item in self.tree.get_children(parent):
-            state[item] = {
-                "open": self.tree.item(item, "open"),
-                "text": self.tree.item(item, "text")
-            }
-            state[item]["children"] = {}
-            self._save_children_state(item, state[item]["children"])
+        # Remember which key paths are expanded; unexpanded lazy nodes have nothing below them to remember
+        self.tree_state = {path for node, path in self.node_paths.items()
+                           if node not in self.lazy_nodes and self.tree.item(node, "open")}
 
     def restore_tree_state(self):
-        self._restore_children_state("", self.tree_state)
-
-    def _restore_children_state(self, parent, state):
-        for item in self.tree.get_children(parent):
-            item_text = self.tree.item(item, "text")
-            for state_item, state_info in state.items():
-                if state_info["text"] == item_text:
-                    self.tree.item(item, open=state_info["open"])
-                    self._restore_children_state(item, state_info["children"])
-                    break
+        # Shallow paths first, so that expanding a node registers the children opened after it
+        for path in sorted(self.tree_state, key=len):
+            node = self.path_nodes.get(path)
+            if node:
+                self.expand_node(node)
+                self.tree.item(node, open=True)
 
     def on_title_select(self, event):
         if not self.tree.selection():
@@ -337,19 +1095,20 @@ class VideoNavigatorApp:
             self.message_area.insert(tk.END, f"Subtopic: {selected_title}\n")
             return  # Do nothing further since it's a subtopic
 
-        values = self.tree.item(selected_item, "values")
-        if values:
-            playlist_path = values[0]
-        else:
-            playlist_path = None
+        playlist_path = self.get_playlist_path(selected_item)
 
-        # If the item is a title and has a playlist
+        # If the item is a title and has a playlist; existence comes from the health check, never a stat here
         if item_type == "title":
-            if playlist_path and os.path.exists(playlist_path):
+            health = self.playlist_health.get(playlist_path) if playlist_path else None
+            if playlist_path and (health is None or health[1] is not False):
                 self.message_area.insert(tk.END, f"Playlist: {playlist_path}\n")
+                if health and health[2]:
+                    self.message_area.insert(tk.END, f"{len(health[2])} video(s) missing, e.g. {health[2][0]}\n")
             else:
                 # If no valid playlist is found, display a message
                 self.message_area.insert(tk.END, f"No playlist found for '{selected_title}'.\n")
+            if playlist_path:
+                self.check_playlist_health([playlist_path])
 
     def add_playlist(self):
         selected_item = self.tree.selection()
@@ -370,28 +1129,25 @@ class VideoNavigatorApp:
 
         folder_selected = filedialog.askdirectory()
         if folder_selected:
-            playlist_path = self.create_playlist(folder_selected, selected_title)
-            self.update_json_file(selected_item, playlist_path)
-            self.message_area.insert(tk.END, f"Created playlist: {playlist_path}\n")
-
-    def create_playlist(self, folder, title):
-        videos = []
-        for root, _, files in os.walk(folder):
-            for filename in files:
-                if filename.endswith(('.mp4', '.avi', '.mkv')):
-                    video_path = os.path.join(root, filename)
-                    videos.append({
-                        "url": video_path,
-                        "description": filename
-                    })
-
-        # Save the playlist in the script directory under the "playlists" folder
-        playlist_path = os.path.join(self.playlist_dir, f"{title}.json")
-        with open(playlist_path, "w") as playlist_file:
-            json.dump(videos, playlist_file, indent=4)
-
-        logging.debug(f"Created playlist: {playlist_path}")
-        return playlist_path
+            path = self.node_paths[selected_item]
+            builder = self.playlist_builder()
+
+            def scan(cancel_event):
+                yield "message", f"Scanning {folder_selected} for '{selected_title}'..."
+                playlist_path = builder.create(folder_selected, path, cancel_event)
+                if playlist_path:
+                    yield "message", f"Created playlist: {playlist_path}"
+                    yield "results", [(path, playlist_path)]
+
+            self.start_scan(scan)
+
+    def playlist_builder(self):
+        """Return a PlaylistBuilder with the current settings, for one scan."""
+        return PlaylistBuilder(self.playlist_dir, self.playlist_workers, self.playlist_order, self.media_types,
+                               self.active_probe_cache())
+
+    def on_playlist_order_change(self):
+        self.playlist_order = self.playlist_order_var.get()
 
     def populate_playlist(self):
         selected_item = self.tree.selection()
@@ -414,7 +1170,9 @@ class VideoNavigatorApp:
             # If no playlist exists, proceed with file dialog
             folder_selected = filedialog.askdirectory()
             if folder_selected:
-                self.build_playlist_for_title(selected_item, folder_selected)
+                title_paths = [self.node_paths[selected_item]]
+                builder = self.playlist_builder()
+                self.start_scan(lambda cancel_event: builder.build(title_paths, folder_selected, cancel_event))
 
         elif item_type in ["subtopic", "topic"]:
             folder_selected = filedialog.askdirectory()
@@ -422,127 +1180,175 @@ class VideoNavigatorApp:
                 # For subtopic or topic: iterate through all child titles and create playlists if missing
                 self.iterate_through_children_and_build_playlists(selected_item, folder_selected)
 
-    def build_playlist_for_title(self, selected_item, base_directory):
-        selected_title = self.tree.item(selected_item, "text").strip()
-        values = self.tree.item(selected_item, "values")
+    def refresh_playlist(self):
+        """Merge new and removed videos into the playlists of the selected title or of the titles below it."""
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showwarning("No Selection", "Please select a title, topic, or subtopic.")
+            return
 
-        if values and values[0]:  # Check if a playlist already exists
-            self.message_area.insert(tk.END, f"Playlist already exists for '{selected_title}'. Skipping.\n")
+        selected_item = selected_item[0]
+        selected_path = self.node_paths[selected_item]
+        playlists = [(path, value) for path, value in self.catalog.titles(selected_path) if value]
+        if not playlists:
+            self.message_area.insert(tk.END, "No playlists to refresh.\n")
             return
 
-        # Search for a matching directory in the base directory and its subdirectories
-        for root, dirs, _ in os.walk(base_directory):
-            for dir_name in dirs:
-                if dir_name.strip() == selected_title:
-                    playlist_path = self.create_playlist(os.path.join(root, dir_name), selected_title)
-                    self.update_json_file(selected_item, playlist_path)
-                    self.message_area.insert(tk.END, f"Created playlist for '{selected_title}' in {playlist_path}\n")
+        folder = None
+        if len(playlists) == 1:
+            playlist_path = expand_playlist_path(playlists[0][1], self.playlist_dir)
+            if not os.path.exists(playlist_source_path(playlist_path)):
+                # Playlists created before source folders were recorded need their folder once
+                folder = filedialog.askdirectory(title=f"Source folder of '{selected_path[-1]}'")
+                if not folder:
                     return
 
-        self.message_area.insert(tk.END, f"No matching directory found for '{selected_title}'.\n")
+        builder = self.playlist_builder()
+        self.start_scan(lambda cancel_event: builder.refresh(playlists, cancel_event, folder))
 
     def iterate_through_children_and_build_playlists(self, parent_item, base_directory):
-        def iterate_tree(item):
-            for child in self.tree.get_children(item):
-                if self.determine_item_type(child) == "title":
-                    self.build_playlist_for_title(child, base_directory)
-                else:
-                    iterate_tree(child)
+        # Collect the titles still missing a playlist from the topic dicts, so that lazily built
+        # branches are covered without materializing them in the tree
+        parent_path = self.node_paths[parent_item]
+        title_paths = [path for path, value in self.catalog.titles(parent_path) if value == ""]
 
-        iterate_tree(parent_item)
+        if not title_paths:
+            self.message_area.insert(tk.END, "All titles already have playlists.\n")
+            return
 
-    def update_json_file(self, selected_item, playlist_path):
-        parent_item = self.tree.parent(selected_item)
-        selected_title = self.tree.item(selected_item, "text")
-        parent_title = self.tree.item(parent_item, "text") if parent_item else None
-
-        topic_name = self.get_topic_name(selected_item)
-
-        def update_items(structure, selected_title, parent_title, playlist_path):
-            for key, value in structure.items():
-                if isinstance(value, dict):
-                    if key == parent_title:
-                        if selected_title in value:
-                            structure[key][selected_title] = playlist_path  # Assign the playlist path
-                            return True
-                    if update_items(value, selected_title, parent_title, playlist_path):
-                        return True
-                elif key == selected_title and parent_title is None:
-                    structure[key] = playlist_path  # Assign the playlist path
-                    return True
-            return False
+        builder = self.playlist_builder()
+        self.start_scan(lambda cancel_event: builder.build(title_paths, base_directory, cancel_event))
 
-        if update_items(self.topics[topic_name], selected_title, parent_title, playlist_path):
-            self.modified_topics.add(topic_name)
-            self.tree.item(selected_item, values=[playlist_path])
+    def start_scan(self, scan):
+        """Run a scan generator on a worker thread and feed what it yields back to the Tk thread.
 
-            # Immediately save the updated structure to the JSON file
-            with open(os.path.join(self.script_dir, f"{topic_name}.json"), "w") as file:
-                json.dump(self.topics[topic_name], file, indent=4)
-            logging.debug(f"Updated JSON file for topic '{topic_name}' with playlist: {playlist_path}")
-        else:
-            self.message_area.insert(tk.END, f"Error: Could not update playlist for '{selected_title}'.\n")
-            logging.error(f"Failed to update JSON file for '{selected_title}' in topic '{topic_name}'.")
+        The generator receives a threading.Event that is set when the scan is cancelled and yields
+        ("message", text) for progress and ("results", [(title_path, playlist_path), ...]) batches of
+        created playlists, which are merged into the topics with one write per topic file.
+        """
+        if self.scan_thread and self.scan_thread.is_alive():
+            messagebox.showwarning("Scan Running", "A directory scan is already running. Cancel it or wait for it to finish.")
+            return
 
-    def get_topic_name(self, item_id):
-        while True:
-            parent = self.tree.parent(item_id)
-            if not parent:
-                return self.tree.item(item_id, "text")
-            item_id = parent
+        self.scan_cancel = threading.Event()
+        self.scan_thread = threading.Thread(target=self._run_scan, args=(scan, self.scan_cancel), daemon=True)
+        self.scan_thread.start()
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_scan_queue)
 
-    def determine_item_type(self, selected_item):
-        selected_title = self.tree.item(selected_item, "text")
-        item_values = self.tree.item(selected_item, "values")
+    def _run_scan(self, scan, cancel_event):
+        try:
+            for message in scan(cancel_event):
+                self.scan_queue.put(message)
+        except Exception as e:
+            logging.exception("Directory scan failed")
+            self.scan_queue.put(("message", f"Error: scan failed: {e}"))
+        # Probed metadata is written once per scan, not once per playlist
+        self.probe_cache.save()
+        self.scan_queue.put(("done", cancel_event.is_set()))
+
+    def poll_scan_queue(self):
+        while True:
+            try:
+                kind, payload = self.scan_queue.get_nowait()
+            except queue.Empty:
+                break
 
-        # Check if the selected item is a root-level topic
-        if selected_title in self.topic_names:
-            return "topic"
+            if kind == "message":
+                self.message_area.insert(tk.END, f"{payload}\n")
+            elif kind == "results":
+                self.assign_playlists(payload)
+            elif kind == "refreshed":
+                # The playlist files changed in place; only their search entries need updating
+                current = []
+                for path, playlist_path in payload:
+                    try:
+                        if self.catalog.get_structure(path) == playlist_path:
+                            current.append((path, playlist_path))
+                    except (KeyError, TypeError):
+                        continue
+                self.index_playlists(current)
+                self.check_playlist_health([expand_playlist_path(playlist_path, self.playlist_dir)
+                                            for _, playlist_path in payload], force=True)
+            elif kind == "done":
+                self.message_area.insert(tk.END, "Scan cancelled.\n" if payload else "Scan finished.\n")
+                self.message_area.see(tk.END)
+                return
 
-        # If the item has a string value, it should be a title
-        if item_values and isinstance(item_values[0], str):
-            return "title"
+        self.message_area.see(tk.END)
+        self.root.after(SCAN_POLL_INTERVAL_MS, self.poll_scan_queue)
 
-        # If the item has no values or has children, it's a subtopic
-        if not item_values or self.tree.get_children(selected_item):
-            return "subtopic"
+    def cancel_scan(self):
+        if self.scan_thread and self.scan_thread.is_alive():
+            self.scan_cancel.set()
+            self.message_area.insert(tk.END, "Cancelling scan...\n")
+            logging.debug("Directory scan cancellation requested")
 
-        # Fallback to subtopic if nothing else matches
-        return "subtopic"
+    def update_json_file(self, selected_item, playlist_path):
+        selected_title = self.tree.item(selected_item, "text")
+        path = self.node_paths.get(selected_item)
 
-    def find_value_in_structure(self, structure, parent_title, title=None):
-        """Navigate the structure to find the value associated with the given title under the correct parent."""
-        if parent_title in structure:
-            return structure[parent_title]
+        if not self.assign_playlist(path, playlist_path):
+            self.message_area.insert(tk.END, f"Error: Could not update playlist for '{selected_title}'.\n")
+            logging.error(f"Failed to update JSON file for '{selected_title}': item is not an indexed title.")
 
-        for key, value in structure.items():
-            if isinstance(value, dict):
-                # Recursively search within nested dictionaries
-                found = self.find_value_in_structure(value, parent_title, title)
-                if found is not None:
-                    return found
+    def assign_playlist(self, path, playlist_path):
+        """Store a title's playlist path and schedule its topic file to be saved; returns False if the title is gone."""
+        if self.set_playlist(path, playlist_path) is None:
+            return False
 
-        return None
+        # Schedule the updated structure to be saved to the JSON file
+        self.update_json_file_after_edit(path[0])
+        logging.debug(f"Updated JSON file for topic '{path[0]}' with playlist: {playlist_path}")
+        return True
+
+    def assign_playlists(self, results):
+        # Merge a batch of scan results and schedule one write for each affected topic file
+        updated_topics = set()
+        assigned = []
+        for path, playlist_path in results:
+            stored_path = self.set_playlist(path, playlist_path, index=False)
+            if stored_path is not None:
+                updated_topics.add(path[0])
+                assigned.append((path, stored_path))
+            else:
+                self.message_area.insert(tk.END, f"Error: Could not update playlist for '{path[-1]}'.\n")
+        self.index_playlists(assigned)
 
-    def find_item_type(self, structure, title):
-        """Search through the structure to determine the type of a given item."""
+        for topic_name in updated_topics:
+            self.update_json_file_after_edit(topic_name)
+        self.sync_playlist_watcher()
+        self.check_playlist_health([playlist_path for _, playlist_path in results], force=True)
+        logging.debug(f"Assigned {len(results)} playlists across topics {sorted(updated_topics)}")
 
-        # Check if the title matches any key in the structure
-        if title in structure:
-            value = structure[title]
-            if isinstance(value, dict):
-                return "subtopic"
-            elif isinstance(value, str):
-                return "title"
+    def set_playlist(self, path, playlist_path, index=True):
+        """Store a title's playlist path in the catalog and on its tree node (if materialized).
 
-        # Recursively search within nested dictionaries
-        for key, value in structure.items():
-            if isinstance(value, dict):
-                item_type = self.find_item_type(value, title)
-                if item_type:
-                    return item_type
+        Returns the stored path, or None if the title is gone. With index=False the caller indexes the
+        playlist itself, so a batch of them is read in one background task.
+        """
+        try:
+            previous = self.catalog.get_structure(path)
+        except (KeyError, TypeError):
+            previous = None
+        playlist_path = self.catalog.set_playlist(path, playlist_path)
+        if playlist_path is None:
+            # The title was renamed or deleted while a scan was running
+            return None
+        node = self.path_nodes.get(path)
+        self.discard_playlist_title(path, previous)
+        self.add_playlist_title(path, playlist_path)
+        if node:
+            self.discard_playlist_node(node, previous)
+            self.tree.item(node, values=[playlist_path])
+            self.add_playlist_node(node, playlist_path)
+        if index:
+            self.index_playlist(path, playlist_path)
+        return playlist_path
 
-        return None
+    def determine_item_type(self, selected_item):
+        # The type is recorded when the node is inserted, so no Tk round-trips are needed here;
+        # anything unknown (e.g. a lazy placeholder) is treated as a subtopic like before
+        return self.node_types.get(selected_item, "subtopic")
 
     def add_item(self):
         selected_item = self.tree.selection()
@@ -599,199 +1405,93 @@ class VideoNavigatorApp:
             messagebox.showwarning("Invalid Name", "Please enter a valid name.")
             return
 
-        # Determine the topic name from the selected item
-        topic_name = self.get_topic_name(selected_item)
-
-        # Save the current tree state before making changes
-        self.save_tree_state()
+        selected_path = self.node_paths[selected_item]
+        topic_name = selected_path[0]
+        add_below = selected_item_type == "title" or (selected_item_type == "subtopic" and nesting_level == "below")
 
-        new_item = None
-
-        # If the selected item is a title, add below (titles can't have nested structure)
-        if selected_item_type == "title":
-            new_item = self.tree.insert("", self.tree.index(selected_item) + 1, text=new_item_name, open=False)
-            self.add_to_structure_below(topic_name, selected_title, new_item_name, item_type)
-        # If it's a topic or subtopic, handle accordingly
-        elif selected_item_type in {"topic", "subtopic"}:
-            if nesting_level == "inside":
-                new_item = self.tree.insert(selected_item, "end", text=new_item_name, open=False)
-                self.add_to_structure_inside(topic_name, selected_title, new_item_name, item_type)
-            elif nesting_level == "below":
-                new_item = self.tree.insert("", self.tree.index(selected_item) + 1, text=new_item_name, open=False)
-                self.add_to_structure_below(topic_name, selected_title, new_item_name, item_type)
-
-        if new_item:
-            # Mark the topic as modified
-            self.modified_topics.add(topic_name)
-
-            # Update the JSON file immediately
-            self.update_json_file_after_edit(topic_name)
-
-            # Rebuild the tree to ensure it's showing the latest data
-            self.build_tree_structure()
+        # Titles can't have nested structure, so the new item becomes the next sibling; topics, and
+        # subtopics with "inside" nesting, get the new item as their last child
+        parent_path = selected_path[:-1] if add_below else selected_path
+        if new_item_name in self.catalog.get_structure(parent_path):
+            messagebox.showwarning("Duplicate Name", f"'{new_item_name}' already exists at this level.")
+            return
 
-            # Restore the tree state to keep it expanded as it was before
-            self.restore_tree_state()
+        if add_below:
+            parent_item = self.tree.parent(selected_item)
+            index = self.tree.index(selected_item) + 1
+            # Insert right after the sibling so the order matches the tree view
+            structure_index = list(self.catalog.get_structure(parent_path)).index(selected_path[-1]) + 1
+        else:
+            # Expand a lazy parent first so the new entry is not inserted twice
+            parent_item = selected_item
+            index = "end"
+            self.expand_node(parent_item)
+            structure_index = None
+        new_value = self.catalog.add_item(parent_path, new_item_name, item_type, structure_index)
+
+        # Patch only the new node into the tree instead of rebuilding it
+        new_item = self.insert_tree_node(parent_item, index, new_item_name, new_value)
+        self.index_added_item(self.node_paths[new_item])
+        self.tree.item(parent_item, open=True)
+        self.tree.see(new_item)
+
+        # Schedule the topic to be saved
+        self.update_json_file_after_edit(topic_name)
 
     def update_json_file_after_edit(self, topic_name):
-        """Save the modified topic structure back to the corresponding JSON file."""
-        topic_file_path = os.path.join(self.script_dir, f"{topic_name}.json")
-        with open(topic_file_path, "w") as file:
-            json.dump(self.topics[topic_name], file, indent=4)
-        logging.debug(f"Saved updated topic '{topic_name}' to {topic_file_path}")
-
-    def add_to_structure_below(self, topic_name, parent_name, new_item_name, new_item_type):
-        def find_and_add_below(structure, parent_name):
-            items = list(structure.items())
-            for i, (key, value) in enumerate(items):
-                if key == parent_name:
-                    if new_item_type == "subtopic":
-                        structure[new_item_name] = {}  # No need to add _type anymore
-                    else:
-                        structure[new_item_name] = ""  # Titles are identified by strings
-                    return True
-                elif isinstance(value, dict):
-                    if find_and_add_below(value, parent_name):
-                        return True
-            return False
+        """Mark a topic as modified and schedule a debounced write of it to the storage."""
+        self.catalog.modified_topics.add(topic_name)
 
-        if not find_and_add_below(self.topics[topic_name], parent_name):
-            if new_item_type == "subtopic":
-                self.topics[topic_name][new_item_name] = {}
-            else:
-                self.topics[topic_name][new_item_name] = ""
-        logging.debug(f"Added '{new_item_name}' as '{new_item_type}' under '{parent_name}' in topic '{topic_name}'")
-
-    def add_to_structure_inside(self, topic_name, parent_name, new_item_name, new_item_type):
-        def find_and_add_inside(structure, parent_name):
-            for key, value in structure.items():
-                if key == parent_name and isinstance(value, dict):
-                    if new_item_type == "subtopic":
-                        structure[key][new_item_name] = {}  # No need for _type key
-                    else:
-                        structure[key][new_item_name] = ""  # Titles are identified by strings
-                    return True
-                elif isinstance(value, dict):
-                    if find_and_add_inside(value, parent_name):
-                        return True
-            return False
+        # Every edit pushes the write back, so a burst of edits ends in a single write per topic
+        if self.save_after_id is not None:
+            self.root.after_cancel(self.save_after_id)
+        self.save_after_id = self.root.after(SAVE_DEBOUNCE_MS, self.flush_modified_topics)
 
-        if not find_and_add_inside(self.topics[topic_name], parent_name):
-            if new_item_type == "subtopic":
-                self.topics[topic_name][new_item_name] = {}
-            else:
-                self.topics[topic_name][new_item_name] = ""
-        logging.debug(f"Added '{new_item_name}' as '{new_item_type}' inside '{parent_name}' in topic '{topic_name}'")
+    def flush_modified_topics(self):
+        """Write every modified topic back to the storage now."""
+        if self.save_after_id is not None:
+            self.root.after_cancel(self.save_after_id)
+            self.save_after_id = None
+
+        self.catalog.save()
 
     def move_up(self):
         selected_item = self.tree.selection()[0]
         prev_item = self.tree.prev(selected_item)
 
         if prev_item:
-            selected_title = self.tree.item(selected_item, "text")
-            prev_title = self.tree.item(prev_item, "text")
-
-            parent_item = self.tree.parent(selected_item)
-            parent_title = self.tree.item(parent_item, "text") if parent_item else None
-
-            if parent_title is None:
-                # This is a root-level topic
-                try:
-                    current_index = self.topic_files.index(f"{selected_title}.json")
-                    prev_index = self.topic_files.index(f"{prev_title}.json")
-                    self.topic_files[current_index], self.topic_files[prev_index] = (
-                        self.topic_files[prev_index],
-                        self.topic_files[current_index],
-                    )
-                    self.save_topic_files()
-                    logging.debug(f"Swapped root topics '{selected_title}' and '{prev_title}' in topic_files list")
-                except ValueError as e:
-                    logging.error(f"Error swapping root topics: {e}")
-            else:
-                topic_name = self.get_topic_name(selected_item)
-                if parent_title in self.topics:
-                    parent_structure = self.topics[parent_title]
-                else:
-                    parent_structure = self.find_value_in_structure(self.topics[topic_name], parent_title)
-
-                if parent_structure:
-                    self.swap_items_in_structure(parent_structure, selected_title, prev_title)
-                    self.modified_topics.add(topic_name)
-                    self.update_json_file_after_edit(topic_name)
-                    logging.debug(f"Swapped '{selected_title}' and '{prev_title}' under parent '{parent_title}' in topic '{topic_name}'")
-                else:
-                    logging.warning(f"Could not find structure for parent '{parent_title}'.")
+            self.swap_with_sibling(selected_item, prev_item)
 
             # Move the item in the tree view
             current_index = self.tree.index(selected_item)
             self.tree.move(selected_item, self.tree.parent(selected_item), current_index - 1)
-            logging.debug(f"Moved '{selected_title}' up in the tree view")
+            logging.debug(f"Moved '{self.tree.item(selected_item, 'text')}' up in the tree view")
 
     def move_down(self):
         selected_item = self.tree.selection()[0]
         next_item = self.tree.next(selected_item)
 
         if next_item:
-            selected_title = self.tree.item(selected_item, "text")
-            next_title = self.tree.item(next_item, "text")
-
-            parent_item = self.tree.parent(selected_item)
-            parent_title = self.tree.item(parent_item, "text") if parent_item else None
-
-            if parent_title is None:
-                # This is a root-level topic
-                try:
-                    current_index = self.topic_files.index(f"{selected_title}.json")
-                    next_index = self.topic_files.index(f"{next_title}.json")
-                    self.topic_files[current_index], self.topic_files[next_index] = (
-                        self.topic_files[next_index],
-                        self.topic_files[current_index],
-                    )
-                    self.save_topic_files()
-                    logging.debug(f"Swapped root topics '{selected_title}' and '{next_title}' in topic_files list")
-                except ValueError as e:
-                    logging.error(f"Error swapping root topics: {e}")
-            else:
-                topic_name = self.get_topic_name(selected_item)
-                if parent_title in self.topics:
-                    parent_structure = self.topics[parent_title]
-                else:
-                    parent_structure = self.find_value_in_structure(self.topics[topic_name], parent_title)
-
-                if parent_structure:
-                    self.swap_items_in_structure(parent_structure, selected_title, next_title)
-                    self.modified_topics.add(topic_name)
-                    self.update_json_file_after_edit(topic_name)
-                    logging.debug(f"Swapped '{selected_title}' and '{next_title}' under parent '{parent_title}' in topic '{topic_name}'")
-                else:
-                    logging.warning(f"Could not find structure for parent '{parent_title}'.")
+            self.swap_with_sibling(selected_item, next_item)
 
             # Move the item in the tree view
             current_index = self.tree.index(selected_item)
             self.tree.move(selected_item, self.tree.parent(selected_item), current_index + 1)
-            logging.debug(f"Moved '{selected_title}' down in the tree view")
-
-    def swap_items_in_structure(self, structure, item1, item2):
-        items = list(structure.items())
-        index1, index2 = None, None
-        for i, (key, value) in enumerate(items):
-            if key == item1:
-                index1 = i
-            elif key == item2:
-                index2 = i
-            if index1 is not None and index2 is not None:
-                break
-        if index1 is not None and index2 is not None:
-            items[index1], items[index2] = items[index2], items[index1]
-            structure.clear()
-            structure.update(items)
-            logging.debug(f"Swapped items '{item1}' and '{item2}' in structure")
-
-    def swap_items_in_list(self, item_list, item1, item2):
-        index1 = item_list.index(f"{item1}.json")
-        index2 = item_list.index(f"{item2}.json")
-        item_list[index1], item_list[index2] = item_list[index2], item_list[index1]
-        logging.debug(f"Swapped items '{item1}' and '{item2}' in list")
+            logging.debug(f"Moved '{self.tree.item(selected_item, 'text')}' down in the tree view")
+
+    def swap_with_sibling(self, selected_item, sibling_item):
+        # Root-level topics are reordered in the topics list, everything else in its parent's dict
+        selected_title = self.tree.item(selected_item, "text")
+        sibling_title = self.tree.item(sibling_item, "text")
+        parent_item = self.tree.parent(selected_item)
+        parent_path = self.node_paths[parent_item] if parent_item else ()
+        try:
+            self.catalog.swap_items(parent_path, selected_title, sibling_title)
+        except ValueError as e:
+            logging.error(f"Error swapping '{selected_title}' and '{sibling_title}': {e}")
+            return
+        if parent_path:
+            self.update_json_file_after_edit(parent_path[0])
 
     def rename_item(self):
         selected_item = self.tree.selection()
@@ -813,141 +1513,91 @@ class VideoNavigatorApp:
         new_name = simpledialog.askstring("Rename Item", f"Enter a new name for '{selected_title}':")
 
         if new_name:
-            topic_name = self.get_topic_name(selected_item)
+            path = self.node_paths[selected_item]
+            topic_name = path[0]
 
-            # Save the current tree state before making changes
-            self.save_tree_state()
+            if new_name != path[-1] and new_name in self.catalog.get_structure(path[:-1]):
+                messagebox.showwarning("Duplicate Name", f"'{new_name}' already exists at this level.")
+                return
 
-            # Update the in-memory structure, passing the selected_item ID to target the correct item
-            self.update_structure_name(topic_name, selected_item, selected_title, new_name)
+            # Update the in-memory structure and the node index for the item and everything below it
+            self.update_structure_name(path, new_name)
 
             # Update the tree item text
             self.tree.item(selected_item, text=new_name)
 
-            # Mark the topic as modified
-            self.modified_topics.add(topic_name)
-
-            # Update the JSON file immediately
+            # Schedule the topic to be saved
             self.update_json_file_after_edit(topic_name)
 
-            # Rebuild the tree to ensure it's showing the latest data
-            self.build_tree_structure()
-
-            # Restore the tree state to keep it expanded as it was before
-            self.restore_tree_state()
-
-    def update_structure_name(self, topic_name, selected_item, old_name, new_name):
-        def rename_item_in_structure(structure, item_id, old_name, new_name):
-            for key, value in list(structure.items()):
-                if key == old_name and item_id == self.tree.selection()[0]:
-                    # Preserve the order by re-inserting the renamed item in the same position
-                    items = list(structure.items())
-                    index = items.index((key, value))  # Find the current position
-                    items[index] = (new_name, value)  # Replace the old name with the new name
-                    structure.clear()  # Clear the current structure
-                    structure.update(items)  # Reinsert all items, maintaining the order
-                    logging.debug(f"Renamed '{old_name}' to '{new_name}' in structure")
-                    return True
-                elif isinstance(value, dict):
-                    # Recursively search within nested dictionaries
-                    if rename_item_in_structure(value, item_id, old_name, new_name):
-                        return True
-            return False
-
-        if topic_name in self.topics:
-            rename_item_in_structure(self.topics[topic_name], selected_item, old_name, new_name)
+    def update_structure_name(self, path, new_name):
+        value = self.catalog.rename_item(path, new_name)
+        self.reindex_subtree(path, path[:-1] + (new_name,), value)
+        self.index_renamed_item(path, path[:-1] + (new_name,), value)
 
     def delete_item(self):
         selected_item = self.tree.selection()[0]
         selected_title = self.tree.item(selected_item, "text")
+        path = self.node_paths[selected_item]
 
-        topic_name = self.get_topic_name(selected_item)
-        self.modified_topics.add(topic_name)
-
-        def delete_items(structure, selected_title):
-            if selected_title in structure:
-                del structure[selected_title]
-                logging.debug(f"Deleted '{selected_title}' from structure")
-                return True
-            for key, value in structure.items():
-                if isinstance(value, dict):
-                    if delete_items(value, selected_title):
-                        return True
-            return False
+        if len(path) == 1:
+            messagebox.showinfo("Delete Topic", "Use 'Delete Topic' to remove a whole topic.")
+            return
 
-        if delete_items(self.topics[topic_name], selected_title):
-            self.tree.delete(selected_item)
-            self.update_json_file_after_edit(topic_name)
-            logging.debug(f"Deleted item '{selected_title}' from tree and updated JSON")
-        else:
-            logging.error(f"Failed to delete item '{selected_title}' from structure")
+        topic_name = path[0]
+        value = self.catalog.delete_item(path)
+
+        self.tree.delete(selected_item)
+        self.unindex_subtree(path, value)
+        self.index_removed_item(path, value)
+        self.update_json_file_after_edit(topic_name)
+        logging.debug(f"Deleted item '{selected_title}' from tree and updated JSON")
 
     def add_new_topic(self):
         new_topic_name = simpledialog.askstring("New Topic", "Enter the name of the new topic:")
 
         if new_topic_name:
+            # A second topic of the same name would overwrite the first one's topic file
+            if self.catalog.has_topic(new_topic_name):
+                messagebox.showwarning("Duplicate Name", f"'{new_topic_name}' already exists at this level.")
+                return
+
             selected_item = self.tree.selection()
 
-            if selected_item:
-                # If an item is selected, check if it's a root-level topic
-                parent_item = self.tree.parent(selected_item[0])
-                if parent_item == "":
-                    # Add a new root-level topic below the currently selected topic
-                    new_item = self.tree.insert("", self.tree.index(selected_item[0]) + 1, text=new_topic_name,
-                                                open=False)
-                else:
-                    # The selected item is not a root-level topic, so add the new topic at the root level
-                    new_item = self.tree.insert("", "end", text=new_topic_name, open=False)
-            else:
-                # No selection, so add the new topic at the root level as the last item
-                new_item = self.tree.insert("", "end", text=new_topic_name, open=False)
+            # Add at the root level as the last item, unless a root-level topic is selected, in which
+            # case the new topic goes right below it
+            index = "end"
+            if selected_item and self.tree.parent(selected_item[0]) == "":
+                index = self.tree.index(selected_item[0]) + 1
+            self.insert_tree_node("", index, new_topic_name, {})
+            self.index_added_item((new_topic_name,))
 
             self.message_area.insert(tk.END, f"Added new topic: {new_topic_name}\n")
             logging.debug(f"Added new topic: {new_topic_name}")
 
-            # Update the in-memory structure
-            self.topics[new_topic_name] = {}
-            self.modified_topics.add(new_topic_name)
-
-            # Also, update the topics_list.json file to include the new topic file
-            self.topic_files.append(f"{new_topic_name}.json")
-            self.save_topic_files()
-            logging.debug(f"Updated topic_files list with new topic: {new_topic_name}.json")
-
-            # Save the new topic structure to a new JSON file
-            new_topic_file_path = os.path.join(self.script_dir, f"{new_topic_name}.json")
-            with open(new_topic_file_path, "w") as file:
-                json.dump({}, file, indent=4)
-            logging.debug(f"Created new topic file: {new_topic_file_path}")
+            # Add the topic to the catalog and the topics list, and save it
+            self.catalog.add_topic(new_topic_name)
 
     def delete_topic(self):
-        selected_item = self.tree.selection()[0]
-        selected_title = self.tree.item(selected_item, "text")
-
-        if selected_title in self.topics:
-            # Remove the topic from the in-memory structure
-            del self.topics[selected_title]
-            logging.debug(f"Removed topic '{selected_title}' from in-memory structure")
-
-            # Remove the topic from the list of topic files
-            self.topic_files = [f for f in self.topic_files if not f.startswith(selected_title)]
-            logging.debug(f"Updated topic_files list after deleting topic '{selected_title}'")
-
-            # Remove the topic from the modified topics set
-            self.modified_topics.discard(selected_title)
+        selected_item = self.tree.selection()
+        if not selected_item:
+            messagebox.showwarning("No Selection", "Please select a topic to delete.")
+            return
 
-            # Remove the JSON file from the filesystem
-            topic_file_path = os.path.join(self.script_dir, f"{selected_title}.json")
-            if os.path.exists(topic_file_path):
-                os.remove(topic_file_path)
-                logging.debug(f"Deleted topic file: {topic_file_path}")
+        # Go by the key path, not the text: a subtopic may share its name with a topic
+        selected_item = selected_item[0]
+        path = self.node_paths[selected_item]
+        if len(path) != 1:
+            messagebox.showwarning("Not a Topic", "Please select a topic to delete.")
+            return
+        topic_name = path[0]
 
-            # Update the topics_list.json file to reflect the changes
-            self.save_topic_files()
-            logging.debug(f"Saved updated topics_list.json after deleting topic '{selected_title}'")
+        # Remove the topic from the catalog, the topics list and the storage
+        structure = self.catalog.delete_topic(topic_name)
 
-            # Rebuild the tree structure to reflect the changes
-            self.build_tree_structure()
+        # Remove just the topic's node from the tree
+        self.tree.delete(selected_item)
+        self.unindex_subtree(path, structure)
+        self.index_removed_item(path, structure)
 
     def load_new_topic_tree(self):
         # Open a file dialog to select a topics list JSON file
@@ -965,26 +1615,32 @@ class VideoNavigatorApp:
                 if not isinstance(new_topics_list, list):
                     raise ValueError("The selected file does not contain a valid topics list (expected a list).")
 
-                # Clear the current topics and tree structure
-                self.topics.clear()
-                self.tree.delete(*self.tree.get_children())
-
-                # Load each topic file from the new topics list
-                for topic_file in new_topics_list:
-                    topic_file_path = os.path.join(self.script_dir, topic_file)
-                    topic_name = os.path.splitext(os.path.basename(topic_file_path))[0]
-                    if os.path.exists(topic_file_path):
-                        with open(topic_file_path, "r") as tf:
-                            self.topics[topic_name] = json.load(tf)
-                        logging.debug(f"Loaded topic '{topic_name}' from {topic_file_path}")
-                    else:
-                        logging.warning(f"Topic file '{topic_file_path}' does not exist")
-
-                # Build the tree structure with the newly loaded topics
+                # Read every topic file of the new list first, so a failure leaves the current topics untouched
+                json_storage = self.storage if isinstance(self.storage, JsonTopicStorage) else \
+                    JsonTopicStorage(self.script_dir, self.playlist_dir)
+                new_topics = [(topic_name, structure) for topic_name, structure
+                              in self.catalog.read_topic_files(new_topics_list, json_storage) if structure is not None]
+
+                # Write pending edits, stop any background load and swap the topics in; a catalog storage
+                # imports them. build_tree_structure clears the tree itself.
+                self.flush_modified_topics()
+                self.topic_load_queue = None
+                # Topics left out of the new list are not deleted: a catalog storage keeps their rows after
+                # the listed topics, as the JSON storage keeps their files
+                self.catalog.topics.clear()
+                for topic_name, structure in new_topics:
+                    self.catalog.topics[topic_name] = structure
+                    if json_storage is not self.storage:
+                        self.storage.write_topic(topic_name, structure)
+
+                # Build the tree structure and search index with the newly loaded topics
                 self.build_tree_structure()
+                self.rebuild_search_index()
+                self.sync_playlist_watcher()
+                self.check_playlist_health()
 
                 # Update the current topics list and save it if needed
-                self.topic_files = new_topics_list
+                self.catalog.topic_files = new_topics_list
                 self.save_topic_files()
                 logging.debug(f"Loaded new topics list from {file_path}")
 
@@ -995,6 +1651,239 @@ class VideoNavigatorApp:
                 messagebox.showerror("Error", f"Failed to load topics list. Error: {str(e)}")
                 logging.error(f"Failed to load topics list from {file_path}. Error: {e}")
 
+    def reload_from_disk(self):
+        # Edits patch the tree in place; this is the one action that rebuilds it from the topic files.
+        # Write pending edits first so they are not lost.
+        self.flush_modified_topics()
+        self.topic_load_queue = None
+        self.load_all_topics()
+        self.build_tree_structure()
+        self.rebuild_search_index()
+        self.sync_playlist_watcher()
+        self.check_playlist_health()
+        self.message_area.insert(tk.END, "Reloaded topics from disk.\n")
+        logging.debug("Reloaded all topics from disk and rebuilt the tree")
+
+    def run_in_background(self, work, on_done):
+        """Run work() on a daemon thread and call on_done(result) on the Tk thread once it returns."""
+        result_queue = queue.Queue()
+
+        def run():
+            try:
+                result_queue.put(work())
+            except Exception:
+                logging.exception("Background task failed")
+
+        def poll(thread):
+            # Check the thread before the queue: a result put just before the thread ends is then still seen
+            alive = thread.is_alive()
+            try:
+                result = result_queue.get_nowait()
+            except queue.Empty:
+                if alive:
+                    self.root.after(SCAN_POLL_INTERVAL_MS, poll, thread)
+                return
+            on_done(result)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        self.root.after(SCAN_POLL_INTERVAL_MS, poll, thread)
+
+    def rebuild_search_index(self):
+        # The topics were (re)loaded; the playlist -> titles map is rebuilt from them when next needed
+        self.playlist_titles = None
+        # Snapshot the topics on the Tk thread; the worker then tokenizes them and reads the playlists
+        nodes = self.catalog.search_nodes()
+        storage = self.storage
+        edits = self.search_edits
+
+        def build():
+            return build_search_index(nodes, storage)
+
+        def install(index):
+            if edits != self.search_edits:
+                # The topics changed while indexing; index them again rather than patch a stale snapshot
+                self.rebuild_search_index()
+                return
+            self.search_index = index
+            logging.debug(f"Search index built with {len(index.documents)} documents and {len(index.postings)} tokens")
+            if self.search_var.get().strip():
+                self.run_search()
+
+        self.run_in_background(build, install)
+
+    def index_added_item(self, path):
+        self.search_edits += 1
+        self.search_index.add(("name", path), path[-1])
+
+    def index_renamed_item(self, old_path, new_path, value):
+        self.search_edits += 1
+        for path, sub_value in iter_structure_items(old_path, value):
+            moved_path = new_path + path[len(old_path):]
+            self.search_index.move(("name", path), ("name", moved_path))
+            self.search_index.move(("playlist", path), ("playlist", moved_path))
+            self.discard_playlist_title(path, sub_value)
+            self.add_playlist_title(moved_path, sub_value)
+        self.search_index.add(("name", new_path), new_path[-1])
+
+    def index_removed_item(self, path, value):
+        self.search_edits += 1
+        for sub_path, sub_value in iter_structure_items(path, value):
+            self.search_index.remove(("name", sub_path))
+            self.search_index.remove(("playlist", sub_path))
+            self.discard_playlist_title(sub_path, sub_value)
+
+    def index_playlist(self, path, playlist_path):
+        self.index_playlists([(path, playlist_path)])
+
+    def index_playlists(self, playlists):
+        """Re-index the playlist entries of [(title path, stored playlist path)], reading them in one task."""
+        self.search_edits += 1
+        for path, _ in playlists:
+            self.search_index.remove(("playlist", path))
+        playlists = [(path, playlist_path) for path, playlist_path in playlists if playlist_path]
+        if not playlists:
+            return
+
+        def install(texts):
+            for (path, playlist_path), text in zip(playlists, texts):
+                # Skip titles renamed, deleted or given another playlist in the meantime
+                try:
+                    current = self.catalog.get_structure(path)
+                except (KeyError, TypeError):
+                    continue
+                if current == playlist_path:
+                    self.search_index.add(("playlist", path), text)
+
+        def read():
+            texts = []
+            for full_path in full_paths:
+                # The playlist was just written or assigned; record its entries before indexing them
+                self.storage.record_playlist(full_path)
+                texts.append(self.storage.read_playlist_text(full_path))
+            return texts
+
+        full_paths = [expand_playlist_path(playlist_path, self.playlist_dir) for _, playlist_path in playlists]
+        self.run_in_background(read, install)
+
+    def on_search_key(self, event):
+        # Debounce so the query runs once typing pauses rather than on every keystroke
+        if event.keysym in ("Return", "Escape"):
+            return
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        self.search_after_id = None
+        query = self.search_var.get().strip()
+        if not query:
+            self.clear_search()
+            return
+
+        if self.filter_var.get():
+            # The filtered tree shows the matches, so the hit list is not needed
+            self.search_hits = []
+            self.search_results.pack_forget()
+            self.apply_tree_filter(self.search_index.match(query, names_only=True))
+            return
+
+        self.clear_tree_filter()
+        self.search_hits = [path for path, _ in self.search_index.search(query)]
+        self.search_results.delete(0, tk.END)
+        for path in self.search_hits:
+            self.search_results.insert(tk.END, " > ".join(path))
+        if not self.search_hits:
+            self.search_results.insert(tk.END, f"No matches for '{query}'")
+        self.search_results.pack(fill=tk.X)
+
+    def clear_search(self):
+        self.search_var.set("")
+        self.search_hits = []
+        self.search_results.delete(0, tk.END)
+        self.search_results.pack_forget()
+        self.clear_tree_filter()
+
+    def is_filter_visible(self, path):
+        """Return True if a node passes the tree filter: it matches, is an ancestor of a match or lies below one."""
+        if path in self.filter_visible:
+            return True
+        return any(path[:depth] in self.filter_matches for depth in range(1, len(path)))
+
+    def apply_tree_filter(self, matches):
+        """Show only the nodes matching the filter, their ancestors and their descendants.
+
+        The visible set comes from the search index and the node index, not from walking Tk items, and only
+        the nodes whose visibility changed are detached or reattached.
+        """
+        self.filter_matches = matches
+        self.filter_visible = set(matches)
+        for path in matches:
+            self.filter_visible.update(path[:depth] for depth in range(1, len(path)))
+
+        if len(matches) <= FILTER_EXPAND_LIMIT:
+            for path in sorted(matches, key=len):
+                self.open_ancestors(path)
+
+        # Only the topmost hidden node of a branch is detached; its descendants go with it
+        hidden = {node for node, path in self.node_paths.items()
+                  if not self.is_filter_visible(path) and (len(path) == 1 or self.is_filter_visible(path[:-1]))}
+        self.update_detached_nodes(hidden)
+
+    def clear_tree_filter(self):
+        if self.filter_matches is None:
+            return
+        self.filter_matches = None
+        self.filter_visible = set()
+        self.update_detached_nodes(set())
+
+    def update_detached_nodes(self, hidden):
+        """Detach the newly hidden nodes and reattach the shown ones at their position in the topic dicts."""
+        to_detach = hidden - self.detached_nodes
+        to_reattach = self.detached_nodes - hidden
+        if to_detach:
+            self.tree.detach(*to_detach)
+        self.detached_nodes = hidden
+
+        # Walk each affected parent's keys in order, counting the children attached to it in Tk
+        for parent_path in {self.node_paths[node][:-1] for node in to_reattach}:
+            parent = self.path_nodes.get(parent_path, "")
+            index = 0
+            for key in self.catalog.get_structure(parent_path):
+                node = self.path_nodes.get(parent_path + (key,))
+                if node is None or node in hidden:
+                    continue
+                if node in to_reattach:
+                    self.tree.reattach(node, parent, index)
+                index += 1
+
+    def on_search_result_select(self, event):
+        selection = self.search_results.curselection()
+        if selection and selection[0] < len(self.search_hits):
+            self.reveal_path(self.search_hits[selection[0]])
+
+    def reveal_path(self, path):
+        """Expand the ancestors of a key path, then select and scroll to its node."""
+        if not self.open_ancestors(path):
+            return False
+
+        node = self.path_nodes.get(path)
+        if node is None:
+            return False
+        self.tree.selection_set(node)
+        self.tree.focus(node)
+        self.tree.see(node)
+        return True
+
+    def open_ancestors(self, path):
+        for depth in range(1, len(path)):
+            node = self.path_nodes.get(path[:depth])
+            if node is None:
+                return False
+            self.expand_node(node)
+            self.tree.item(node, open=True)
+        return True
+
     def show_context_menu(self, event):
         # Show context menu
         self.context_menu.post(event.x_root, event.y_root)
@@ -1007,14 +1896,20 @@ class VideoNavigatorApp:
         youtube_link = simpledialog.askstring("YouTube Link", f"Enter YouTube link for '{selected_title}':")
 
         if youtube_link:
-            playlist_path = os.path.join(self.playlist_dir, f"{selected_title}.json")
+            # Replace the title's own playlist if it has one; a new file is named like generated playlists,
+            # so a same-named title's playlist is never overwritten
+            playlist_path = (self.get_playlist_path(selected_item)
+                             or playlist_file_path(self.playlist_dir, self.node_paths[selected_item]))
             youtube_entry = {
                 "url": youtube_link,
                 "description": selected_title
             }
 
-            with open(playlist_path, "w") as playlist_file:
-                json.dump([youtube_entry], playlist_file, indent=4)
+            with playlist_lock(playlist_path):
+                write_json_atomic(playlist_path, [youtube_entry])
+                # A link has no source folder for refreshes or the watcher to rescan
+                if os.path.exists(playlist_source_path(playlist_path)):
+                    os.remove(playlist_source_path(playlist_path))
 
             # Update JSON file with the new playlist path
             self.update_json_file(selected_item, playlist_path)
@@ -1024,26 +1919,105 @@ class VideoNavigatorApp:
     def delete_playlist(self):
         selected_item = self.tree.selection()[0]
         selected_title = self.tree.item(selected_item, "text")
-        values = self.tree.item(selected_item, "values")
+        playlist_path = self.get_playlist_path(selected_item)
 
-        if values:
-            playlist_path = values[0]
+        if playlist_path is not None:
             if os.path.exists(playlist_path):
                 os.remove(playlist_path)
+                if os.path.exists(playlist_source_path(playlist_path)):
+                    os.remove(playlist_source_path(playlist_path))
+                self.storage.record_playlist(playlist_path, [])
                 self.message_area.insert(tk.END, f"Deleted playlist: {playlist_path}\n")
                 logging.debug(f"Deleted playlist: {playlist_path}")
 
             self.update_json_file(selected_item, "")
-            self.tree.item(selected_item, values=[""])  # Clear the value in the tree
+            self.tree.item(selected_item, values=[""], tags=())  # Clear the value in the tree
+            self.playlist_health.pop(playlist_path, None)
+            self.sync_playlist_watcher()
             logging.debug(f"Cleared playlist path for '{selected_title}' in tree view")
 
+    def toggle_playlist_watcher(self):
+        if self.watch_playlists_var.get():
+            if self.playlist_watcher is None:
+                self.playlist_watcher = PlaylistWatcher(
+                    lambda playlist_path, added, removed: self.watch_queue.put((playlist_path, added, removed)),
+                    media_types=self.media_types, get_probe_cache=self.active_probe_cache)
+                self.sync_playlist_watcher()
+                self.playlist_watcher.start()
+                self.watch_poll_id = self.root.after(WATCH_QUEUE_POLL_MS, self.poll_watch_queue)
+        elif self.playlist_watcher is not None:
+            self.playlist_watcher.stop()
+            self.playlist_watcher = None
+            # Cancel the pending poll, or turning the watcher back on quickly would run two polling loops
+            if self.watch_poll_id is not None:
+                self.root.after_cancel(self.watch_poll_id)
+                self.watch_poll_id = None
+
+    def sync_playlist_watcher(self):
+        """Hand the watcher the current playlist files; it reads their source records on its own thread."""
+        if self.playlist_watcher is None:
+            return
+        self.playlist_watcher.set_playlists(self.catalog.playlist_path(value) for value in self.playlist_title_map())
+
+    def playlist_title_map(self):
+        if self.playlist_titles is None:
+            self.playlist_titles = {}
+            for path, value in self.catalog.titles():
+                self.add_playlist_title(path, value)
+        return self.playlist_titles
+
+    def playlist_title_paths(self, stored_path):
+        """Return the sorted key paths of the titles whose stored playlist path is stored_path."""
+        return sorted(self.playlist_title_map().get(stored_path, ()))
+
+    def add_playlist_title(self, path, value):
+        if self.playlist_titles is not None and value and not isinstance(value, dict):
+            self.playlist_titles.setdefault(value, set()).add(path)
+
+    def discard_playlist_title(self, path, value):
+        if self.playlist_titles is None or not value or isinstance(value, dict):
+            return
+        paths = self.playlist_titles.get(value)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del self.playlist_titles[value]
+
+    def poll_watch_queue(self):
+        self.watch_poll_id = None
+        if self.playlist_watcher is None:
+            return
+
+        refreshed = []
+        while True:
+            try:
+                playlist_path, added, removed = self.watch_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            stored_path = compact_playlist_path(playlist_path, self.playlist_dir)
+            for path in self.playlist_title_paths(stored_path):
+                self.message_area.insert(tk.END, f"Updated playlist for '{path[-1]}': "
+                                                 f"{added} added, {removed} removed\n")
+                # The title keeps its playlist path; only its search entry is stale
+                refreshed.append((path, stored_path))
+            self.check_playlist_health([playlist_path], force=True)
+            self.message_area.see(tk.END)
+        self.index_playlists(refreshed)
+
+        self.watch_poll_id = self.root.after(WATCH_QUEUE_POLL_MS, self.poll_watch_queue)
+
     def on_close(self):
-        for topic_name in self.modified_topics:
-            topic_file_path = os.path.join(self.script_dir, f"{topic_name}.json")
-            with open(topic_file_path, "w") as file:
-                json.dump(self.topics[topic_name], file, indent=4)
-            logging.debug(f"Saved topic '{topic_name}' to {topic_file_path}")
+        # Stop any running directory scan; its worker thread is a daemon and results are discarded
+        self.scan_cancel.set()
+        if self.playlist_watcher is not None:
+            self.playlist_watcher.stop()
+
+        # Write any topic edits still waiting for the debounce timer
+        self.flush_modified_topics()
 
         self.save_topic_files()
+        self.storage.close()
+        self.thumbnails.close()
         logging.debug("Saved topics_list.json and closed VideoNavigatorApp")
         self.root.destroy()